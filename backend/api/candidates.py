@@ -1,12 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Dict, Any, Optional
 import logging
 
 from models.candidate import CandidateResponse
 from services.job_service import JobService
 from services.candidate_service import CandidateService
-from services.gemini_service import GeminiService
-from services.gemini_IVQuestionService import GeminiIVQuestionService
+from services.gemini_service import GeminiService, get_gemini_service
+from services.gemini_IVQuestionService import GeminiIVQuestionService, get_iv_question_service
 from models.candidate import CandidateUpdate
 
 router = APIRouter()
@@ -24,7 +24,7 @@ async def get_applicants(jobId: str = Query(..., description="Job ID to get appl
         raise HTTPException(status_code=500, detail=f"Failed to get applicants: {str(e)}")
 
 @router.post("/rank")
-async def rank_candidates(request: Dict[Any, Any]):
+async def rank_candidates(request: Dict[Any, Any], rank_service: GeminiService = Depends(get_gemini_service)):
     logger.info("Ranking candidates with provided parameters")
     try:
         prompt = request.get("prompt")
@@ -34,9 +34,6 @@ async def rank_candidates(request: Dict[Any, Any]):
         if not prompt or not applicants or not job_document:
             raise HTTPException(status_code=400, detail="Prompt, applicants, and job_document are required")
         
-        # Create an instance of RankGeminiService
-        rank_service = GeminiService()
-        
         # Rank the applicants
         ranked_result = await rank_service.rank_applicants(prompt, applicants, job_document)
 
@@ -49,7 +46,7 @@ async def rank_candidates(request: Dict[Any, Any]):
         raise HTTPException(status_code=500, detail=f"Failed to rank candidates: {str(e)}")
     
 @router.post("/ranks")
-async def rank_new_candidates(request: Dict[Any, Any]):
+async def rank_new_candidates(request: Dict[Any, Any], rank_service: GeminiService = Depends(get_gemini_service)):
     logger.info("Ranking candidates with provided parameters")
     try:
         weights = request.get("weights")
@@ -59,9 +56,6 @@ async def rank_new_candidates(request: Dict[Any, Any]):
         if not weights or not applicants:
             raise HTTPException(status_code=400, detail="Rank weight and applicants are required")
         
-        # Create an instance of RankGeminiService
-        rank_service = GeminiService()
-        
         # Rank the applicants
         ranked_result = await rank_service.rank_applicants_with_weights(weights, applicants, job_document)
 
@@ -109,8 +103,8 @@ async def update_candidate(candidate_id: str, candidate_data: Dict[Any, Any]):
                 if not candidate:
                     logger.error(f"Could not find candidate {candidate_id} for profile generation")
                 else:
-                    # Create an instance of GeminiService
-                    gemini_service = GeminiService()
+                    # Resolved here rather than as a dependency so the update still succeeds without Gemini
+                    gemini_service = get_gemini_service()
                     
                     # Generate the detailed profile - this is asynchronous
                     detailed_profile = await gemini_service.generate_candidate_profile(candidate)
@@ -164,8 +158,8 @@ async def get_candidate_detail(candidate_id: str):
             logger.info(f"Candidate {candidate_id} already has a detailed profile, returning existing data")
             return {"candidate_id": candidate_id, "detailed_profile": candidate["detailed_profile"]}
         
-        # Create an instance of GeminiService
-        gemini_service = GeminiService()
+        # Only needed when there is no stored profile yet
+        gemini_service = get_gemini_service()
         
         # Generate the detailed profile
         detailed_profile = await gemini_service.generate_candidate_profile(candidate)
@@ -191,7 +185,8 @@ async def get_candidate_detail(candidate_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to generate candidate detail: {str(e)}")
 
 @router.get("/generate-interview-questions/{candidate_id}")
-async def generate_interview_questions(candidate_id: str, job_id: str = Query(..., description="Job ID to generate questions for")):
+async def generate_interview_questions(candidate_id: str, job_id: str = Query(..., description="Job ID to generate questions for"),
+                                       iv_question_service: GeminiIVQuestionService = Depends(get_iv_question_service)):
     """Generate AI interview questions for a candidate based on their resume and job details."""
     try:
         logger.info(f"Generating interview questions for candidate: {candidate_id} for job: {job_id}")
@@ -206,9 +201,6 @@ async def generate_interview_questions(candidate_id: str, job_id: str = Query(..
         if not job:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
         
-        # Create an instance of GeminiIVQuestionService
-        iv_question_service = GeminiIVQuestionService()
-        
         # Generate the interview questions
         interview_questions = await iv_question_service.generate_interview_questions(candidate_id, job_id)
         
@@ -220,7 +212,8 @@ async def generate_interview_questions(candidate_id: str, job_id: str = Query(..
         raise HTTPException(status_code=500, detail=f"Failed to generate interview questions: {str(e)}")
 
 @router.post("/generate-interview-question")
-async def generate_interview_question(request: Dict[str, Any]):
+async def generate_interview_question(request: Dict[str, Any],
+                                      iv_question_service: GeminiIVQuestionService = Depends(get_iv_question_service)):
     """Generate a single interview question for a specific candidate, job, and section."""
     try:
         logger.info(f"Generating a single interview question with request: {request}")
@@ -250,9 +243,6 @@ async def generate_interview_question(request: Dict[str, Any]):
         if not job:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
         
-        # Create an instance of GeminiIVQuestionService
-        iv_question_service = GeminiIVQuestionService()
-        
         # Generate a single interview question
         result = await iv_question_service.generate_interview_question(
             candidate_id=candidate_id,
@@ -1,7 +1,7 @@
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import smtplib
-from fastapi import APIRouter, HTTPException, Depends, Body, Query, Path
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Path, Request
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from firebase_admin import firestore
@@ -10,25 +10,27 @@ import logging
 import subprocess
 import os
 import io
-import tempfile
 from concurrent.futures import ThreadPoolExecutor
 import base64
 import speech_recognition as sr
 from moviepy import VideoFileClip
-import nltk
-from nltk.tokenize import word_tokenize
 from concurrent.futures import ThreadPoolExecutor
 from models.interview import (
     InterviewQuestion, GenerateInterviewLinkRequest, InterviewLinkResponse, 
     IdentityVerificationRequest, IdentityVerificationResponse, 
-    InterviewResponseRequest, InterviewResponseResponse
+    InterviewResponseRequest, InterviewResponseResponse,
+    InterviewResponseUploadRequest, InterviewResponseUploadResponse
 )
 from services.interview_service import (
     get_db, get_storage, validate_interview_link, 
-    send_interview_email, generate_link_code, send_rejection_email, transcribe_audio_with_google_cloud, extract_audio_with_ffmpeg, apply_voice_effect,
-    score_response
+    send_interview_email, generate_link_code, send_rejection_email
 )
 from services.face_verification import process_verification_image
+from services.gemini_service import GeminiService, get_gemini_service
+from services.interview_pipeline import interview_pipeline, ordered_answers
+from services.response_upload_service import (
+    response_upload_store, UploadOffsetMismatch, UploadNotFound, INTERVIEW_UPLOAD_CHUNK_SIZE
+)
 from firebase_admin import firestore
 
 
@@ -496,238 +498,41 @@ async def submit_interview_response(
     db: firestore.Client = Depends(get_db),
     storage_bucket = Depends(get_storage)
 ):
-    """Submit a video response for an interview question"""
-    nltk.download('punkt', quiet=True)
-    temp_video_file_path = None
-    temp_audio_file_path = None
-    temp_modified_audio_path = None  # Added for voice modification
+    """Submit a video response for an interview question.
 
+    The video is stored and the response recorded right away; transcription and
+    scoring run in the background. Poll /response-status/{application_id}/{response_id}
+    for progress and the transcript.
+    """
     try:
         # Validate interview link
-        interview_data = validate_interview_link(request.interviewId, request.linkCode)
+        interview_data = await interview_pipeline.run_blocking(validate_interview_link, request.interviewId, request.linkCode)
         
         # Get application ID
         application_id = interview_data.get('applicationId')
         
-        # Check if document already exists for this application
-        interview_doc_ref = db.collection('interviewResponses').document(application_id)
-        interview_doc = interview_doc_ref.get()
-        
         # Generate response ID for this question
         question_response_id = str(uuid.uuid4())
 
-        # Get question text
-        question = request.question
-
-        # Default return values
-        video_url = None
-        audio_extract_url = None
-        modified_audio_url = None
-        transcript = None
-        word_count = 0
-        clarity = 0.0
-        relevance = 0.0
-        engagement = 0.0
-        confidence = 0.0
-        total_score = 0.0
-        word_timings = []  # Initialize word timings
-
-        # If video data is provided directly in the request
-        if request.videoResponse:
-            try:
-                # Remove data URL prefix if present
-                if ',' in request.videoResponse:
-                    video_data = request.videoResponse.split(',')[1]
-                else:
-                    video_data = request.videoResponse
-                
-                # Decode base64 video data
-                video_bytes = base64.b64decode(video_data)
-
-                # Create a temporary file to process video
-                temp_video_file = tempfile.NamedTemporaryFile(delete=False, suffix=".webm")
-                temp_video_file_path = temp_video_file.name
-                temp_video_file.write(video_bytes)
-                temp_video_file.close() # Close the file handle after writing
-                
-                # Upload video to Firebase Storage
-                video_storage_path = f"interview_responses/{application_id}/{request.interviewId}/{request.questionId}.webm"
-                video_blob = storage_bucket.blob(video_storage_path)
-                video_blob.upload_from_string(video_bytes, content_type="video/webm")
-                video_blob.make_public()
-                
-                # Get public URL
-                video_url = video_blob.public_url
-
-                # Process the video to extract audio and create transcript
-                try:
-                    # Create temporary audio file path
-                    temp_audio_file = tempfile.NamedTemporaryFile(delete=False, suffix="_audio.wav")
-                    temp_audio_file_path = temp_audio_file.name
-                    temp_audio_file.close()
-
-                    # Use FFmpeg for audio extraction
-                    extract_audio_with_ffmpeg(temp_video_file_path, temp_audio_file_path)
-
-                    logger.info(f"Extracted audio file path: {temp_audio_file_path}")
-                    
-                    if os.path.exists(temp_audio_file_path):
-                        # Upload extracted audio to Firebase Storage
-                        audio_storage_path = f"interview_responses/{application_id}/{request.interviewId}/{question_response_id}_audio.wav"
-                        audio_blob = storage_bucket.blob(audio_storage_path)
-                        audio_blob.upload_from_filename(temp_audio_file_path, content_type="audio/wav")
-                        audio_blob.make_public()
-                        audio_extract_url = audio_blob.public_url
-                        gcs_uri = f"gs://{storage_bucket.name}/{audio_storage_path}"
-
-                        # Create temporary file for modified audio with voice effect
-                        temp_modified_file = tempfile.NamedTemporaryFile(delete=False, suffix="_modified.wav")
-                        temp_modified_audio_path = temp_modified_file.name
-                        temp_modified_file.close()
-                        
-                        # Apply voice effect to the extracted audio
-                        apply_voice_effect(
-                            temp_audio_file_path, 
-                            effect_type="helium", 
-                            output_audio_path=temp_modified_audio_path
-                        )
-                        
-                        # Upload modified audio to Firebase Storage
-                        modified_audio_storage_path = f"interview_responses/{application_id}/{request.interviewId}/{question_response_id}_modified_audio.wav"
-                        modified_audio_blob = storage_bucket.blob(modified_audio_storage_path)
-                        modified_audio_blob.upload_from_filename(temp_modified_audio_path, content_type="audio/wav")
-                        modified_audio_blob.make_public()
-                        modified_audio_url = modified_audio_blob.public_url
-
-                        # Transcribe audio using Google Cloud Speech-to-Text
-                        transcription_result = transcribe_audio_with_google_cloud(gcs_uri)
-                
-                        transcript = transcription_result['transcript']
-                        confidence = transcription_result['confidence']
-                        word_timings = transcription_result.get('word_timings', [])  # Extract word timings
-                        
-                        if transcript:
-                            word_count = len(word_tokenize(transcript))
-                    else:
-                        logger.error("Audio extraction failed: File not found")
-                        transcript = "Audio extraction failed"
-
-                    # Analyze scores only if we have all required data
-                    scores = {}
-                    if transcript and len(transcript.strip()) > 0 and modified_audio_url and question:
-                        # Analyze scores - call the score_response function
-                        scores = score_response(
-                            transcript=transcript,
-                            question_text=question,
-                            audio_url=modified_audio_url
-                        )
-                        
-                        # Extract individual scores - these will be used when creating the response document
-                        clarity = scores.get('clarity', 0)
-                        confidence = scores.get('confidence', 0)
-                        relevance = scores.get('relevance', 0)
-                        engagement = scores.get('engagement', 0)
-                        total_score = scores.get('total_score', 0)
-                    else:
-                        logger.warning(f"Missing data for scoring: transcript={bool(transcript)}, audio_url={bool(modified_audio_url)}, question={bool(question)}")
-                        scores = {
-                            'clarity': 0,
-                            'confidence': 0,
-                            'relevance': 0,
-                            'engagement': 0,
-                            'total_score': 0
-                        }
-                        total_score = 0.0
-
-                    logger.info(f"Response scores: clarity={clarity}, confidence={confidence}, relevance={relevance}, engagement={engagement}, total_score={total_score}")
-                    logger.info(f"Word timings count: {len(word_timings)}")
-
-                except Exception as transcription_error:
-                    logger.error(f"Transcription error: {str(transcription_error)}")
-                    transcript = f"Transcription failed: {str(transcription_error)}"
-                    word_count = 0
-                    confidence = 0.0
-                    total_score = 0.0
-            except Exception as video_error:
-                logger.error(f"Video processing error: {str(video_error)}")
-                transcript = f"Video processing failed: {str(video_error)}"
-                total_score = 0.0
-        
-        # Create the question response object
-        question_response = {
-            'questionId': request.questionId,
-            'responseId': question_response_id,
-            'submitTime': datetime.utcnow(),
-            'transcript': transcript,
-            'wordCount': word_count,
-            'videoResponseUrl': video_url,
-            'audioExtractUrl': audio_extract_url,
-            'modifiedAudioUrl': modified_audio_url,
-            'wordTimings': word_timings,  # Add word timings to the response
-            'AIFeedback': None
-        }
-        
-        # If the document doesn't exist yet, create it
-        if not interview_doc.exists:
-            # Initialize document with the first question
-            interview_response_data = {
-                'applicationId': application_id,
-                'analysis': {
-                    'clarity': float(clarity),
-                    'confidence': float(confidence),
-                    'relevance': float(relevance),
-                    'engagement': float(engagement),
-                    'totalScore': float(total_score)
-                },
-                'questions': [question_response],
-                'createdAt': datetime.utcnow(),
-                'updatedAt': datetime.utcnow()
-            }
-            
-            # Save new document to Firestore
-            interview_doc_ref.set(interview_response_data)
-        else:
-            # Update the existing document by appending the new question and adding new analysis
-
-            # Get the existing document data
-            existing_data = interview_doc.to_dict()
-            existing_analysis = existing_data.get('analysis', {})
-
-            # Get existing scores
-            existing_clarity = existing_analysis.get('clarity', 0)
-            existing_confidence = existing_analysis.get('confidence', 0)
-            existing_relevance = existing_analysis.get('relevance', 0)
-            existing_engagement = existing_analysis.get('engagement', 0)
-            existing_total_score = existing_analysis.get('totalScore', 0)
-
-            # Add the new scores to existing scores
-            updated_clarity = existing_clarity + float(clarity)
-            updated_confidence = existing_confidence + float(confidence)
-            updated_relevance = existing_relevance + float(relevance)
-            updated_engagement = existing_engagement + float(engagement)
-            updated_total_score = existing_total_score + float(total_score)
+        # Persist the video and record the response without blocking the event loop
+        video_path = await interview_pipeline.run_blocking(
+            interview_pipeline.accept,
+            db, storage_bucket, application_id, request.interviewId,
+            request.questionId, question_response_id, request.videoResponse
+        )
 
-            # Update the analysis scores
-            interview_doc_ref.update({
-                'analysis': {
-                    'clarity': updated_clarity,
-                    'confidence': updated_confidence,
-                    'relevance': updated_relevance,
-                    'engagement': updated_engagement,
-                    'totalScore': updated_total_score
-                },
-                'questions': firestore.ArrayUnion([question_response]),
-                'updatedAt': datetime.utcnow()
-            })
+        # Audio extraction, transcription and scoring continue in the background
+        if video_path:
+            interview_pipeline.submit(
+                db, storage_bucket, application_id, request.interviewId,
+                request.question, question_response_id, video_path
+            )
         
-        # Return response
         return InterviewResponseResponse(
             success=True,
             responseId=question_response_id,
-            message="Response recorded successfully",
-            transcript=transcript,
-            word_count=word_count,
-            word_timings=word_timings  # Include word timings in the response
+            message="Response received and queued for processing" if video_path else "Response recorded successfully",
+            status="processing" if video_path else "completed"
         )
     
     except HTTPException:
@@ -737,14 +542,101 @@ async def submit_interview_response(
         logger.error("Error submitting interview response: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Failed to submit interview response: {str(e)}")
 
-    finally:
-        # Clean up temporary files
-        for temp_file in [temp_video_file_path, temp_audio_file_path, temp_modified_audio_path]:
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    logger.error(f"Error deleting temporary file {temp_file}: {str(e)}")
+@router.post("/response-uploads", response_model=InterviewResponseUploadResponse)
+async def start_response_upload(request: InterviewResponseUploadRequest):
+    """Start a chunked, resumable video upload for an interview question.
+
+    Send the video with PUT /response-uploads/{upload_id}?offset=N (raw bytes),
+    then POST /response-uploads/{upload_id}/complete to submit it.
+    """
+    try:
+        interview_data = await interview_pipeline.run_blocking(validate_interview_link, request.interviewId, request.linkCode)
+        session = response_upload_store.create(
+            interview_data.get('applicationId'), request.interviewId, request.questionId, request.question
+        )
+        return InterviewResponseUploadResponse(uploadId=session['uploadId'], offset=0, chunkSize=INTERVIEW_UPLOAD_CHUNK_SIZE)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting response upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start upload: {str(e)}")
+
+@router.get("/response-uploads/{upload_id}", response_model=InterviewResponseUploadResponse)
+async def get_response_upload(upload_id: str):
+    """Get the current offset of an upload, to resume it after an interruption."""
+    session = response_upload_store.get(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return InterviewResponseUploadResponse(uploadId=upload_id, offset=session['offset'], chunkSize=INTERVIEW_UPLOAD_CHUNK_SIZE)
+
+@router.put("/response-uploads/{upload_id}", response_model=InterviewResponseUploadResponse)
+async def upload_response_chunk(upload_id: str, request: Request, offset: int = Query(..., ge=0)):
+    """Append the raw request body to an upload at the given offset."""
+    try:
+        new_offset = await response_upload_store.append(upload_id, offset, request.stream())
+        return InterviewResponseUploadResponse(uploadId=upload_id, offset=new_offset, chunkSize=INTERVIEW_UPLOAD_CHUNK_SIZE)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=f"Expected offset {e.offset}")
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+@router.post("/response-uploads/{upload_id}/complete", response_model=InterviewResponseResponse)
+async def complete_response_upload(
+    upload_id: str,
+    db: firestore.Client = Depends(get_db),
+    storage_bucket = Depends(get_storage)
+):
+    """Submit a finished upload as the response to its question."""
+    session = await response_upload_store.pop(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if session['offset'] == 0:
+        os.unlink(session['path'])
+        raise HTTPException(status_code=400, detail="Upload is empty")
+
+    try:
+        question_response_id = str(uuid.uuid4())
+        video_path = await interview_pipeline.run_blocking(
+            interview_pipeline.accept_file,
+            db, storage_bucket, session['applicationId'], session['interviewId'],
+            session['questionId'], question_response_id, session['path']
+        )
+        if video_path:
+            interview_pipeline.submit(
+                db, storage_bucket, session['applicationId'], session['interviewId'],
+                session['question'], question_response_id, video_path
+            )
+        return InterviewResponseResponse(
+            success=True,
+            responseId=question_response_id,
+            message="Response received and queued for processing" if video_path else "Video upload failed",
+            status="processing" if video_path else "failed"
+        )
+    except Exception as e:
+        logger.error(f"Error completing response upload: {e}")
+        if os.path.exists(session['path']):
+            os.unlink(session['path'])
+        raise HTTPException(status_code=500, detail=f"Failed to submit interview response: {str(e)}")
+
+@router.get("/response-status/{application_id}/{response_id}")
+async def get_response_status(
+    application_id: str,
+    response_id: str,
+    db: firestore.Client = Depends(get_db)
+):
+    """Get the processing stage of a submitted response, with its transcript once finished."""
+    try:
+        status = await interview_pipeline.run_blocking(interview_pipeline.get_status, db, application_id, response_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Interview response not found")
+        return status
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching response status: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch response status: {str(e)}")
 
 @router.post("/complete-interview")
 async def complete_interview(
@@ -760,37 +652,9 @@ async def complete_interview(
         # Get application ID
         application_id = interview_data.get('applicationId')
 
-        # Fetch interview response clarity, confidence, relevance, and engagement scores
-        interview_response_doc = db.collection('interviewResponses').document(application_id).get()
-
-        if not interview_response_doc.exists:
+        # Average the running score totals into the analysis
+        if interview_pipeline.finalize_scores(db, application_id) is None:
             raise HTTPException(status_code=404, detail="Interview responses not found")
-
-        interview_response_data = interview_response_doc.to_dict()
-
-        # Get the number of questions
-        num_questions = len(interview_response_data.get('questions', []))  # Default to empty list if 'questions' key is missing
-
-        if num_questions > 0:
-            clarity = interview_response_data['analysis'].get('clarity', 0) / num_questions
-            confidence = interview_response_data['analysis'].get('confidence', 0) / num_questions
-            relevance = interview_response_data['analysis'].get('relevance', 0) / num_questions
-            engagement = interview_response_data['analysis'].get('engagement', 0) / num_questions
-            total_score = interview_response_data['analysis'].get('totalScore', 0) / num_questions
-        else:
-            total_score = 0  # Avoid division by zero
-
-        # Ensure total_score is a standard float (avoid Firestore errors)
-        total_score = float(total_score)
-
-        # Update interview response score in Firestore
-        db.collection('interviewResponses').document(application_id).update({
-            'analysis.clarity': clarity,
-            'analysis.confidence': confidence,
-            'analysis.relevance': relevance,
-            'analysis.engagement': engagement,
-            'analysis.totalScore': total_score
-        })
         
         # Update interview link status
         db.collection('interviewLinks').document(interview_id).update({
@@ -863,7 +727,11 @@ async def get_interview_responses(
         if not responses_doc.exists:
             raise HTTPException(status_code=404, detail="No interview responses found for this application")
         
-        return responses_doc.to_dict()
+        # Answers are stored per response ID; clients get them as a list in submission order
+        data = responses_doc.to_dict()
+        data['questions'] = ordered_answers(data)
+        data.pop('responses', None)
+        return data
     except HTTPException:
         raise
     except Exception as e:
@@ -878,6 +746,10 @@ async def update_interview_responses(
 ):
     """Update interview responses for an application."""
     try:
+        # Store the answers back under their response IDs
+        if 'questions' in data:
+            data['responses'] = {answer['responseId']: answer for answer in data.pop('questions')}
+        
         # Update the document in Firestore
         db.collection('interviewResponses').document(application_id).set(data)
         
@@ -889,7 +761,8 @@ async def update_interview_responses(
 @router.post("/generate-feedback")
 async def generate_ai_feedback(
     request: Dict[str, Any],
-    db: firestore.Client = Depends(get_db)
+    db: firestore.Client = Depends(get_db),
+    gemini_service: GeminiService = Depends(get_gemini_service)
 ):
     """Generate AI feedback for interview responses."""
     try:
@@ -920,10 +793,6 @@ async def generate_ai_feedback(
                 candidate_data = candidate_doc.to_dict()
                 resume_text = candidate_data.get('extractedText', {})
         
-        # Initialize Gemini API
-        from services.gemini_service import GeminiService
-        gemini_service = GeminiService()
-        
         # Generate feedback for each response
         feedback_results = []
         
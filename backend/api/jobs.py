@@ -9,10 +9,19 @@ import uuid
 from models.job import JobCreate, JobResponse, JobUpdate
 from services.job_service import JobService
 from services.candidate_service import CandidateService
+from services.ingestion_service import ingestion_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+async def read_upload_files(files: List[UploadFile]) -> List[tuple]:
+    """Read uploaded files into (file_content, file_name, content_type) tuples."""
+    file_batch = []
+    for file in files:
+        content = await file.read()
+        file_batch.append((content, file.filename, file.content_type or "application/pdf"))
+    return file_batch
+
 @router.get("/", response_model=List[JobResponse])
 async def get_jobs():
     """Get all jobs."""
@@ -49,10 +58,19 @@ async def update_job(job_id: str, job: JobUpdate):
     updated_job = JobService.get_job(job_id)
     return updated_job
 
+@router.get("/ingestion/{ingestion_id}")
+async def get_ingestion_status(ingestion_id: str):
+    """Get per-file progress of a background CV ingestion."""
+    status = ingestion_service.get_status(ingestion_id)
+    if not status:
+        raise HTTPException(status_code=404, detail=f"Ingestion {ingestion_id} not found")
+    return status
+
 @router.post("/upload-job")
 async def upload_job(
     job_data: str = Form(...),
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    background: bool = Form(True)
 ):
     """Upload a job with candidate resumes."""
     try:
@@ -80,60 +98,28 @@ async def upload_job(
         if not job_id:
             raise HTTPException(status_code=500, detail="Failed to create job")
         
-        # Process files and create candidates
-        candidates = []
-        candidate_ids = []  # Track candidate IDs separately
-        for file in files:
-            content = await file.read()
-            candidate_data = CandidateService.create_candidate(
-                job_id=job_id,
-                file_content=content,
-                file_name=file.filename,
-                content_type=file.content_type or "application/pdf"
-            )
-            
-            if candidate_data:
-                candidates.append(candidate_data)
-                candidate_ids.append(candidate_data['candidateId'])
+        # Read every file now; the upload handles are closed once the response is sent
+        file_batch = await read_upload_files(files)
+        ingestion_id = ingestion_service.submit(job_id, file_batch)
         
-        # Create applications for candidates
-        applications = CandidateService.process_applications(job_id, candidates)
+        # By default return straight away; progress is polled from the status endpoint
+        if background:
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "message": "Job created, CVs are being processed",
+                    "jobId": job_id,
+                    "ingestionId": ingestion_id,
+                    "statusUrl": f"/api/jobs/ingestion/{ingestion_id}",
+                    "fileCount": len(file_batch),
+                    "progress": 0.0
+                }
+            )
         
-        # NEW: Generate detailed profiles immediately, don't wait for frontend to request
-        if candidate_ids:
-            logger.info(f"Automatically generating detailed profiles for {len(candidate_ids)} candidates")
-            from services.gemini_service import GeminiService
-            gemini_service = GeminiService()
-            
-            # Process one candidate at a time to avoid overloading
-            for candidate_id in candidate_ids:
-                try:
-                    # Get candidate data
-                    candidate = CandidateService.get_candidate(candidate_id)
-                    if not candidate:
-                        logger.warning(f"Could not find candidate {candidate_id} for profile generation")
-                        continue
-                        
-                    # Generate detailed profile
-                    logger.info(f"Generating detailed profile for candidate {candidate_id}")
-                    detailed_profile = await gemini_service.generate_candidate_profile(candidate)
-                    
-                    # Update candidate with detailed profile
-                    candidate["detailed_profile"] = detailed_profile
-                    from models.candidate import CandidateUpdate
-                    profile_update = CandidateUpdate(**candidate)
-                    success = CandidateService.update_candidate(candidate_id, profile_update)
-                    
-                    if success:
-                        logger.info(f"Successfully generated and saved detailed profile for candidate {candidate_id}")
-                    else:
-                        logger.warning(f"Failed to save detailed profile for candidate {candidate_id}")
-                        
-                except Exception as e:
-                    logger.error(f"Error generating profile for candidate {candidate_id}: {e}")
-                    # Continue with next candidate if one fails
-        else:
-            logger.warning("No candidate IDs available for detailed profile generation")
+        # With background=false wait for the pipeline so the response carries the created candidates
+        await ingestion_service.wait(ingestion_id)
+        candidates, applications = ingestion_service.get_results(ingestion_id)
+        candidate_ids = [candidate['candidateId'] for candidate in candidates]
         
         # Return response with candidate IDs included
         return JSONResponse(
@@ -163,7 +149,8 @@ async def upload_job(
 @router.post("/upload-more-cv")
 async def upload_more_cv(
     job_id: str = Form(...),
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    background: bool = Form(True)
 ):
     """Upload additional candidate resumes for an existing job."""
     try:
@@ -174,60 +161,28 @@ async def upload_more_cv(
 
         logger.info(f"Uploading additional CVs for job {job_id}, file count: {len(files)}")
         
-        # Process files and create candidates
-        candidates = []
-        candidate_ids = []  # Track candidate IDs separately
-        for file in files:
-            content = await file.read()
-            candidate_data = CandidateService.create_candidate(
-                job_id=job_id,
-                file_content=content,
-                file_name=file.filename,
-                content_type=file.content_type or "application/pdf"
-            )
-            
-            if candidate_data:
-                candidates.append(candidate_data)
-                candidate_ids.append(candidate_data['candidateId'])
+        # Read every file now; the upload handles are closed once the response is sent
+        file_batch = await read_upload_files(files)
+        ingestion_id = ingestion_service.submit(job_id, file_batch)
         
-        # Create applications for candidates
-        applications = CandidateService.process_applications(job_id, candidates)
+        # By default return straight away; progress is polled from the status endpoint
+        if background:
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "message": "Additional CVs are being processed",
+                    "jobId": job_id,
+                    "ingestionId": ingestion_id,
+                    "statusUrl": f"/api/jobs/ingestion/{ingestion_id}",
+                    "fileCount": len(file_batch),
+                    "progress": 0.0
+                }
+            )
         
-        # NEW: Generate detailed profiles immediately, don't wait for frontend to request
-        if candidate_ids:
-            logger.info(f"Automatically generating detailed profiles for {len(candidate_ids)} candidates")
-            from services.gemini_service import GeminiService
-            gemini_service = GeminiService()
-            
-            # Process one candidate at a time to avoid overloading
-            for candidate_id in candidate_ids:
-                try:
-                    # Get candidate data
-                    candidate = CandidateService.get_candidate(candidate_id)
-                    if not candidate:
-                        logger.warning(f"Could not find candidate {candidate_id} for profile generation")
-                        continue
-                        
-                    # Generate detailed profile
-                    logger.info(f"Generating detailed profile for candidate {candidate_id}")
-                    detailed_profile = await gemini_service.generate_candidate_profile(candidate)
-                    
-                    # Update candidate with detailed profile
-                    candidate["detailed_profile"] = detailed_profile
-                    from models.candidate import CandidateUpdate
-                    profile_update = CandidateUpdate(**candidate)
-                    success = CandidateService.update_candidate(candidate_id, profile_update)
-                    
-                    if success:
-                        logger.info(f"Successfully generated and saved detailed profile for candidate {candidate_id}")
-                    else:
-                        logger.warning(f"Failed to save detailed profile for candidate {candidate_id}")
-                        
-                except Exception as e:
-                    logger.error(f"Error generating profile for candidate {candidate_id}: {e}")
-                    # Continue with next candidate if one fails
-        else:
-            logger.warning("No candidate IDs available for detailed profile generation")
+        # With background=false wait for the pipeline so the response carries the created candidates
+        await ingestion_service.wait(ingestion_id)
+        candidates, applications = ingestion_service.get_results(ingestion_id)
+        candidate_ids = [candidate['candidateId'] for candidate in candidates]
             
         # Update application count for the job
         job = JobService.get_job(job_id)
@@ -0,0 +1,91 @@
+"""Wall time and ffmpeg process count of audio extraction per answer video.
+
+Compares extract_audio_with_voice_effect (one ffmpeg run with a two-output
+filter graph) with the previous extract_audio_with_ffmpeg followed by
+apply_voice_effect. Sample webm videos are generated with ffmpeg unless
+existing files are passed with --inputs. Needs ffmpeg (on PATH or set with
+FFMPEG_PATH) and is skipped without it. Run from the backend directory:
+
+    python -m benchmarks.audio_extraction --seconds 30 120 --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from services import interview_service
+from services.ffmpeg_service import get_ffmpeg
+
+
+def make_video(directory, seconds):
+    """Encode a test pattern with a tone as webm, or Matroska if this ffmpeg lacks the webm encoders."""
+    base = [
+        get_ffmpeg().path, '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f'testsrc=size=640x360:rate=30:duration={seconds}',
+        '-f', 'lavfi', '-i', f'sine=frequency=220:sample_rate=48000:duration={seconds}'
+    ]
+    path = os.path.join(directory, f"answer-{seconds:g}.webm")
+    try:
+        subprocess.run(base + ['-c:v', 'libvpx', '-deadline', 'realtime', '-c:a', 'libopus', path],
+                       check=True, capture_output=True)
+    except subprocess.CalledProcessError:
+        path = os.path.join(directory, f"answer-{seconds:g}.mkv")
+        subprocess.run(base + ['-c:v', 'mpeg4', '-c:a', 'pcm_s16le', path], check=True, capture_output=True)
+    return path
+
+
+def previous_extraction(video_path, audio_path, modified_audio_path):
+    interview_service.extract_audio_with_ffmpeg(video_path, audio_path)
+    interview_service.apply_voice_effect(audio_path, effect_type="helium", output_audio_path=modified_audio_path)
+
+
+def combined_extraction(video_path, audio_path, modified_audio_path):
+    interview_service.extract_audio_with_voice_effect(video_path, audio_path, modified_audio_path, effect_type="helium")
+
+
+def measure(extract, video_path, directory, repeat):
+    """Best wall time of a run and the ffmpeg processes it spawned."""
+    spawned = []
+    run = subprocess.run
+
+    def counting_run(*args, **kwargs):
+        spawned.append(args[0][0] if args else kwargs.get('args'))
+        return run(*args, **kwargs)
+
+    audio_path = os.path.join(directory, "audio.wav")
+    modified_audio_path = os.path.join(directory, "modified.wav")
+    best = float('inf')
+    subprocess.run = counting_run
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract(video_path, audio_path, modified_audio_path)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        subprocess.run = run
+    return best, len(spawned) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--inputs', nargs='*', default=[], help="existing answer videos to use")
+    parser.add_argument('--seconds', type=float, nargs='+', default=[30, 120])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        ffmpeg = get_ffmpeg()
+    except RuntimeError as e:
+        parser.exit(message=f"Skipping: {e}\n")
+    print(f"ffmpeg {ffmpeg.version}, rubberband: {ffmpeg.supports('rubberband')}")
+    with tempfile.TemporaryDirectory() as directory:
+        videos = args.inputs or [make_video(directory, seconds) for seconds in args.seconds]
+        for video_path in videos:
+            previous, previous_spawns = measure(previous_extraction, video_path, directory, args.repeat)
+            combined, combined_spawns = measure(combined_extraction, video_path, directory, args.repeat)
+            print(f"{os.path.basename(video_path)}: two runs {previous:6.2f}s ({previous_spawns:g} processes), "
+                  f"one run {combined:6.2f}s ({combined_spawns:g} processes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Timing of compute_audio_features on 1 to 10 minute synthetic answers.
+
+The signal alternates tone bursts (speech) with low noise (pauses), so the
+known pause share can be checked against the reported pause_ratio. When
+librosa is installed, the previous librosa-based features are timed too.
+Run from the backend directory:
+
+    python -m benchmarks.audio_features --minutes 1 5 10
+"""
+import argparse
+import time
+import numpy as np
+from services.interview_service import compute_audio_features
+
+SAMPLE_RATE = 16000
+SPEECH_SECONDS = 2.4
+PAUSE_SECONDS = 0.6
+
+
+def make_signal(minutes, seed=0):
+    """Harmonic bursts with noisy pauses; returns the samples and the true pause share."""
+    rng = np.random.default_rng(seed)
+    period = int((SPEECH_SECONDS + PAUSE_SECONDS) * SAMPLE_RATE)
+    speech_length = int(SPEECH_SECONDS * SAMPLE_RATE)
+    t = np.arange(speech_length) / SAMPLE_RATE
+    burst = sum(np.sin(2 * np.pi * 140 * harmonic * t) / harmonic for harmonic in range(1, 6)) * 0.2
+
+    periods = int(minutes * 60 * SAMPLE_RATE) // period
+    y = rng.normal(0, 0.0005, periods * period).astype(np.float32)
+    for index in range(periods):
+        y[index * period:index * period + speech_length] += burst
+    return y, PAUSE_SECONDS / (SPEECH_SECONDS + PAUSE_SECONDS)
+
+
+def previous_audio_features(y, sr):
+    """The librosa-based features compute_audio_features replaced, kept for comparison."""
+    import librosa
+    duration = librosa.get_duration(y=y, sr=sr)
+    signal_power = np.mean(y**2)
+    noise_sample = y[:int(sr/10)] if len(y) > sr/10 else y
+    noise_power = np.mean(noise_sample**2)
+    snr = 10 * np.log10(signal_power / max(noise_power, 1e-10)) if noise_power > 0 else 20.0
+    envelope = np.abs(librosa.feature.rms(y=y)[0])
+    volume_consistency = 1.0 - min(1.0, np.std(envelope) / np.mean(envelope) if np.mean(envelope) > 0 else 0)
+    zero_crossings = librosa.feature.zero_crossing_rate(y)[0]
+    pause_ratio = 1.0 - np.mean(zero_crossings)
+    return {'duration': duration, 'snr': snr, 'volume_consistency': volume_consistency,
+            'pause_ratio': pause_ratio, 'speech_rate': 150}
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1, 2, 5, 10])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        import librosa  # noqa: F401
+        compare = True
+    except ImportError:
+        print("librosa is not installed; timing compute_audio_features only")
+        compare = False
+
+    for minutes in args.minutes:
+        y, true_pause_ratio = make_signal(minutes)
+        features = compute_audio_features(y, SAMPLE_RATE)
+        elapsed = best_time(lambda: compute_audio_features(y, SAMPLE_RATE), args.repeat)
+        line = (f"{minutes:>5g} min: {elapsed * 1000:8.1f} ms CPU, pause_ratio {features['pause_ratio']:.3f} "
+                f"(true {true_pause_ratio:.3f})")
+        if compare:
+            previous = best_time(lambda: previous_audio_features(y, SAMPLE_RATE), args.repeat)
+            line += f", previous {previous * 1000:8.1f} ms CPU"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
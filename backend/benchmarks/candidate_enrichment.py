@@ -0,0 +1,51 @@
+"""Round trips and latency of reading candidates one by one versus in batches.
+
+Reads N candidate documents from the in-memory Firestore of the tests, where
+every round trip costs a fixed latency: first with get_document per candidate
+(how applications were enriched before), then with get_documents. Run from
+the backend directory:
+
+    python -m benchmarks.candidate_enrichment --latency 0.005 --candidates 100 800
+"""
+import argparse
+import time
+from core.firebase import BATCH_GET_CHUNK_SIZE
+from tests.fake_firestore import FakeFirestore, make_firebase_client
+
+
+def measure(db, read):
+    db.round_trips = 0
+    start = time.perf_counter()
+    candidates = read()
+    return candidates, db.round_trips, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.005, help="seconds per round trip")
+    parser.add_argument('--candidates', type=int, nargs='+', default=[100, 800])
+    parser.add_argument('--chunk-size', type=int, default=BATCH_GET_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(f"round-trip latency {args.latency * 1000:.1f} ms, chunk size {args.chunk_size}")
+    for count in args.candidates:
+        db = FakeFirestore(latency=args.latency)
+        candidate_ids = [f"candidate-{index}" for index in range(count)]
+        for candidate_id in candidate_ids:
+            db.collection('candidates').document(candidate_id).set({'extractedText': {'skills': candidate_id}})
+        client = make_firebase_client(db)
+
+        one_by_one, single_trips, single_time = measure(
+            db, lambda: {doc_id: client.get_document('candidates', doc_id) for doc_id in candidate_ids}
+        )
+        batched, batch_trips, batch_time = measure(
+            db, lambda: client.get_documents('candidates', candidate_ids, chunk_size=args.chunk_size)
+        )
+        assert batched == one_by_one
+
+        print(f"{count:>5} candidates: one by one {single_trips:>5} round trips {single_time:6.2f}s, "
+              f"batched {batch_trips:>3} round trips {batch_time:6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Embeddings per second of EmbeddingService.embed at batch sizes 1 to 64 on CPU.
+
+Loads the MiniLM model through the service registry (downloaded on first
+use), embeds a set of interview-answer-length texts at each batch size, and
+reports the time saved by the question cache when many answers share one
+question. Needs torch, transformers and the model files; it is skipped
+when the model cannot be loaded. Run from the backend directory:
+
+    python -m benchmarks.embedding_throughput --texts 256 --batch-sizes 1 4 16 64
+"""
+import argparse
+import random
+import time
+import numpy as np
+from services.embedding_service import EmbeddingService
+from services.service_registry import service_registry
+
+WORDS = ("team project deadline customer python data analysis improved process led designed "
+         "tested delivered feedback communication learned challenge solution results").split()
+
+
+def make_texts(count, words_per_text=60, seed=0):
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(words_per_text)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--texts', type=int, default=256)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    try:
+        service_registry.get("embedding_model")
+    except (ImportError, OSError) as e:
+        parser.exit(message=f"Skipping: the embedding model could not be loaded ({e})\n")
+    texts = make_texts(args.texts)
+
+    reference = None
+    for batch_size in args.batch_sizes:
+        service = EmbeddingService(batch_size=batch_size)
+        service.embed(texts[:batch_size])  # Warm up this batch shape
+        start = time.perf_counter()
+        vectors = service.embed(texts)
+        elapsed = time.perf_counter() - start
+        # Padding must not change a text's embedding
+        if reference is None:
+            reference = vectors
+        assert np.allclose(vectors, reference, atol=1e-4)
+        print(f"batch {batch_size:>3}: {args.texts / elapsed:8.1f} embeddings/s")
+
+    question = "Tell us about a project you are proud of."
+    service = EmbeddingService()
+    start = time.perf_counter()
+    for _ in range(args.texts):
+        service.embed([question])
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.texts):
+        service.embed_cached([question])
+    cached = time.perf_counter() - start
+    print(f"question embedded for {args.texts} answers: {uncached:.2f}s uncached, {cached:.3f}s cached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Construction cost, memory and sampling time of the interview question pool.
+
+Compares the list of up to 10,000 formatted questions that every
+GeminiIVQuestionService used to build in its constructor with
+QuestionTemplatePool. Run from the backend directory:
+
+    python -m benchmarks.question_pool
+"""
+import argparse
+import random
+import timeit
+import tracemalloc
+from services.gemini_IVQuestionService import QUESTION_TEMPLATES, QUESTION_TEMPLATE_VALUES, QuestionTemplatePool
+
+
+def previous_question_pool():
+    """The nested loop the constructor ran before, kept for comparison."""
+    values = QUESTION_TEMPLATE_VALUES
+    questions = []
+    for template in QUESTION_TEMPLATES:
+        for field in values['field']:
+            for task in values['task']:
+                for challenge in values['challenge']:
+                    for goal in values['goal']:
+                        for scenario in values['scenario']:
+                            for problem in values['problem']:
+                                for objective in values['objective']:
+                                    for constraint in values['constraint']:
+                                        question = template.format(
+                                            task=task, field=field, challenge=challenge,
+                                            goal=goal, scenario=scenario, problem=problem,
+                                            objective=objective, constraint=constraint
+                                        )
+                                        questions.append(question)
+                                        if len(questions) >= 10000:
+                                            return questions
+    return questions
+
+
+def peak_bytes(build):
+    tracemalloc.start()
+    pool = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pool, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--samples', type=int, default=100000)
+    args = parser.parse_args()
+
+    builders = [
+        ('previous list', previous_question_pool, random.choice),
+        ('QuestionTemplatePool', lambda: QuestionTemplatePool(QUESTION_TEMPLATES, QUESTION_TEMPLATE_VALUES),
+         lambda pool: pool.sample())
+    ]
+    for name, build, sample in builders:
+        build_time = min(timeit.repeat(build, number=1, repeat=args.repeat))
+        pool, peak = peak_bytes(build)
+        sample_time = timeit.timeit(lambda: sample(pool), number=args.samples) / args.samples
+        print(f"{name:>20}: build {build_time * 1000:8.3f} ms, peak {peak / 1024:8.1f} KiB, "
+              f"{len(set(pool[index] for index in range(len(pool)))):>4} distinct of {len(pool):>5}, "
+              f"sample {sample_time * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Peak memory of receiving an interview video: base64 JSON versus chunked upload.
+
+The base64 path is what POST /submit-response does with a JSON body: the
+request body is read whole, parsed into InterviewResponseRequest and decoded
+by InterviewResponsePipeline.accept. The chunked path streams the same bytes
+through ResponseUploadStore in request-sized chunks and hands the file to
+accept_file. Peak traced memory is reported for videos of increasing length.
+Run from the backend directory:
+
+    python -m benchmarks.response_upload --minutes 1 5 10 20
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import tracemalloc
+from models.interview import InterviewResponseRequest
+from services.interview_pipeline import InterviewResponsePipeline
+from services.response_upload_service import ResponseUploadStore, INTERVIEW_UPLOAD_CHUNK_SIZE
+from tests.fake_firestore import FakeFirestore
+from tests.fake_storage import LocalBucket
+
+# Size of one piece of a streamed request body, as the server receives it; a multiple of 3 so
+# the base64 of repeated blocks is the repeated base64 of one block
+BLOCK_SIZE = 48 * 1024
+BLOCK = os.urandom(BLOCK_SIZE)
+BASE64_BLOCK = base64.b64encode(BLOCK)
+
+
+def video_blocks(minutes, bitrate_mbps):
+    return max(1, int(minutes * 60 * bitrate_mbps * 1e6 / 8) // BLOCK_SIZE)
+
+
+def base64_json_path(pipeline, db, bucket, blocks):
+    prefix = json.dumps({
+        'interviewId': "interview-1", 'linkCode': "code", 'question': "Question?", 'questionId': "question-1"
+    })[:-1].encode() + b', "videoResponse": "data:video/webm;base64,'
+    # The whole request body, as FastAPI reads it before parsing
+    body = b''.join([prefix, BASE64_BLOCK * blocks, b'"}'])
+    request = InterviewResponseRequest(**json.loads(body))
+    video_path = pipeline.accept(db, bucket, "application-1", request.interviewId, request.questionId,
+                                 "response-1", request.videoResponse)
+    os.unlink(video_path)
+
+
+def chunked_path(pipeline, db, bucket, blocks):
+    async def body(count):
+        for _ in range(count):
+            yield BLOCK
+
+    async def upload():
+        store = ResponseUploadStore()
+        session = store.create("application-1", "interview-1", "question-1", "Question?")
+        blocks_per_chunk = max(1, INTERVIEW_UPLOAD_CHUNK_SIZE // BLOCK_SIZE)
+        offset = 0
+        for start in range(0, blocks, blocks_per_chunk):
+            offset = await store.append(session['uploadId'], offset, body(min(blocks_per_chunk, blocks - start)))
+        return await store.pop(session['uploadId'])
+
+    session = asyncio.run(upload())
+    video_path = pipeline.accept_file(db, bucket, "application-1", "interview-1", "question-1",
+                                      "response-1", session['path'])
+    os.unlink(video_path)
+
+
+def peak_bytes(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--bitrate-mbps', type=float, default=2.5, help="video bitrate of a browser recording")
+    args = parser.parse_args()
+
+    pipeline = InterviewResponsePipeline(max_workers=1)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            bucket = LocalBucket(directory)
+            for minutes in args.minutes:
+                blocks = video_blocks(minutes, args.bitrate_mbps)
+                size = blocks * BLOCK_SIZE / 2**20
+                json_peak = peak_bytes(base64_json_path, pipeline, FakeFirestore(latency=0), bucket, blocks)
+                chunked_peak = peak_bytes(chunked_path, pipeline, FakeFirestore(latency=0), bucket, blocks)
+                print(f"{minutes:>5g} min ({size:7.1f} MiB): base64 JSON peak {json_peak / 2**20:8.1f} MiB, "
+                      f"chunked peak {chunked_peak / 2**10:7.1f} KiB")
+    finally:
+        pipeline.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""CPU time and peak memory of local DOCX extraction versus the Document AI path.
+
+The Document AI path runs process_document with the processor call stubbed:
+reportlab conversion, the ProcessRequest and reading the returned entities.
+The processor's own latency comes on top. Resumes are generated with
+python-docx in several sizes. Run from the backend directory:
+
+    python -m benchmarks.resume_extraction --paragraphs 50 500 2000
+"""
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+import docx
+from google.cloud import documentai
+from services import document_service
+from services.document_service import DocumentService
+
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+SENTENCE = "Led a team of five engineers to migrate billing services to Python, cutting costs by 30%."
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("jane.doe@example.com | +60 12-345 6789")
+    for index in range(paragraphs):
+        document.add_paragraph(f"{index}. {SENTENCE}")
+    table = document.add_table(rows=10, cols=2)
+    for row in table.rows:
+        row.cells[0].text = "Python"
+        row.cells[1].text = "Five years"
+    content = BytesIO()
+    document.save(content)
+    return content.getvalue()
+
+
+def local_path(content):
+    return DocumentService.extract_text_locally(content, "resume.docx")
+
+
+def stub_processor(api_endpoint, request):
+    """Answer like the resume processor without calling it."""
+    entities = [documentai.Document.Entity(type_='applicant_name', mention_text="Jane Doe"),
+                documentai.Document.Entity(type_='technical_skills', mention_text="Python")]
+    return documentai.ProcessResponse(document=documentai.Document(entities=entities))
+
+
+def document_ai_path(content):
+    return DocumentService.process_document(content, DOCX_MIME_TYPE, "resume.docx")
+
+
+def measure(func, content):
+    # Time and trace memory in separate runs; tracing slows allocation-heavy code several times over
+    start = time.process_time()
+    result = func(content)
+    cpu = time.process_time() - start
+    tracemalloc.start()
+    func(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[50, 500, 2000])
+    args = parser.parse_args()
+
+    if not document_service.reportlab_available:
+        parser.error("reportlab is required for the Document AI path")
+    document_service.LOCAL_EXTRACTION_EXTENSIONS = ['.docx']
+    document_service.documentai_clients.process = stub_processor
+    paths = [('local', local_path), ('document ai', document_ai_path)]
+
+    for paragraphs in args.paragraphs:
+        content = make_docx(paragraphs)
+        for name, func in paths:
+            result, cpu, peak = measure(func, content)
+            assert result is not None
+            print(f"{paragraphs:>5} paragraphs ({len(content) // 1024:>4} KiB): {name:>11} "
+                  f"{cpu * 1000:8.1f} ms CPU, peak {peak / 1024 / 1024:6.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
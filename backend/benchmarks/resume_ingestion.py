@@ -0,0 +1,120 @@
+"""Resume ingestion throughput (files/second) against worker pool size.
+
+Runs CandidateService.create_candidate on many resumes with local stand-ins:
+a storage bucket that charges a round trip plus upload time, Document AI
+calls with a fixed latency, and the in-memory Firestore from the tests. Each
+pool size is timed twice. The first run uploads and then extracts each file
+one after the other, as before. The second overlaps the two, as now. Run
+from the backend directory:
+
+    python -m benchmarks.resume_ingestion --files 32 --workers 1 2 4 8 16
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from firebase_admin import firestore
+from services import candidate_service
+from services.candidate_service import CandidateService
+from services.document_service import DocumentService
+from services.extraction_cache import ExtractionCache
+from tests.fake_firestore import FakeFirestore, fake_transactional, make_firebase_client
+
+
+class LatencyBlob:
+    def __init__(self, bucket, path):
+        self._bucket = bucket
+        self.public_url = f"https://storage.example/{bucket.name}/{path}"
+
+    def upload_from_string(self, data, content_type=None):
+        time.sleep(self._bucket.round_trip + len(data) / self._bucket.bandwidth)
+
+    def make_public(self):
+        time.sleep(self._bucket.round_trip)
+
+
+class LatencyBucket:
+    """Storage stand-in that only charges network time."""
+
+    def __init__(self, round_trip, bandwidth):
+        self.name = "benchmark-bucket"
+        self.round_trip = round_trip
+        self.bandwidth = bandwidth
+
+    def blob(self, path):
+        return LatencyBlob(self, path)
+
+
+class DisabledExtractionCache:
+    """Always misses, so every resume reaches Document AI."""
+
+    make_key = staticmethod(ExtractionCache.make_key)
+
+    def get(self, key, file_size):
+        return None
+
+    def set(self, key, extracted_text):
+        pass
+
+
+def fixed_latency_extraction(latency):
+    def process_document(file_content, content_type, file_name):
+        time.sleep(latency)
+        return {'applicant_name': file_name, 'technical_skills': "python"}
+    return process_document
+
+
+def previous_create_candidate(job_id, file_content, file_name, content_type):
+    """Upload, then extract: the order create_candidate used before."""
+    candidate_id, storage_path, download_url = CandidateService.upload_resume(job_id, file_content, file_name, content_type)
+    extracted_data = DocumentService.process_document(file_content, content_type, file_name)
+    return CandidateService.save_candidate(candidate_id, extracted_data, download_url, storage_path)
+
+
+def files_per_second(create, files, workers):
+    # Each in-flight file may hold an upload and an extraction on the IO pool at once
+    candidate_service._io_executor = ThreadPoolExecutor(max_workers=workers * 2)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda file: create("job-1", *file), files))
+    elapsed = time.perf_counter() - start
+    candidate_service._io_executor.shutdown()
+    assert all(results), "some resumes failed"
+    return len(files) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--size', type=int, default=300 * 1024, help="bytes per resume")
+    parser.add_argument('--round-trip', type=float, default=0.02, help="seconds per storage or Firestore round trip")
+    parser.add_argument('--bandwidth', type=float, default=10e6, help="upload bytes per second")
+    parser.add_argument('--extraction', type=float, default=0.3, help="seconds per Document AI call")
+    args = parser.parse_args()
+
+    original = (candidate_service.firebase_client, candidate_service.extraction_cache,
+                candidate_service._io_executor, DocumentService.process_document, firestore.transactional)
+    candidate_service.firebase_client = make_firebase_client(FakeFirestore(latency=args.round_trip))
+    candidate_service.firebase_client.bucket = LatencyBucket(args.round_trip, args.bandwidth)
+    candidate_service.extraction_cache = DisabledExtractionCache()
+    DocumentService.process_document = staticmethod(fixed_latency_extraction(args.extraction))
+    firestore.transactional = fake_transactional
+    files = [(os.urandom(args.size), f"resume-{index}.pdf", "application/pdf") for index in range(args.files)]
+
+    try:
+        print(f"{args.files} resumes of {args.size // 1024} KiB, {args.extraction}s extraction, "
+              f"{args.round_trip * 1000:.0f} ms round trips")
+        for workers in args.workers:
+            sequential = files_per_second(previous_create_candidate, files, workers)
+            overlapped = files_per_second(CandidateService.create_candidate, files, workers)
+            print(f"{workers:>3} workers: upload then extract {sequential:6.1f} files/s, "
+                  f"overlapped {overlapped:6.1f} files/s")
+    finally:
+        (candidate_service.firebase_client, candidate_service.extraction_cache,
+         candidate_service._io_executor, process_document, firestore.transactional) = original
+        DocumentService.process_document = staticmethod(process_document)
+
+
+if __name__ == '__main__':
+    main()
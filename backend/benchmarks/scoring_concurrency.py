@@ -0,0 +1,99 @@
+"""Wall-clock benchmark of GeminiService.rank_applicants with a stubbed model.
+
+The model answers every call after a fixed latency, with no network. Each pool
+size is ranked one applicant at a time (an in-flight limit of 1, as before
+concurrent scoring) and then with the configured limit. Run from the
+backend directory:
+
+    python -m benchmarks.scoring_concurrency --latency 0.5 --applicants 10 50 300
+"""
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from services import gemini_service
+from services.gemini_service import GeminiService
+from services.score_cache import ScoreCache
+
+SCORES = {
+    "rank_score": {"relevance": 7, "proficiency": 6, "additionalSkill": 5},
+    "reasoning": {"relevance": "Matches", "proficiency": "Solid", "additionalSkill": "Some"}
+}
+
+
+class FixedLatencyModel:
+    """Answers every prompt with the same scores after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_content_async(self, contents):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text=json.dumps(SCORES))
+
+
+class DisabledScoreCache:
+    """Always misses, so every applicant reaches the model."""
+
+    make_key = staticmethod(ScoreCache.make_key)
+
+    def get(self, key):
+        return None
+
+    def set(self, key, result):
+        pass
+
+
+def make_service(model) -> GeminiService:
+    # Skip __init__, which configures the real Gemini and Firestore clients
+    service = GeminiService.__new__(GeminiService)
+    service.model = model
+    return service
+
+
+def make_applicants(count):
+    return [{'id': f"applicant-{index}", 'extractedText': {'skills': f"python {index}"}} for index in range(count)]
+
+
+async def time_ranking(service, applicants, limit):
+    gemini_service.MAX_CONCURRENT_SCORING = limit
+    start = time.perf_counter()
+    result = await service.rank_applicants("skills", applicants, {'jobDescription': "Backend engineer"})
+    elapsed = time.perf_counter() - start
+    assert len(result['applicants']) == len(applicants)
+    return elapsed
+
+
+async def run(latency, sizes, limit):
+    model = FixedLatencyModel(latency)
+    service = make_service(model)
+    print(f"model latency {latency:.3f}s, in-flight limit {limit}")
+    for size in sizes:
+        applicants = make_applicants(size)
+        sequential = await time_ranking(service, applicants, 1)
+        concurrent = await time_ranking(service, applicants, limit)
+        print(f"{size:>5} applicants: sequential {sequential:7.2f}s, concurrent {concurrent:7.2f}s, "
+              f"speedup {sequential / concurrent:5.1f}x")
+    print(f"model calls: {model.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds per model call")
+    parser.add_argument('--applicants', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--limit', type=int, default=gemini_service.MAX_CONCURRENT_SCORING)
+    args = parser.parse_args()
+
+    original_cache, original_limit = gemini_service.score_cache, gemini_service.MAX_CONCURRENT_SCORING
+    gemini_service.score_cache = DisabledScoreCache()
+    try:
+        asyncio.run(run(args.latency, args.applicants, args.limit))
+    finally:
+        gemini_service.score_cache, gemini_service.MAX_CONCURRENT_SCORING = original_cache, original_limit
+
+
+if __name__ == '__main__':
+    main()
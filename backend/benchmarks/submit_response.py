@@ -0,0 +1,134 @@
+"""No-network throughput benchmark of POST /api/interviews/submit-response.
+
+Runs the real route and interview pipeline (ffmpeg audio extraction, voice
+effect and scoring) with the local transcriber, the in-memory Firestore from
+the tests and a bucket that copies files into a temp directory. Reports the
+request latency and how long the pipeline takes to finish every answer.
+Needs the backend requirements and ffmpeg (on PATH or set with FFMPEG_PATH);
+it is skipped without ffmpeg. Run from the backend directory:
+
+    python -m benchmarks.submit_response --answers 40 --concurrency 8 --seconds 5
+"""
+import os
+
+# Must be chosen before the transcription service creates its backend
+os.environ['TRANSCRIPTION_BACKEND'] = 'local'
+
+import argparse
+import asyncio
+import base64
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+import httpx
+from fastapi import FastAPI
+from firebase_admin import firestore
+from api import interviews
+from services import interview_service
+from services.ffmpeg_service import get_ffmpeg
+from services.interview_pipeline import STAGE_COMPLETED, STAGE_FAILED
+from tests.fake_firestore import FakeFirestore, fake_transactional
+from tests.fake_storage import LocalBucket
+
+
+def make_clip(directory, seconds):
+    """Encode a tone as a Matroska file, the container family of the browser's webm uploads."""
+    path = os.path.join(directory, "answer.mkv")
+    subprocess.run([
+        get_ffmpeg().path, '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f'sine=frequency=220:duration={seconds}',
+        '-ac', '1', '-ar', '48000', '-c:a', 'pcm_s16le', '-f', 'matroska', path
+    ], check=True)
+    with open(path, 'rb') as clip:
+        return base64.b64encode(clip.read()).decode('ascii')
+
+
+def seed_interviews(db, count):
+    for index in range(count):
+        db.collection('interviewLinks').document(f"interview-{index}").set({
+            'applicationId': f"application-{index}",
+            'linkCode': "benchmark",
+            'expiryDate': datetime.utcnow() + timedelta(days=1),
+            'status': 'pending'
+        })
+
+
+def finished_answers(db, interview_count):
+    finished = 0
+    for index in range(interview_count):
+        document = db.data('interviewResponses', f"application-{index}") or {}
+        finished += sum(status['stage'] in (STAGE_COMPLETED, STAGE_FAILED)
+                        for status in document.get('responseStatus', {}).values())
+    return finished
+
+
+async def run(args, db, app, video):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def submit(client, index):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/interviews/submit-response", json={
+                'interviewId': f"interview-{index % args.interviews}",
+                'linkCode': "benchmark",
+                'question': "Tell us about a project you are proud of.",
+                'questionId': f"question-{index}",
+                'videoResponse': video
+            })
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        await asyncio.gather(*(submit(client, index) for index in range(args.answers)))
+    accepted = time.perf_counter() - start
+
+    while finished_answers(db, args.interviews) < args.answers:
+        await asyncio.sleep(0.1)
+    processed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{args.answers} answers of {args.seconds}s, {args.concurrency} concurrent requests")
+    print(f"request latency: median {statistics.median(latencies) * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+    print(f"accepted all in {accepted:.2f}s ({args.answers / accepted:.1f} answers/s)")
+    print(f"processed all in {processed:.2f}s ({args.answers / processed:.2f} answers/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--answers', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--interviews', type=int, default=10)
+    parser.add_argument('--seconds', type=float, default=5.0, help="length of each answer clip")
+    args = parser.parse_args()
+    try:
+        get_ffmpeg()
+    except RuntimeError as e:
+        parser.exit(message=f"Skipping: {e}\n")
+
+    db = FakeFirestore()
+    seed_interviews(db, args.interviews)
+    firestore.transactional = fake_transactional
+    # The link check reads interviewLinks through get_db directly rather than as a dependency
+    interview_service.get_db = lambda: db
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = FastAPI()
+        app.include_router(interviews.router, prefix="/api/interviews")
+        app.dependency_overrides[interviews.get_db] = lambda: db
+        app.dependency_overrides[interviews.get_storage] = lambda: LocalBucket(directory)
+
+        video = make_clip(directory, args.seconds)
+        try:
+            asyncio.run(run(args, db, app, video))
+        finally:
+            interviews.interview_pipeline.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Microbenchmark of transcript normalization on long transcripts.
+
+Compares normalize_transcript with the previous post_process_transcript,
+which rebuilt the string at every sentence boundary, and checks that both
+produce the same text. Run from the backend directory:
+
+    python -m benchmarks.transcript_normalization --words 10000
+"""
+import argparse
+import random
+import timeit
+from services.interview_service import normalize_transcript
+
+VOCABULARY = ['so', 'i', 'think', 'the', 'team', 'project', 'worked', 'well', 'because', 'we', 'planned', 'it']
+
+
+def previous_post_process_transcript(transcript):
+    """The implementation normalize_transcript replaced, kept for comparison."""
+    cleaned = ' '.join(transcript.split())
+
+    words = cleaned.split()
+    deduped_words = []
+    for i, word in enumerate(words):
+        if i == 0 or word.lower() != words[i-1].lower():
+            deduped_words.append(word)
+
+    cleaned = ' '.join(deduped_words)
+
+    if cleaned and len(cleaned) > 0:
+        cleaned = cleaned[0].upper() + cleaned[1:]
+
+        for i in range(1, len(cleaned)-1):
+            if cleaned[i-1] in ['.', '!', '?'] and cleaned[i] == ' ':
+                cleaned = cleaned[:i+1] + cleaned[i+1].upper() + cleaned[i+2:]
+
+    if cleaned and not cleaned[-1] in ['.', '!', '?']:
+        cleaned += '.'
+
+    return cleaned
+
+
+def make_transcript(word_count, seed=0):
+    """Speech-like text with sentence breaks every few words and occasional stutters."""
+    rng = random.Random(seed)
+    words = []
+    while len(words) < word_count:
+        word = rng.choice(VOCABULARY)
+        if rng.random() < 0.05:
+            words.append(word)
+        if rng.random() < 0.1:
+            word += rng.choice('.!?')
+        words.append(word)
+    return ' '.join(words[:word_count])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    transcript = make_transcript(args.words)
+    normalized, word_indices = normalize_transcript(transcript)
+    assert normalized == previous_post_process_transcript(transcript), "outputs differ"
+    assert len(word_indices) == len(normalized.split())
+
+    for name, func in [('previous', previous_post_process_transcript), ('normalize_transcript', normalize_transcript)]:
+        best = min(timeit.repeat(lambda: func(transcript), number=1, repeat=args.repeat))
+        print(f"{name:>22}: {best * 1000:8.2f} ms for {args.words} words")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Latency of the sync, streaming and long-running recognition modes.
+
+SpeechTranscriber runs against a fake Speech-to-Text client registered as the
+shared speech_client. The fake charges a round trip, upload time at a fixed
+bandwidth, and processing at a fixed real-time factor. Long-running jobs are
+only seen finished at the client's polling intervals. Every delay is multiplied
+by --scale so a run is quick; the printed times are unscaled. Run from the
+backend directory:
+
+    python -m benchmarks.transcription_modes --seconds 10 30 55 120 240
+"""
+import argparse
+import os
+import tempfile
+import time
+import wave
+from datetime import timedelta
+from google.cloud import speech
+from services.service_registry import service_registry
+from services.transcription_service import (
+    SpeechTranscriber, MODE_SYNC, MODE_STREAMING, MODE_LONG_RUNNING,
+    TRANSCRIBE_SYNC_MAX_SECONDS, TRANSCRIBE_STREAMING_MAX_SECONDS
+)
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+# api_core polls long-running operations starting at 1 s, growing by 1.5x
+POLL_INITIAL_SECONDS = 1.0
+POLL_MULTIPLIER = 1.5
+
+
+def fake_results(duration, result_type=speech.SpeechRecognitionResult, **fields):
+    words = [
+        speech.WordInfo(word="answer", start_time=timedelta(seconds=second), end_time=timedelta(seconds=second + 0.4),
+                        confidence=0.9)
+        for second in range(int(duration))
+    ]
+    alternative = speech.SpeechRecognitionAlternative(
+        transcript=' '.join(word.word for word in words), confidence=0.9, words=words
+    )
+    return [result_type(alternatives=[alternative], **fields)]
+
+
+class FakeOperation:
+    def __init__(self, client, duration):
+        self._client = client
+        self._duration = duration
+
+    def result(self, timeout=None):
+        ready = self._client.round_trip + self._duration * self._client.real_time_factor
+        waited, interval = 0.0, POLL_INITIAL_SECONDS
+        while waited < ready:
+            waited += interval
+            interval *= POLL_MULTIPLIER
+        self._client.sleep(waited)
+        return speech.LongRunningRecognizeResponse(results=fake_results(self._duration))
+
+
+class FakeSpeechClient:
+    """Charges network and processing time the way the Speech API would, without calling it."""
+
+    def __init__(self, round_trip, bandwidth, real_time_factor, scale):
+        self.round_trip = round_trip
+        self.bandwidth = bandwidth
+        self.real_time_factor = real_time_factor
+        self.scale = scale
+        # Audio duration of each clip "uploaded" to storage, by GCS URI
+        self.durations = {}
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.scale)
+
+    def recognize(self, config, audio, timeout=None):
+        duration = len(audio.content) / BYTES_PER_SECOND
+        self.sleep(self.round_trip + len(audio.content) / self.bandwidth + duration * self.real_time_factor)
+        return speech.RecognizeResponse(results=fake_results(duration))
+
+    def streaming_recognize(self, config, requests, timeout=None):
+        # Recognition keeps up with the upload, so only the work left after the last chunk is waited for
+        sent = 0
+        for request in requests:
+            sent += len(request.audio_content)
+            self.sleep(len(request.audio_content) / self.bandwidth)
+        duration = sent / BYTES_PER_SECOND
+        self.sleep(self.round_trip + max(0.0, duration * self.real_time_factor - sent / self.bandwidth))
+        yield speech.StreamingRecognizeResponse(
+            results=fake_results(duration, speech.StreamingRecognitionResult, is_final=True)
+        )
+
+    def long_running_recognize(self, config, audio):
+        # The audio is already in storage; the service reads the duration from it
+        return FakeOperation(self, self.durations[audio.uri])
+
+
+def write_silence(path, seconds):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(b'\0' * int(seconds * BYTES_PER_SECOND))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, nargs='+', default=[10, 30, 55, 120, 240])
+    parser.add_argument('--round-trip', type=float, default=0.15, help="seconds per API round trip")
+    parser.add_argument('--bandwidth', type=float, default=2e6, help="upload bytes per second")
+    parser.add_argument('--real-time-factor', type=float, default=0.05, help="processing seconds per audio second")
+    parser.add_argument('--scale', type=float, default=0.1, help="multiplier applied to every simulated delay")
+    args = parser.parse_args()
+
+    client = FakeSpeechClient(args.round_trip, args.bandwidth, args.real_time_factor, args.scale)
+    service_registry.register("speech_client", lambda: client)
+    transcriber = SpeechTranscriber()
+    modes = [
+        (MODE_SYNC, transcriber.recognize_sync, TRANSCRIBE_SYNC_MAX_SECONDS),
+        (MODE_STREAMING, transcriber.recognize_streaming, TRANSCRIBE_STREAMING_MAX_SECONDS),
+        (MODE_LONG_RUNNING, transcriber.recognize_long_running, float('inf'))
+    ]
+
+    print(f"round trip {args.round_trip}s, {args.bandwidth / 1e6:g} MB/s upload, real-time factor {args.real_time_factor}")
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in args.seconds:
+            path = os.path.join(directory, f"{seconds:g}.wav")
+            write_silence(path, seconds)
+            uri = f"gs://benchmark/{seconds:g}.wav"
+            client.durations[uri] = seconds
+
+            timings = []
+            for mode, recognize, limit in modes:
+                if seconds > limit:
+                    timings.append(f"{mode} {'n/a':>6}")
+                    continue
+                start = time.perf_counter()
+                results = recognize(uri if mode == MODE_LONG_RUNNING else path)
+                elapsed = (time.perf_counter() - start) / args.scale
+                assert SpeechTranscriber.parse_results(results)['word_count'] == int(seconds)
+                timings.append(f"{mode} {elapsed:5.2f}s")
+            chosen = transcriber.choose_mode(seconds)
+            print(f"{seconds:>5g}s clip: {', '.join(timings)} (chooses {chosen})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""p50/p99 latency of counting an answer's words, before and after.
+
+Before, every submit-response called nltk.download('punkt') and then
+word_tokenize just to count words. Now count_words reuses the transcription's
+word-timing indices, and NLTK data is checked once at startup. The two
+tokenizer paths need nltk and its punkt data and are skipped without them.
+Run from the backend directory:
+
+    python -m benchmarks.word_count --requests 500 --words 150
+"""
+import argparse
+import random
+import statistics
+import time
+from services.nltk_resources import count_words
+from services.service_registry import service_registry
+
+WORDS = "so i think the team project worked well because we planned it carefully.".split()
+
+
+def previous_word_count(transcript):
+    """What submit-response did for every answer before."""
+    import nltk
+    nltk.download('punkt', quiet=True)
+    from nltk.tokenize import word_tokenize
+    return len(word_tokenize(transcript))
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--words', type=int, default=150, help="words per answer")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [rng.choice(WORDS) for _ in range(args.words)]
+    transcript = ' '.join(words)
+    word_timing_indices = list(range(len(words)))
+    # Startup bootstrap, so neither side pays for a first download
+    try:
+        available = service_registry.get("nltk_data")
+    except ImportError:
+        available = frozenset()
+    tokenizer_available = {'punkt', 'punkt_tab'} <= available
+
+    paths = [
+        ('download + tokenize', lambda: previous_word_count(transcript)),
+        ('count_words', lambda: count_words(transcript, word_timing_indices)),
+        ('count_words, no timings', lambda: count_words(transcript))
+    ]
+    if not tokenizer_available:
+        print("NLTK punkt data is unavailable, skipping the tokenizer paths")
+        paths = [path for path in paths if path[0] == 'count_words']
+    for name, count in paths:
+        latencies = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            count()
+            latencies.append(time.perf_counter() - start)
+        p50, p99 = percentiles(latencies)
+        print(f"{name:>24}: p50 {p50 * 1e6:9.1f} us, p99 {p99 * 1e6:9.1f} us")
+
+
+if __name__ == '__main__':
+    main()
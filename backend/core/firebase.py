@@ -8,6 +8,9 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of document references sent in a single batched read
+BATCH_GET_CHUNK_SIZE = 100
+
 class FirebaseClient:
     """Firebase client for interacting with Firestore and Storage."""
     
@@ -139,7 +142,39 @@ class FirebaseClient:
         except Exception as e:
             logger.error(f"Error getting document: {e}")
             return None
-    
+
+    def get_documents(self, collection: str, document_ids: List[str], chunk_size: int = BATCH_GET_CHUNK_SIZE) -> Dict[str, Dict[str, Any]]:
+        """Get many documents from a collection using batched reads.
+
+        Documents are fetched with ``get_all`` in chunks of ``chunk_size`` so N ids
+        cost N/chunk_size round trips instead of N. Missing documents are left out
+        of the returned mapping of document ID to document data.
+        """
+        if not self.initialized or not self.db:
+            logger.error("Firebase client not initialized")
+            return {}
+
+        # Drop empty and duplicate IDs while keeping the caller's order
+        unique_ids = list(dict.fromkeys(doc_id for doc_id in document_ids if doc_id))
+        results = {}
+
+        try:
+            collection_ref = self.db.collection(collection)
+            for start in range(0, len(unique_ids), chunk_size):
+                chunk = unique_ids[start:start + chunk_size]
+                doc_refs = [collection_ref.document(doc_id) for doc_id in chunk]
+                for doc in self.db.get_all(doc_refs):
+                    if doc.exists:
+                        results[doc.id] = doc.to_dict()
+
+            missing_count = len(unique_ids) - len(results)
+            if missing_count:
+                logger.info(f"{missing_count} of {len(unique_ids)} documents not found in collection {collection}")
+            return results
+        except Exception as e:
+            logger.error(f"Error getting documents: {e}")
+            return results
+
     def create_document(self, collection: str, document_id: str, data: Dict[str, Any]) -> bool:
         """Create a new document in Firestore."""
         if not self.initialized or not self.db:
@@ -239,26 +274,23 @@ class FirebaseClient:
             # Get the counter reference
             counter_ref = self.db.collection('counters').document(f'{prefix}_counter')
             
-            # Use atomic increment operation to update the counter
-            counter_ref.set(
-                {'count': firestore.Increment(1)}, 
-                merge=True
-            )
+            # Increment and read the counter in one transaction so concurrent
+            # callers can never be handed the same number
+            @firestore.transactional
+            def increment_counter(transaction):
+                snapshot = counter_ref.get(transaction=transaction)
+                count = snapshot.to_dict().get('count', 0) + 1 if snapshot.exists else 1
+                transaction.set(counter_ref, {'count': count}, merge=True)
+                return count
             
-            # Get the updated count
-            counter_doc = counter_ref.get()
-            if counter_doc.exists:
-                current_count = counter_doc.to_dict().get('count', 1)
-            else:
-                # This shouldn't happen due to merge=True above, but just in case
-                current_count = 1
+            current_count = increment_counter(self.db.transaction())
                 
             # Format as 8-digit number
             formatted_number = f"{current_count:08d}"
             return f"{prefix}-{formatted_number}"
             
         except Exception as e:
-            logger.error(f"Error generating ID with atomic increment: {e}")
+            logger.error(f"Error generating ID with transactional increment: {e}")
             # Fallback to random ID if atomic increment fails
             import random
             formatted_number = f"{random.randint(1, 99999999):08d}"
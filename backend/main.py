@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import importlib
 import logging
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -22,9 +25,19 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Import API routers
+# Import API routers, timing each one so cold-start cost can be tracked
+IMPORT_TIMINGS = {}
+for module_name in ("api.interviews", "api.jobs", "api.candidates", "api.interview_questions"):
+    import_start = time.perf_counter()
+    importlib.import_module(module_name)
+    IMPORT_TIMINGS[module_name] = round(time.perf_counter() - import_start, 3)
+    logger.info(f"Imported {module_name} in {IMPORT_TIMINGS[module_name]:.3f}s")
+
 from api import interviews, jobs, candidates, interview_questions
 
+# Comma-separated services to construct in the background at startup, e.g. "nlp_client,embedding_model"
+WARM_UP_SERVICES = [name.strip() for name in os.getenv("WARM_UP_SERVICES", "").split(",") if name.strip()]
+
 # Initialize FastAPI app
 app = FastAPI(title="EqualLens API", 
               description="API for EqualLens job and CV management",
@@ -45,6 +58,26 @@ app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])  # Fixed pref
 app.include_router(candidates.router, prefix="/api/candidates", tags=["candidates"])
 app.include_router(interview_questions.router, prefix="/api/interview-questions", tags=["interview-questions"])
 
+@app.on_event("startup")
+async def warm_up_services():
+    """Check NLTK data and optionally load slow clients and models, without delaying startup."""
+    from services.service_registry import service_registry
+    services = ["nltk_data"] + [name for name in WARM_UP_SERVICES if name != "nltk_data"]
+    logger.info(f"Warming up services in the background: {services}")
+    asyncio.get_running_loop().run_in_executor(None, service_registry.warm_up, services)
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    """Stop background work and close shared service clients."""
+    from services.ingestion_service import ingestion_service
+    from services.interview_pipeline import interview_pipeline
+    from services.service_registry import service_registry
+    
+    await ingestion_service.shutdown()
+    # Answers being processed are allowed to finish, without blocking the event loop
+    await asyncio.to_thread(interview_pipeline.shutdown)
+    service_registry.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "EqualLens API is running"}
@@ -53,6 +86,11 @@ async def root():
 async def health_check():
     """Health check endpoint to verify API is accessible"""
     from core.firebase import firebase_client
+    from services.document_service import documentai_clients
+    from services.extraction_cache import extraction_cache
+    from services.score_cache import score_cache
+    from services.service_registry import service_registry
+    from services.embedding_service import embedding_service
     
     firebase_status = {
         "initialized": firebase_client.initialized,
@@ -74,6 +112,12 @@ async def health_check():
     return {
         "status": "healthy",
         "firebase": firebase_status,
+        "documentAI": documentai_clients.metrics(),
+        "extractionCache": extraction_cache.stats(),
+        "scoreCache": score_cache.stats(),
+        "services": service_registry.metrics(),
+        "embeddingCache": embedding_service.stats(),
+        "startup": {"importSeconds": IMPORT_TIMINGS},
         "environment": {
             "cwd": os.getcwd(),
             "firebase_config_env": os.getenv("FIREBASE_CONFIG_PATH"),
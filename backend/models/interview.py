@@ -44,10 +44,22 @@ class InterviewResponseRequest(BaseModel):
     questionId: str
     videoResponse: str  # Base64 encoded video data or empty if directly uploading to storage
     
+class InterviewResponseUploadRequest(BaseModel):
+    interviewId: str
+    linkCode: str
+    question: str
+    questionId: str
+
+class InterviewResponseUploadResponse(BaseModel):
+    uploadId: str
+    offset: int = 0
+    chunkSize: int  # Suggested bytes per PUT
+
 class InterviewResponseResponse(BaseModel):
     success: bool
     responseId: str
     message: str = "Response recorded successfully"
     transcript: Optional[str] = None
     word_count: Optional[int] = 0
-    word_timings: Optional[List[Dict[str, Any]]] = []  # Add word timings to the response model
\ No newline at end of file
+    word_timings: Optional[List[Dict[str, Any]]] = []  # Add word timings to the response model
+    status: Optional[str] = None  # "processing" while transcription and scoring run in the background
\ No newline at end of file
@@ -1,64 +1,202 @@
 import logging
+import os
 import uuid
-from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime
 from core.firebase import firebase_client
-from services.document_service import DocumentService
+from services.document_service import DocumentService, DOCUMENT_AI_FALLBACK_RESULT, get_processor_config
+from services.extraction_cache import extraction_cache
 from models.candidate import CandidateCreate, CandidateResponse, CandidateUpdate
 
 logger = logging.getLogger(__name__)
 
+# Shared pool that runs a resume's storage upload and Document AI extraction side by side.
+# Kept separate from the ingestion worker pool so nested submits can never deadlock.
+CANDIDATE_IO_WORKERS = int(os.getenv("CANDIDATE_IO_WORKERS", "8"))
+_io_executor = ThreadPoolExecutor(max_workers=CANDIDATE_IO_WORKERS, thread_name_prefix="candidate-io")
+
 class CandidateService:
     """Service for managing candidates and their resumes."""
     
     @staticmethod
-    def create_candidate(job_id: str, file_content: bytes, file_name: str, content_type: str) -> Optional[Dict[str, Any]]:
-        """Create a new candidate from an uploaded resume."""
+    def upload_resume(job_id: str, file_content: bytes, file_name: str, content_type: str) -> Tuple[str, str, Optional[str]]:
+        """Allocate a candidate ID and upload the resume. Returns (candidate_id, storage_path, download_url)."""
+        # Generate a candidate ID
+        candidate_id = firebase_client.generate_counter_id("cand")
+        
+        # Create a storage path for the resume
+        file_id = str(uuid.uuid4())
+        file_extension = file_name.split('.')[-1]
+        storage_path = f"resumes/{job_id}/{candidate_id}/{file_id}.{file_extension}"
+        
+        # Upload file to storage
+        download_url = firebase_client.upload_file(file_content, storage_path, content_type)
+        if not download_url:
+            logger.error(f"Failed to upload resume for candidate {candidate_id}")
+        return candidate_id, storage_path, download_url
+    
+    @staticmethod
+    def save_candidate(candidate_id: str, extracted_data: Dict[str, Any], download_url: str, storage_path: str) -> Optional[Dict[str, Any]]:
+        """Store the candidate document for an uploaded and extracted resume."""
+        # Get current timestamp
+        current_time = datetime.now().isoformat()
+        
+        # Create candidate document
+        candidate_doc = {
+            'candidateId': candidate_id,
+            'extractedText': extracted_data,
+            'resumeUrl': download_url,
+            'storagePath': storage_path,
+            'uploadedAt': current_time
+        }
+        
+        # Store candidate in Firestore
+        success = firebase_client.create_document('candidates', candidate_id, candidate_doc)
+        if not success:
+            logger.error(f"Failed to create candidate {candidate_id}")
+            return None
+        
+        return {
+            'candidateId': candidate_id,
+            'resumeUrl': download_url,
+            'extractedData': extracted_data
+        }
+    
+    @staticmethod
+    def cache_extraction(cache_key: str, extracted_data: Dict[str, Any]) -> None:
+        """Remember a real Document AI result so the same file is never extracted twice."""
+        if extracted_data and extracted_data != DOCUMENT_AI_FALLBACK_RESULT:
+            extraction_cache.set(cache_key, extracted_data)
+    
+    @staticmethod
+    def create_candidate(job_id: str, file_content: bytes, file_name: str, content_type: str,
+                         on_uploaded: Optional[Callable[[], None]] = None) -> Optional[Dict[str, Any]]:
+        """Create a new candidate from an uploaded resume.
+
+        ``on_uploaded`` is called once the resume is in storage; extraction may still be running.
+        """
         try:
-            # Generate a candidate ID
-            candidate_id = firebase_client.generate_counter_id("cand")
+            # Start the upload first so the cache lookup and extraction overlap with it
+            upload_future = _io_executor.submit(CandidateService.upload_resume, job_id, file_content, file_name, content_type)
+            
+            # Reuse the extraction if this exact file was already processed (e.g. the same CV sent to another job)
+            cache_key = extraction_cache.make_key(file_content, get_processor_config()['processor_version'])
+            extracted_data = extraction_cache.get(cache_key, len(file_content))
             
-            # Create a storage path for the resume
-            file_id = str(uuid.uuid4())
-            file_extension = file_name.split('.')[-1]
-            storage_path = f"resumes/{job_id}/{candidate_id}/{file_id}.{file_extension}"
+            # Otherwise read the file locally if enabled, and only then call Document AI
+            if extracted_data is None:
+                extracted_data = DocumentService.extract_text_locally(file_content, file_name)
+            extract_future = None
+            if extracted_data is None:
+                extract_future = _io_executor.submit(DocumentService.process_document, file_content, content_type, file_name)
             
-            # Upload file to storage
-            download_url = firebase_client.upload_file(file_content, storage_path, content_type)
+            candidate_id, storage_path, download_url = upload_future.result()
             if not download_url:
-                logger.error(f"Failed to upload resume for candidate {candidate_id}")
+                # cancel() only drops an extraction that has not started yet. One that is already
+                # running still completes (and is billed), so keep its result for the next upload
+                if extract_future and not extract_future.cancel():
+                    def cache_finished_extraction(future):
+                        if future.exception() is None:
+                            CandidateService.cache_extraction(cache_key, future.result())
+                    extract_future.add_done_callback(cache_finished_extraction)
                 return None
             
-            # Extract data from document
-            extracted_data = DocumentService.process_document(file_content, content_type, file_name)
+            if on_uploaded:
+                on_uploaded()
             
-            # Get current timestamp
-            current_time = datetime.now().isoformat()
+            if extract_future:
+                extracted_data = extract_future.result()
+                CandidateService.cache_extraction(cache_key, extracted_data)
             
-            # Create candidate document
-            candidate_doc = {
-                'candidateId': candidate_id,
-                'extractedText': extracted_data,
-                'resumeUrl': download_url,
-                'storagePath': storage_path,
-                'uploadedAt': current_time
-            }
-            
-            # Store candidate in Firestore
-            success = firebase_client.create_document('candidates', candidate_id, candidate_doc)
-            if not success:
-                logger.error(f"Failed to create candidate {candidate_id}")
-                return None
-            
-            return {
-                'candidateId': candidate_id,
-                'resumeUrl': download_url,
-                'extractedData': extracted_data
-            }
+            return CandidateService.save_candidate(candidate_id, extracted_data, download_url, storage_path)
         except Exception as e:
             logger.error(f"Error creating candidate: {e}")
             return None
     
+    @staticmethod
+    def create_candidates_batch(job_id: str, files: List[Tuple[bytes, str, str]],
+                                on_uploaded: Optional[Callable[[int], None]] = None) -> List[Optional[Dict[str, Any]]]:
+        """Create candidates for a large upload, extracting resumes with Document AI batch requests.
+
+        Args:
+            job_id: Job the resumes were uploaded for
+            files: List of (file_content, file_name, content_type)
+            on_uploaded: Called with a file's index once it is in storage
+
+        Returns:
+            The create_candidate result for each file, in input order (None on failure)
+        """
+        results = [None] * len(files)
+        processor_version = get_processor_config()['processor_version']
+        
+        # Upload every resume concurrently while cached extractions are looked up,
+        # falling back to local extraction (if enabled) for cache misses
+        upload_futures = [
+            _io_executor.submit(CandidateService.upload_resume, job_id, content, file_name, content_type)
+            for content, file_name, content_type in files
+        ]
+        cache_keys = [extraction_cache.make_key(content, processor_version) for content, _, _ in files]
+
+        def cached_or_local(index: int) -> Optional[Dict[str, Any]]:
+            content, file_name, _ = files[index]
+            extracted_data = extraction_cache.get(cache_keys[index], len(content))
+            if extracted_data is None:
+                extracted_data = DocumentService.extract_text_locally(content, file_name)
+            return extracted_data
+
+        # A pool of its own, so the lookups don't queue behind the uploads on the shared one
+        with ThreadPoolExecutor(max_workers=CANDIDATE_IO_WORKERS, thread_name_prefix="candidate-lookup") as lookup_executor:
+            extracted = list(lookup_executor.map(cached_or_local, range(len(files))))
+        uploads = []
+        for index, future in enumerate(upload_futures):
+            try:
+                upload = future.result()
+            except Exception as e:
+                logger.error(f"Error uploading resume {files[index][1]}: {e}")
+                upload = (None, None, None)
+            if upload[2] and on_uploaded:
+                on_uploaded(index)
+            uploads.append(upload)
+        
+        # Batch-extract the uploaded files that are not cached and need no conversion
+        bucket = firebase_client.bucket
+        batch_indices = [
+            index for index, (_, file_name, _) in enumerate(files)
+            if uploads[index][2] and extracted[index] is None and DocumentService.supports_batch(file_name)
+        ]
+        if batch_indices and bucket is not None:
+            batch_results = DocumentService.process_documents_batch(
+                [(f"gs://{bucket.name}/{uploads[index][1]}", files[index][2]) for index in batch_indices],
+                bucket
+            )
+            for index, extracted_data in zip(batch_indices, batch_results):
+                if extracted_data is not None:
+                    extracted[index] = extracted_data
+                    CandidateService.cache_extraction(cache_keys[index], extracted_data)
+        
+        # DOC/DOCX files and anything the batch could not process use the online path
+        online_futures = {
+            index: _io_executor.submit(DocumentService.process_document, content, content_type, file_name)
+            for index, (content, file_name, content_type) in enumerate(files)
+            if uploads[index][2] and extracted[index] is None
+        }
+        for index, future in online_futures.items():
+            try:
+                extracted[index] = future.result()
+                CandidateService.cache_extraction(cache_keys[index], extracted[index])
+            except Exception as e:
+                logger.error(f"Error extracting resume {files[index][1]}: {e}")
+        
+        for index, (candidate_id, storage_path, download_url) in enumerate(uploads):
+            if download_url and extracted[index] is not None:
+                try:
+                    results[index] = CandidateService.save_candidate(candidate_id, extracted[index], download_url, storage_path)
+                except Exception as e:
+                    logger.error(f"Error creating candidate {candidate_id}: {e}")
+        
+        return results
+    
     @staticmethod
     def get_candidate(candidate_id: str) -> Optional[Dict[str, Any]]:
         """Get a candidate by ID."""
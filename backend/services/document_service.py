@@ -1,6 +1,12 @@
 import os
 import logging
-from typing import Dict, Tuple, Any
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Tuple, Any, List, Optional
 from io import BytesIO
 import base64
 from dotenv import load_dotenv
@@ -25,11 +31,171 @@ except ImportError:
 
 try:
     import docx
+    from docx.oxml.ns import qn
+    from docx.table import Table as DocxTable
+    from docx.text.paragraph import Paragraph as DocxParagraph
     docx_available = True
 except ImportError:
     docx_available = False
     logger.warning("python-docx not installed. Install with: pip install python-docx")
 
+try:
+    from PyPDF2 import PdfReader
+    pypdf_available = True
+except ImportError:
+    pypdf_available = False
+    logger.warning("PyPDF2 not installed. Install with: pip install PyPDF2")
+
+
+# Uploads at or above this many eligible files are extracted with Document AI batch requests
+DOCUMENTAI_BATCH_THRESHOLD = int(os.getenv("DOCUMENTAI_BATCH_THRESHOLD", "20"))
+DOCUMENTAI_BATCH_SIZE = int(os.getenv("DOCUMENTAI_BATCH_SIZE", "50"))  # Documents per batch request
+DOCUMENTAI_BATCH_TIMEOUT = int(os.getenv("DOCUMENTAI_BATCH_TIMEOUT", "900"))  # Seconds to wait for one batch operation
+# Batch operations running at once; Document AI limits concurrent batch requests per project
+DOCUMENTAI_BATCH_CONCURRENCY = int(os.getenv("DOCUMENTAI_BATCH_CONCURRENCY", "4"))
+DOCUMENTAI_BATCH_OUTPUT_PREFIX = "documentai_output"
+
+# These need converting to PDF first, so they always take the online per-file path
+CONVERTED_EXTENSIONS = ['.doc', '.docx']
+
+# Files whose text layer is read locally instead of being sent to Document AI; set to "" to always use Document AI
+LOCAL_EXTRACTION_EXTENSIONS = [
+    ext.strip().lower() for ext in os.getenv("LOCAL_EXTRACTION_EXTENSIONS", ".docx,.pdf").split(",") if ext.strip()
+]
+# Below this much text the file is treated as scanned/image-only and goes to Document AI
+LOCAL_EXTRACTION_MIN_CHARS = int(os.getenv("LOCAL_EXTRACTION_MIN_CHARS", "200"))
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Separators are spaces, tabs and punctuation only, so a match never spans lines
+PHONE_PATTERN = re.compile(r"\+?\d[\d \t().-]{7,}\d")
+# Headings that open many resumes and must not be taken for the applicant's name
+RESUME_TITLE_WORDS = {"resume", "résumé", "cv", "curriculum", "vitae", "profile", "contact", "personal", "details"}
+# Resume section headings and the Document AI processor field each section fills
+RESUME_SECTION_FIELDS = {
+    'bio': ["summary", "profile", "about", "about me", "objective", "career objective", "professional summary",
+            "personal statement"],
+    'education_paragraph': ["education", "academic background", "educational background", "qualifications",
+                            "academic qualifications"],
+    'work_experience_paragraph': ["experience", "work experience", "professional experience", "employment",
+                                  "employment history", "work history", "internships", "internship experience"],
+    'projects_paragraph': ["projects", "personal projects", "academic projects", "project experience"],
+    'certifications_paragraph': ["certifications", "certification", "certificates", "licenses and certifications",
+                                 "courses and certifications", "training"],
+    'awards_paragraph': ["awards", "achievements", "honors", "honours", "awards and achievements", "honors and awards"],
+    'co-curricular_activities_paragraph': ["co-curricular activities", "cocurricular activities", "activities",
+                                           "extracurricular activities", "extra-curricular activities",
+                                           "volunteering", "volunteer experience", "leadership"],
+    'technical_skills': ["skills", "technical skills", "hard skills", "technologies", "tools", "programming languages"],
+    'soft_skills': ["soft skills", "interpersonal skills"],
+    'languages': ["languages", "language"]
+}
+RESUME_SECTION_HEADINGS = {heading: field for field, headings in RESUME_SECTION_FIELDS.items() for heading in headings}
+
+# Placeholder returned for DOC/DOCX files when Document AI fails; never worth caching
+DOCUMENT_AI_FALLBACK_RESULT = {"extracted_text": "Text extracted during conversion (Document AI processing failed)"}
+
+@lru_cache(maxsize=1)
+def get_processor_config() -> Dict[str, str]:
+    """Read the Document AI processor settings from the environment once."""
+    project_id = os.getenv("DOCUMENTAI_PROJECT_ID", "default_project_id")
+    location = os.getenv("DOCUMENTAI_LOCATION", "us")  # "us" or "eu"
+    processor_id = os.getenv("DOCUMENTAI_PROCESSOR_ID", "default_processor_id")
+    processor_version = os.getenv("DOCUMENTAI_PROCESSOR_VERSION", "default_processor_version")
+    return {
+        'project_id': project_id,
+        'location': location,
+        'processor_id': processor_id,
+        'processor_version': processor_version,
+        'api_endpoint': f"{location}-documentai.googleapis.com",
+        # Construct processor resource name with version
+        'processor_name': f"projects/{project_id}/locations/{location}/processors/{processor_id}/processorVersions/{processor_version}"
+    }
+
+
+class DocumentAIClientRegistry:
+    """Long-lived Document AI clients shared across requests and threads.
+
+    Clients are created lazily, one per API endpoint, so the gRPC channel and
+    TLS session are set up once instead of for every document.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.clients_created = 0
+        self.client_reuses = 0
+        self.calls = 0
+        self.failed_calls = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def get_client(self, api_endpoint: str) -> documentai.DocumentProcessorServiceClient:
+        """Return the client for an endpoint, creating it on first use."""
+        with self._lock:
+            client = self._clients.get(api_endpoint)
+            if client is None:
+                logger.info(f"Creating Document AI client for {api_endpoint}")
+                client = documentai.DocumentProcessorServiceClient(
+                    client_options=ClientOptions(api_endpoint=api_endpoint)
+                )
+                self._clients[api_endpoint] = client
+                self.clients_created += 1
+            else:
+                self.client_reuses += 1
+            return client
+
+    def process(self, api_endpoint: str, request: documentai.ProcessRequest) -> documentai.ProcessResponse:
+        """Run a process request on the shared client and record its latency."""
+        client = self.get_client(api_endpoint)
+        start = time.perf_counter()
+        try:
+            return client.process_document(request=request)
+        except Exception:
+            with self._lock:
+                self.failed_calls += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.calls += 1
+                self.total_latency += elapsed
+                self.max_latency = max(self.max_latency, elapsed)
+
+    def batch_process(self, api_endpoint: str, request: documentai.BatchProcessRequest, timeout: int) -> documentai.BatchProcessMetadata:
+        """Run a batch process operation on the shared client and wait for it to finish."""
+        client = self.get_client(api_endpoint)
+        start = time.perf_counter()
+        try:
+            operation = client.batch_process_documents(request=request)
+            operation.result(timeout=timeout)
+            return documentai.BatchProcessMetadata(operation.metadata)
+        except Exception:
+            with self._lock:
+                self.failed_calls += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.calls += 1
+                self.total_latency += elapsed
+                self.max_latency = max(self.max_latency, elapsed)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return channel reuse and per-call latency counters."""
+        with self._lock:
+            return {
+                'clientsCreated': self.clients_created,
+                'clientReuses': self.client_reuses,
+                'calls': self.calls,
+                'failedCalls': self.failed_calls,
+                'avgLatencySeconds': self.total_latency / self.calls if self.calls else 0.0,
+                'maxLatencySeconds': self.max_latency
+            }
+
+
+# Create a singleton instance
+documentai_clients = DocumentAIClientRegistry()
+
 
 class DocumentService:
     """Service for processing documents and extracting data."""
@@ -64,24 +230,7 @@ class DocumentService:
             # Process DOCX files
             if file_extension == '.docx' and docx_available:
                 logger.info(f"Converting DOCX file: {file_name}")
-                document = docx.Document(file_bytesio)
-                
-                # Extract text from paragraphs
-                paragraphs = []
-                for para in document.paragraphs:
-                    if para.text.strip():
-                        paragraphs.append(para.text)
-                
-                # Extract text from tables
-                for table in document.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            for para in cell.paragraphs:
-                                if para.text.strip():
-                                    paragraphs.append(para.text)
-                
-                extracted_text = "\n".join(paragraphs)
-                logger.info(f"Successfully extracted {len(paragraphs)} paragraphs from DOCX")
+                extracted_text = DocumentService.extract_docx_text(file_bytesio)
                 
             # Process DOC files (limited support)
             elif file_extension == '.doc':
@@ -141,54 +290,278 @@ class DocumentService:
             # Return original content if conversion fails
             return file_content, f"application/{file_extension.replace('.', '')}"
     
+    @staticmethod
+    def extract_docx_text(file_bytesio: BytesIO) -> str:
+        """Read the paragraph and table text of a DOCX file in document order.
+
+        Each table row becomes one line with its cells separated by " | ", so
+        tables stay under the section heading they appear in.
+        """
+        document = docx.Document(file_bytesio)
+        
+        paragraphs = []
+        for block in document.element.body.iterchildren():
+            if block.tag == qn('w:p'):
+                text = DocxParagraph(block, document).text
+                if text.strip():
+                    paragraphs.append(text)
+            elif block.tag == qn('w:tbl'):
+                for row in DocxTable(block, document).rows:
+                    cells = []
+                    for cell in row.cells:
+                        text = " ".join(para.text.strip() for para in cell.paragraphs if para.text.strip())
+                        # Merged cells repeat across the row
+                        if text and (not cells or cells[-1] != text):
+                            cells.append(text)
+                    if cells:
+                        paragraphs.append(" | ".join(cells))
+        
+        logger.info(f"Successfully extracted {len(paragraphs)} paragraphs from DOCX")
+        return "\n".join(paragraphs)
+    
+    @staticmethod
+    def extract_pdf_text(file_bytesio: BytesIO) -> str:
+        """Read the embedded text layer of a PDF file. Scanned pages yield no text."""
+        reader = PdfReader(file_bytesio)
+        pages = [page.extract_text() or "" for page in reader.pages]
+        return "\n".join(page for page in pages if page.strip())
+    
+    @staticmethod
+    def section_heading(line: str) -> Optional[Tuple[str, str]]:
+        """Return (processor field, text after the heading) if a line opens a resume section.
+
+        Matches a heading on its own line ("Work Experience") or followed by
+        content ("Skills: Python, SQL" or "Languages | English").
+        """
+        for separator in (':', '|'):
+            head, found, rest = line.partition(separator)
+            if found:
+                break
+        else:
+            head, rest = line, ""
+        heading = " ".join(head.replace('&', ' and ').strip(' \t-•*#').lower().split())
+        field = RESUME_SECTION_HEADINGS.get(heading)
+        if field is None:
+            return None
+        return field, rest.strip(' \t|')
+    
+    @staticmethod
+    def text_to_fields(text: str) -> Dict[str, Any]:
+        """Map plain resume text onto the extractedText fields Document AI would return.
+
+        Contact details come from patterns; the paragraph, skills and language
+        fields are filled from the lines under the matching section headings.
+        """
+        structured_data = {}
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        
+        # The name is usually the first short line without contact details
+        for line in lines[:5]:
+            words = line.split()
+            if (len(words) <= 5 and not EMAIL_PATTERN.search(line) and not any(c.isdigit() for c in line)
+                    and not any(word.strip(':-|,.').lower() in RESUME_TITLE_WORDS for word in words)
+                    and DocumentService.section_heading(line) is None):
+                structured_data['applicant_name'] = line
+                break
+        
+        sections = {}
+        field = None
+        for line in lines:
+            heading = DocumentService.section_heading(line)
+            if heading:
+                field, content = heading
+                sections.setdefault(field, [])
+                if content:
+                    sections[field].append(content)
+            elif field:
+                sections[field].append(line)
+        for field, section_lines in sections.items():
+            if section_lines:
+                structured_data[field] = "\n".join(section_lines)
+        
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            structured_data['applicant_mail'] = email.group(0)
+        for phone in PHONE_PATTERN.finditer(text):
+            # Skip date ranges such as 2019-2023
+            if sum(c.isdigit() for c in phone.group(0)) >= 9:
+                structured_data['applicant_contactNum'] = phone.group(0).strip()
+                break
+        
+        structured_data['extracted_text'] = text
+        return structured_data
+    
+    @staticmethod
+    def supports_local_extraction(file_name: str) -> bool:
+        """Whether a file type may be read locally before falling back to Document AI."""
+        return os.path.splitext(file_name)[1].lower() in LOCAL_EXTRACTION_EXTENSIONS
+    
+    @staticmethod
+    def extract_text_locally(file_content: bytes, file_name: str) -> Optional[Dict[str, Any]]:
+        """Extract a DOCX or text-layer PDF without calling Document AI.
+
+        Returns:
+            Structured data in the extractedText schema, or None when the file
+            needs Document AI (unsupported type, scanned PDF, unreadable file).
+        """
+        if not DocumentService.supports_local_extraction(file_name):
+            return None
+        file_extension = os.path.splitext(file_name)[1].lower()
+        
+        try:
+            if file_extension == '.docx' and docx_available:
+                text = DocumentService.extract_docx_text(BytesIO(file_content))
+            elif file_extension == '.pdf' and pypdf_available:
+                text = DocumentService.extract_pdf_text(BytesIO(file_content))
+            else:
+                return None
+        except Exception as e:
+            logger.warning(f"Local text extraction failed for {file_name}, using Document AI: {e}")
+            return None
+        
+        if len(text.strip()) < LOCAL_EXTRACTION_MIN_CHARS:
+            logger.info(f"{file_name} has too little embedded text ({len(text.strip())} chars), using Document AI")
+            return None
+        
+        logger.info(f"Extracted {len(text)} chars from {file_name} locally, skipping Document AI")
+        return DocumentService.text_to_fields(text)
+    
+    @staticmethod
+    def entities_to_dict(document: documentai.Document) -> Dict[str, Any]:
+        """Flatten a processed document's entities into {field name: extracted value}."""
+        structured_data = {}
+        for entity in document.entities:
+            field_name = entity.type_  # Field name as defined in the processor
+            field_value = entity.mention_text  # Extracted value for the field
+            structured_data[field_name] = field_value
+        return structured_data
+
+    @staticmethod
+    def supports_batch(file_name: str) -> bool:
+        """Whether a file can be sent to Document AI batch processing as stored."""
+        return os.path.splitext(file_name)[1].lower() not in CONVERTED_EXTENSIONS
+
+    @staticmethod
+    def process_documents_batch(documents: List[Tuple[str, str]], bucket: Any) -> List[Optional[Dict[str, Any]]]:
+        """Extract structured data from many stored documents with Document AI batch requests.
+
+        Documents are sent in chunks of DOCUMENTAI_BATCH_SIZE, and up to
+        DOCUMENTAI_BATCH_CONCURRENCY chunk operations run at once, so a large
+        upload waits about as long as its slowest operation rather than their sum.
+
+        Args:
+            documents: List of (gcs_uri, mime_type) for files already in ``bucket``
+            bucket: Storage bucket that holds the documents and receives the batch output
+
+        Returns:
+            Structured data per input document, in input order. Entries are None for
+            documents the batch could not process so callers can fall back to the
+            online per-file path.
+        """
+        config = get_processor_config()
+        results = [None] * len(documents)
+        starts = list(range(0, len(documents), DOCUMENTAI_BATCH_SIZE))
+        if not starts:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(DOCUMENTAI_BATCH_CONCURRENCY, len(starts)),
+                                thread_name_prefix="documentai-batch") as executor:
+            chunk_futures = [
+                executor.submit(DocumentService._process_batch_chunk, config,
+                                documents[start:start + DOCUMENTAI_BATCH_SIZE], bucket)
+                for start in starts
+            ]
+            for start, future in zip(starts, chunk_futures):
+                chunk_results = future.result()
+                results[start:start + len(chunk_results)] = chunk_results
+
+        return results
+
+    @staticmethod
+    def _process_batch_chunk(config: Dict[str, str], chunk: List[Tuple[str, str]], bucket: Any) -> List[Optional[Dict[str, Any]]]:
+        """Run one batch operation and return the structured data of each document in the chunk."""
+        results = [None] * len(chunk)
+        output_prefix = f"{DOCUMENTAI_BATCH_OUTPUT_PREFIX}/{uuid.uuid4()}"
+        index_by_uri = {gcs_uri: index for index, (gcs_uri, _) in enumerate(chunk)}
+
+        try:
+            logger.info(f"Sending batch of {len(chunk)} documents to Document AI - Processor ID: {config['processor_id']}")
+            request = documentai.BatchProcessRequest(
+                name=config['processor_name'],
+                input_documents=documentai.BatchDocumentsInputConfig(
+                    gcs_documents=documentai.GcsDocuments(documents=[
+                        documentai.GcsDocument(gcs_uri=gcs_uri, mime_type=mime_type)
+                        for gcs_uri, mime_type in chunk
+                    ])
+                ),
+                document_output_config=documentai.DocumentOutputConfig(
+                    gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                        gcs_uri=f"gs://{bucket.name}/{output_prefix}/"
+                    )
+                )
+            )
+            metadata = documentai_clients.batch_process(config['api_endpoint'], request, DOCUMENTAI_BATCH_TIMEOUT)
+
+            # Fan the output of every input document back out to its position
+            for process_status in metadata.individual_process_statuses:
+                index = index_by_uri.get(process_status.input_gcs_source)
+                if index is None or not process_status.output_gcs_destination:
+                    continue
+                # The destination is ".../<operation>/<index>" without a trailing slash; add one so
+                # index 1 does not also match the output folders of indices 10-19
+                destination_prefix = process_status.output_gcs_destination.split(f"gs://{bucket.name}/", 1)[-1].rstrip('/') + '/'
+                structured_data = {}
+                # Large documents are sharded over several JSON files
+                for blob in bucket.list_blobs(prefix=destination_prefix):
+                    if blob.name.endswith('.json'):
+                        document = documentai.Document.from_json(blob.download_as_bytes(), ignore_unknown_fields=True)
+                        structured_data.update(DocumentService.entities_to_dict(document))
+                results[index] = structured_data
+
+            processed = sum(1 for result in results if result is not None)
+            logger.info(f"Document AI batch processing successful for {processed} of {len(chunk)} documents")
+        except Exception as e:
+            logger.error(f"Document AI batch processing failed: {str(e)}")
+        finally:
+            # The batch output is only needed until it has been read
+            try:
+                for blob in bucket.list_blobs(prefix=output_prefix):
+                    blob.delete()
+            except Exception as e:
+                logger.warning(f"Could not clean up Document AI batch output {output_prefix}: {e}")
+
+        return results
+
     @staticmethod
     def process_document(file_content: bytes, mime_type: str, file_name: str) -> Dict[str, Any]:
         """Processes a document using an existing Document AI processor and extracts structured data."""
-        project_id = os.getenv("DOCUMENTAI_PROJECT_ID", "default_project_id")
-        location = os.getenv("DOCUMENTAI_LOCATION", "us")  # "us" or "eu"
-        processor_id = os.getenv("DOCUMENTAI_PROCESSOR_ID", "default_processor_id")
-        processor_version = os.getenv("DOCUMENTAI_PROCESSOR_VERSION", "default_processor_version")
+        config = get_processor_config()
         
         # Get file extension
         file_extension = os.path.splitext(file_name)[1].lower()
         
         # Convert doc/docx to PDF if needed
-        if file_extension in ['.doc', '.docx']:
+        if file_extension in CONVERTED_EXTENSIONS:
             logger.info(f"Converting {file_extension} file to PDF for Document AI processing")
             file_content, converted_mime_type = DocumentService.convert_to_pdf(file_content, file_name)
             mime_type = converted_mime_type  # Make sure to use the new mime type
             logger.info(f"Conversion complete. New MIME type: {mime_type}, content size: {len(file_content)} bytes")
 
-        # Define API endpoint
-        opts = ClientOptions(api_endpoint=f"{location}-documentai.googleapis.com")
-
         # Log Document AI request details
-        logger.info(f"Sending document to Document AI - Processor ID: {processor_id}, MIME type: {mime_type}")
+        logger.info(f"Sending document to Document AI - Processor ID: {config['processor_id']}, MIME type: {mime_type}")
         
         try:
-            # Initialize the Document AI client
-            client = documentai.DocumentProcessorServiceClient(client_options=opts)
-
-            # Construct processor resource name with version
-            processor_name = f"projects/{project_id}/locations/{location}/processors/{processor_id}/processorVersions/{processor_version}"
-
             # Create a raw document request
             raw_document = documentai.RawDocument(content=file_content, mime_type=mime_type)
 
             # Create a request using the existing processor
-            request = documentai.ProcessRequest(name=processor_name, raw_document=raw_document)
+            request = documentai.ProcessRequest(name=config['processor_name'], raw_document=raw_document)
 
-            # Process the document
-            result = client.process_document(request=request)
+            # Process the document on the shared client
+            result = documentai_clients.process(config['api_endpoint'], request)
 
             # Extract structured data from the document
-            document = result.document
-            structured_data = {}
-
-            for entity in document.entities:
-                field_name = entity.type_  # Field name as defined in the processor
-                field_value = entity.mention_text  # Extracted value for the field
-                structured_data[field_name] = field_value
+            structured_data = DocumentService.entities_to_dict(result.document)
                 
             logger.info(f"Document AI processing successful. Extracted {len(structured_data)} fields.")
             return structured_data
@@ -198,5 +571,5 @@ class DocumentService:
             # If Document AI fails but we have extracted text from DOCX, provide it as fallback
             if file_extension in ['.doc', '.docx'] and file_content:
                 logger.info("Using text extraction as fallback for Document AI")
-                return {"extracted_text": "Text extracted during conversion (Document AI processing failed)"}
+                return dict(DOCUMENT_AI_FALLBACK_RESULT)
             raise
@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+import numpy as np
+from services.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "1024"))
+
+
+def _load_embedding_model():
+    """Load the MiniLM tokenizer and model used for semantic similarity."""
+    # torch/transformers are imported here so routes that never score answers don't pay for them
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
+service_registry.register("embedding_model", _load_embedding_model)
+
+
+class EmbeddingService:
+    """Sentence embeddings with batched inference and an LRU cache for repeated texts.
+
+    Interview questions are embedded once and reused for every candidate who
+    answers them; answers are embedded in padded batches.
+    """
+
+    def __init__(self, batch_size: int = EMBEDDING_BATCH_SIZE, max_cached: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.batch_size = batch_size
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in padded batches. Returns an array of shape (len(texts), dim)."""
+        import torch
+        tokenizer, model = service_registry.get("embedding_model")
+
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = tokenizer(texts[start:start + self.batch_size], return_tensors="pt", truncation=True, padding=True)
+            with torch.no_grad():
+                hidden = model(**inputs).last_hidden_state
+
+            # Mean over real tokens only; padding must not dilute shorter texts
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            batches.append(pooled.numpy())
+
+        return np.concatenate(batches) if batches else np.empty((0, 0), dtype=np.float32)
+
+    def embed_cached(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, reusing cached vectors and batching only the misses."""
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors = [None] * len(texts)
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[index] = vector
+            hits = sum(1 for vector in vectors if vector is not None)
+            self.cache_hits += hits
+            self.cache_misses += len(texts) - hits
+
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.embed([texts[index] for index in missing])
+            with self._lock:
+                for index, vector in zip(missing, computed):
+                    vectors[index] = vector
+                    self._cache[keys[index]] = vector
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+
+        return np.stack(vectors)
+
+    @staticmethod
+    def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Row-wise cosine similarity between two (n, dim) arrays."""
+        norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+        return np.einsum("ij,ij->i", a, b) / np.maximum(norms, 1e-12)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss counters."""
+        with self._lock:
+            return {
+                'cacheHits': self.cache_hits,
+                'cacheMisses': self.cache_misses,
+                'cachedEntries': len(self._cache)
+            }
+
+
+# Create a singleton instance
+embedding_service = EmbeddingService()
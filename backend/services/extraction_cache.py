@@ -0,0 +1,109 @@
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+from core.firebase import firebase_client
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_COLLECTION = 'extractionCache'
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "500"))
+
+
+class ExtractionCache:
+    """Resume extraction results keyed by file content hash.
+
+    The same CV uploaded to several jobs is only sent to Document AI once.
+    Entries live in an in-memory LRU backed by a Firestore collection and
+    expire after a TTL. Expired entries are deleted when they are read; each
+    stored entry also carries an expiresAt timestamp for a Firestore TTL policy
+    to purge the ones that are never read again.
+    """
+
+    def __init__(self, ttl_seconds: int = EXTRACTION_CACHE_TTL_SECONDS, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(file_content: bytes, processor_version: str) -> str:
+        """Hash the file bytes together with the processor version that extracts them."""
+        digest = hashlib.sha256(file_content)
+        digest.update(processor_version.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get('cachedAt', 0) > self.ttl_seconds
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str, file_size: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached extraction for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_expired(entry):
+                    del self._entries[key]
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = firebase_client.get_document(EXTRACTION_CACHE_COLLECTION, key)
+            if entry is not None and self._is_expired(entry):
+                firebase_client.delete_document(EXTRACTION_CACHE_COLLECTION, key)
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += file_size
+        logger.info(f"Reusing cached extraction, skipped Document AI for {file_size} bytes")
+        return copy.deepcopy(entry['extractedText'])
+
+    def set(self, key: str, extracted_text: Dict[str, Any]) -> None:
+        """Cache an extraction result in memory and in Firestore."""
+        cached_at = time.time()
+        entry = {
+            'extractedText': copy.deepcopy(extracted_text),
+            'cachedAt': cached_at
+        }
+        self._remember(key, entry)
+        firebase_client.create_document(EXTRACTION_CACHE_COLLECTION, key, {
+            **entry,
+            'expiresAt': datetime.fromtimestamp(cached_at, timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the Document AI work saved."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'apiCallsSaved': self.hits,
+                'bytesSaved': self.bytes_saved,
+                'entries': len(self._entries)
+            }
+
+
+# Create a singleton instance
+extraction_cache = ExtractionCache()
@@ -0,0 +1,143 @@
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+from typing import FrozenSet, Optional
+from services.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+# Explicit ffmpeg binary; otherwise the known install locations and PATH are searched
+FFMPEG_PATH = os.getenv("FFMPEG_PATH")
+FFMPEG_PROBE_TIMEOUT = float(os.getenv("FFMPEG_PROBE_TIMEOUT", "10"))
+
+FFMPEG_KNOWN_PATHS = {
+    "Darwin": [
+        '/opt/homebrew/Cellar/ffmpeg@6/6.1.2_8/bin/ffmpeg',
+        '/opt/homebrew/bin/ffmpeg',
+        '/usr/local/bin/ffmpeg'
+    ],
+    "Windows": [
+        r'C:\Users\ooiru\Downloads\ffmpeg-2025-03-31-git-35c091f4b7-full_build\ffmpeg-2025-03-31-git-35c091f4b7-full_build\bin\ffmpeg.exe',
+        r'C:\Users\hongy\Downloads\ffmpeg-n6.1-latest-win64-gpl-6.1\bin\ffmpeg.exe'
+    ]
+}
+
+VOICE_EFFECT_PITCH = {
+    'disguise_up': 1.20,    # Moderate pitch up
+    'disguise_down': 0.80,  # Moderate pitch down
+    'helium': 1.5           # Original helium effect
+}
+# Sample rate the effect chain runs at; all interview audio is 16 kHz mono
+EFFECT_SAMPLE_RATE = 16000
+
+
+def _locate_ffmpeg() -> str:
+    """Find the ffmpeg binary: FFMPEG_PATH, then known install locations, then PATH."""
+    if FFMPEG_PATH:
+        return FFMPEG_PATH
+
+    for path in FFMPEG_KNOWN_PATHS.get(platform.system(), []):
+        if os.path.exists(path):
+            return path
+
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+
+    if platform.system() == "Darwin":
+        raise RuntimeError("FFmpeg not found. Please install it with 'brew install ffmpeg'")
+    raise RuntimeError("FFmpeg not found. Install it or set FFMPEG_PATH")
+
+
+class FFmpegCapabilities:
+    """The resolved ffmpeg binary, its version and the audio filters it was built with.
+
+    Filter chains are chosen from what the binary supports, so a build without
+    rubberband or loudnorm gets an equivalent chain instead of a failed run.
+    """
+
+    def __init__(self, path: str, version: Optional[str], filters: FrozenSet[str]):
+        self.path = path
+        self.version = version
+        self.filters = filters
+
+    def supports(self, filter_name: str) -> bool:
+        return filter_name in self.filters
+
+    def clean_audio_filters(self) -> str:
+        """Band-limit and level the voice for transcription."""
+        chain = ['highpass=f=80', 'lowpass=f=7500']
+        if self.supports('dynaudnorm'):
+            chain.append('dynaudnorm=f=150:g=15')
+        return ','.join(chain)
+
+    def clarity_filters(self) -> str:
+        """Loudness normalization (EBU R128 when available) and band-pass, applied after any pitch shift."""
+        chain = []
+        if self.supports('loudnorm'):
+            chain.append('loudnorm=I=-16:LRA=11:TP=-1.5')
+        elif self.supports('dynaudnorm'):
+            chain.append('dynaudnorm')
+        chain.extend(['highpass=f=100', 'lowpass=f=7000'])
+        return ','.join(chain)
+
+    def voice_effect_filter(self, effect_type: str = "helium") -> str:
+        """Return the filter chain for a voice effect; unknown types get clarity filters only."""
+        pitch_factor = VOICE_EFFECT_PITCH.get(effect_type.lower())
+        if pitch_factor is None:
+            logger.info(f"Effect type '{effect_type}' not recognized or 'none'. Applying only clarity filters.")
+            return self.clarity_filters()
+
+        if self.supports('rubberband'):
+            pitch_shift = f'rubberband=pitch={pitch_factor}'
+        else:
+            # Resample-based shift: raise the rate to change pitch, then restore the tempo
+            pitch_shift = (
+                f'aresample={EFFECT_SAMPLE_RATE},asetrate={int(EFFECT_SAMPLE_RATE * pitch_factor)},'
+                f'aresample={EFFECT_SAMPLE_RATE},atempo={1 / pitch_factor:.4f}'
+            )
+        logger.info(f"Applying '{effect_type}' effect with pitch factor {pitch_factor}")
+        return f'{pitch_shift},{self.clarity_filters()}'
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'version': self.version,
+            'rubberband': self.supports('rubberband'),
+            'loudnorm': self.supports('loudnorm'),
+            'dynaudnorm': self.supports('dynaudnorm')
+        }
+
+
+def _probe_ffmpeg() -> FFmpegCapabilities:
+    """Locate ffmpeg and read its version and filter list."""
+    path = _locate_ffmpeg()
+
+    version_output = subprocess.run(
+        [path, '-hide_banner', '-version'], capture_output=True, text=True, check=True, timeout=FFMPEG_PROBE_TIMEOUT
+    ).stdout
+    match = re.match(r'ffmpeg version (\S+)', version_output)
+    version = match.group(1) if match else None
+
+    # Filter lines look like " TSC rubberband        A->A       Apply time-stretching and pitch-shifting."
+    filters_output = subprocess.run(
+        [path, '-hide_banner', '-filters'], capture_output=True, text=True, check=True, timeout=FFMPEG_PROBE_TIMEOUT
+    ).stdout
+    filters = frozenset(
+        tokens[1] for tokens in (line.split() for line in filters_output.splitlines())
+        if len(tokens) >= 3 and '->' in tokens[2]
+    )
+
+    capabilities = FFmpegCapabilities(path, version, filters)
+    logger.info(f"Using ffmpeg {version} at {path}: {capabilities.to_dict()}")
+    return capabilities
+
+service_registry.register("ffmpeg", _probe_ffmpeg)
+
+
+def get_ffmpeg() -> FFmpegCapabilities:
+    """Return the shared ffmpeg capabilities, probing the binary on first use."""
+    return service_registry.get("ffmpeg")
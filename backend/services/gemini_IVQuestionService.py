@@ -2,19 +2,92 @@ import logging
 import json
 import uuid
 import random
+import bisect
+import string
 import google.generativeai as genai
 import os
 import time  # Add this import to generate unique seeds
 from typing import Dict, Any, List, Optional
+from fastapi import HTTPException
 from core.firebase import firebase_client
+from services.service_registry import service_registry
 
 logger = logging.getLogger(__name__)
 
+QUESTION_TEMPLATES = [
+    "How would you approach {task} given your experience in {field}?",
+    "Can you describe a time when you successfully handled {challenge}?",
+    "What strategies would you use to {goal} in the context of {scenario}?",
+    "Based on your background in {field}, how would you tackle {problem}?",
+    "What steps would you take to {objective} while considering {constraint}?",
+    # Add more templates as needed
+]
+QUESTION_TEMPLATE_VALUES = {
+    "field": ["data analysis", "IT support", "project management", "software development"],
+    "task": ["troubleshooting", "optimizing workflows", "managing teams", "resolving conflicts"],
+    "challenge": ["a tight deadline", "a difficult client", "a technical issue", "a team disagreement"],
+    "goal": ["improve efficiency", "reduce costs", "enhance user experience", "meet project deadlines"],
+    "scenario": ["a high-pressure environment", "a remote team", "a startup culture", "a corporate setting"],
+    "problem": ["system outages", "data inconsistencies", "security vulnerabilities", "scalability issues"],
+    "objective": ["achieve success", "deliver results", "meet expectations", "exceed goals"],
+    "constraint": ["limited resources", "tight budgets", "short timelines", "complex requirements"],
+}
+
+
+class QuestionTemplatePool:
+    """Every expansion of the question templates, indexed without being built.
+
+    Index i is decoded into a template and one value per placeholder the
+    template uses, so the pool costs nothing to create and sampling is O(1).
+    """
+
+    def __init__(self, templates: List[str], values: Dict[str, List[str]]):
+        self._templates = []
+        self._offsets = []
+        total = 0
+        for template in templates:
+            slots = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+            slots = list(dict.fromkeys(slots))
+            size = 1
+            for slot in slots:
+                size *= len(values[slot])
+            self._templates.append((template, slots, size))
+            self._offsets.append(total)
+            total += size
+        self._values = values
+        self._size = total
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._size:
+            raise IndexError("question index out of range")
+        position = bisect.bisect_right(self._offsets, index) - 1
+        template, slots, _ = self._templates[position]
+        index -= self._offsets[position]
+
+        # Mixed-radix decode: one digit per placeholder
+        choices = {}
+        for slot in slots:
+            options = self._values[slot]
+            index, digit = divmod(index, len(options))
+            choices[slot] = options[digit]
+        return template.format(**choices)
+
+    def sample(self) -> str:
+        """Return a uniformly random expansion."""
+        return self[random.randrange(self._size)]
+
+
+# Shared by every service instance
+question_template_pool = QuestionTemplatePool(QUESTION_TEMPLATES, QUESTION_TEMPLATE_VALUES)
+
 class GeminiIVQuestionService:
     """Service for generating interview questions using Google's Gemini model."""
     
     def __init__(self):
-        """Initialize the Gemini IV Question Service with API key and pre-generate questions."""
+        """Initialize the Gemini IV Question Service with API key."""
         try:
             # Get API key from environment variable
             api_key = os.getenv("GEMINI_API_KEY")
@@ -25,54 +98,14 @@ class GeminiIVQuestionService:
             # Configure the Gemini API
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
-            self.pre_generated_questions = self._generate_question_pool()
             logger.info("GeminiIVQuestionService initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing GeminiIVQuestionService: {e}")
             raise
 
-    def _generate_question_pool(self) -> List[str]:
-        """Pre-generate a pool of questions."""
-        question_templates = [
-            "How would you approach {task} given your experience in {field}?",
-            "Can you describe a time when you successfully handled {challenge}?",
-            "What strategies would you use to {goal} in the context of {scenario}?",
-            "Based on your background in {field}, how would you tackle {problem}?",
-            "What steps would you take to {objective} while considering {constraint}?",
-            # Add more templates as needed
-        ]
-        fields = ["data analysis", "IT support", "project management", "software development"]
-        tasks = ["troubleshooting", "optimizing workflows", "managing teams", "resolving conflicts"]
-        challenges = ["a tight deadline", "a difficult client", "a technical issue", "a team disagreement"]
-        goals = ["improve efficiency", "reduce costs", "enhance user experience", "meet project deadlines"]
-        scenarios = ["a high-pressure environment", "a remote team", "a startup culture", "a corporate setting"]
-        problems = ["system outages", "data inconsistencies", "security vulnerabilities", "scalability issues"]
-        objectives = ["achieve success", "deliver results", "meet expectations", "exceed goals"]
-        constraints = ["limited resources", "tight budgets", "short timelines", "complex requirements"]
-
-        questions = []
-        for template in question_templates:
-            for field in fields:
-                for task in tasks:
-                    for challenge in challenges:
-                        for goal in goals:
-                            for scenario in scenarios:
-                                for problem in problems:
-                                    for objective in objectives:
-                                        for constraint in constraints:
-                                            question = template.format(
-                                                task=task, field=field, challenge=challenge,
-                                                goal=goal, scenario=scenario, problem=problem,
-                                                objective=objective, constraint=constraint
-                                            )
-                                            questions.append(question)
-                                            if len(questions) >= 10000:  # Limit to 10,000 questions
-                                                return questions
-        return questions
-
     def _get_random_question(self) -> str:
-        """Pick a random question from the pre-generated pool."""
-        return random.choice(self.pre_generated_questions)
+        """Pick a random question from the shared template pool."""
+        return question_template_pool.sample()
 
     async def generate_interview_questions(self, candidate_id: str, job_id: str) -> Dict[str, Any]:
         """Generate interview questions for a specific candidate and job."""
@@ -1126,3 +1159,14 @@ class GeminiIVQuestionService:
             "isAIModified": False
         }
         return {"question": question}
+
+
+service_registry.register("gemini_iv_questions", GeminiIVQuestionService)
+
+def get_iv_question_service() -> GeminiIVQuestionService:
+    """FastAPI dependency returning the shared GeminiIVQuestionService."""
+    try:
+        return service_registry.get("gemini_iv_questions")
+    except Exception as e:
+        logger.error(f"Error initializing GeminiIVQuestionService: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to initialize interview question service: {str(e)}")
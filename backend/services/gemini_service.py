@@ -1,15 +1,39 @@
 import os
 import json
+import asyncio
+import random
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 from functools import lru_cache
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from google.cloud import firestore
 import logging
+from services.score_cache import score_cache
+from services.service_registry import service_registry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Concurrency and retry settings for Gemini calls
+MAX_CONCURRENT_SCORING = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_CALL_TIMEOUT = float(os.getenv("GEMINI_CALL_TIMEOUT", "60"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_RETRY_BASE_DELAY = 1.0  # seconds, doubled on every retry
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+GEMINI_MODEL_NAME = 'gemini-2.0-flash'
+# Bump whenever the scoring prompt changes so cached scores are not reused
+SCORE_PROMPT_VERSION = "1"
+
+def is_retryable_error(error: Exception) -> bool:
+    """Return True for timeouts, rate limits (429) and server errors (5xx)."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if isinstance(error, google_exceptions.GoogleAPICallError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return False
+
 # Configure Gemini API
 def configure_gemini():
     api_key = os.getenv("GEMINI_API_KEY")
@@ -20,8 +44,31 @@ def configure_gemini():
 class GeminiService:
     def __init__(self):
         configure_gemini()
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
         self.db = firestore.Client()
+
+    def close(self) -> None:
+        """Release the Firestore client on shutdown."""
+        self.db.close()
+
+    async def _generate_content_with_retry(self, contents: Any) -> Any:
+        """
+        Call Gemini with a per-call timeout, retrying rate limits and server errors
+        with exponential backoff plus jitter.
+        """
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            try:
+                return await asyncio.wait_for(
+                    self.model.generate_content_async(contents),
+                    timeout=GEMINI_CALL_TIMEOUT
+                )
+            except Exception as e:
+                if attempt >= GEMINI_MAX_RETRIES or not is_retryable_error(e):
+                    raise
+                delay = GEMINI_RETRY_BASE_DELAY * (2 ** attempt)
+                delay += random.uniform(0, delay)  # Jitter to avoid synchronized retries
+                logger.warning(f"Gemini call failed ({type(e).__name__}), retrying in {delay:.2f}s (attempt {attempt + 1}/{GEMINI_MAX_RETRIES})")
+                await asyncio.sleep(delay)
     
     async def score_applicant(self, applicant: Dict[str, Any], job_description: str, criteria: str) -> Dict[str, Any]:
         """
@@ -37,6 +84,14 @@ class GeminiService:
         """
         extracted_text = applicant.get("extractedText", {})
 
+        # Return the cached score if this resume was already scored against the same job and criteria
+        cache_key = score_cache.make_key(extracted_text, job_description, criteria, GEMINI_MODEL_NAME, SCORE_PROMPT_VERSION)
+        # The cache may read Firestore, so keep it off the event loop
+        cached_result = await asyncio.to_thread(score_cache.get, cache_key)
+        if cached_result is not None:
+            logger.info(f"Using cached score for applicant {applicant.get('id', 'unknown')}")
+            return cached_result
+
         # Define the system prompt for Gemini
         system_prompt = f"""
         You are an expert resume analyzer. Evaluate the candidate's resume information based on the job description 
@@ -94,7 +149,7 @@ class GeminiService:
                 formatted_text += f"{key}: {value}\n\n"
 
             # Send the prompt to Gemini
-            response = await self.model.generate_content_async(
+            response = await self._generate_content_with_retry(
                 [system_prompt, formatted_text]
             )
 
@@ -132,6 +187,7 @@ class GeminiService:
                 }
 
                 logger.info(f"Applicant scored: {result}")
+                await asyncio.to_thread(score_cache.set, cache_key, result)
                 return result
             else:
                 raise ValueError("Failed to extract JSON from Gemini response")
@@ -165,39 +221,42 @@ class GeminiService:
             # Extract criteria from prompt
             criteria = prompt
             
-            # Score each applicant
-            scored_applicants = []
-            for applicant in applicants:
-                try:
-                    # Use the score_applicant function with job description and criteria
-                    scores = await self.score_applicant(applicant, job_description, criteria)
-                    
-                    # Calculate final score as average of all score components
-                    rank_scores = scores.get("rank_score", {})
-                    if rank_scores:
-                        # Calculate final score as percentage (sum of all scores divided by max possible score)
-                        total_score = sum(rank_scores.values())
-                        max_possible_score = len(rank_scores) * 10.0  # Each score is on a scale of 0-10
-                        final_score = (total_score / max_possible_score) * 100.0  # Convert to percentage
-                    else:
-                        final_score = 0
+            # Score applicants concurrently, bounded by the in-flight limit
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCORING)
+
+            async def score_one(applicant: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        # Use the score_applicant function with job description and criteria
+                        scores = await self.score_applicant(applicant, job_description, criteria)
+                        
+                        # Calculate final score as average of all score components
+                        rank_scores = scores.get("rank_score", {})
+                        if rank_scores:
+                            # Calculate final score as percentage (sum of all scores divided by max possible score)
+                            total_score = sum(rank_scores.values())
+                            max_possible_score = len(rank_scores) * 10.0  # Each score is on a scale of 0-10
+                            final_score = (total_score / max_possible_score) * 100.0  # Convert to percentage
+                        else:
+                            final_score = 0
+                            
+                        # Add final score to rank_score
+                        scores["rank_score"]["final_score"] = round(final_score, 2)
                         
-                    # Add final score to rank_score
-                    scores["rank_score"]["final_score"] = round(final_score, 2)
-                    
-                    # Combine applicant data with scores
-                    applicant_with_score = {**applicant, **scores}
-                    scored_applicants.append(applicant_with_score)
-                    
-                except Exception as e:
-                    # Log error but continue with other applicants
-                    logger.error(f"Error scoring applicant {applicant.get('id', 'unknown')}: {str(e)}")
-                    applicant_with_error = {
-                        **applicant, 
-                        "rank_score": {"final_score": 0},
-                        "reasoning": {"error": f"Failed to score: {str(e)}"}
-                    }
-                    scored_applicants.append(applicant_with_error)
+                        # Combine applicant data with scores
+                        return {**applicant, **scores}
+                        
+                    except Exception as e:
+                        # Log error but continue with other applicants
+                        logger.error(f"Error scoring applicant {applicant.get('id', 'unknown')}: {str(e)}")
+                        return {
+                            **applicant, 
+                            "rank_score": {"final_score": 0},
+                            "reasoning": {"error": f"Failed to score: {str(e)}"}
+                        }
+
+            # gather keeps input order, so ties sort exactly as before
+            scored_applicants = await asyncio.gather(*(score_one(applicant) for applicant in applicants))
             
             # Sort applicants by final score (descending)
             ranked_applicants = sorted(
@@ -268,7 +327,7 @@ class GeminiService:
             for key, value in extracted_text.items():
                 formatted_text += f"{key}: {value}\n\n"
             
-            response = await self.model.generate_content_async(
+            response = await self._generate_content_with_retry(
                 [system_prompt, formatted_text]
             )
             
@@ -298,4 +357,15 @@ class GeminiService:
                 
         except Exception as e:
             logger.error(f"Error generating candidate profile: {str(e)}")
-            raise HTTPException(status_code=500, detail="An error occurred while generating the candidate profile. Please try again later.")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="An error occurred while generating the candidate profile. Please try again later.")
+
+
+service_registry.register("gemini", GeminiService, closer=lambda service: service.close())
+
+def get_gemini_service() -> GeminiService:
+    """FastAPI dependency returning the shared GeminiService."""
+    try:
+        return service_registry.get("gemini")
+    except Exception as e:
+        logger.error(f"Error initializing GeminiService: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to initialize Gemini service: {str(e)}")
@@ -0,0 +1,301 @@
+import asyncio
+import copy
+import functools
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from services.candidate_service import CandidateService
+from services.document_service import DocumentService, DOCUMENTAI_BATCH_THRESHOLD
+from services.job_service import JobService
+from models.candidate import CandidateUpdate
+
+logger = logging.getLogger(__name__)
+
+INGESTION_MAX_WORKERS = int(os.getenv("INGESTION_MAX_WORKERS", "4"))
+INGESTION_MAX_TRACKED_JOBS = 200  # Oldest ingestion records are dropped beyond this
+
+# Per-file pipeline states, in the order a file moves through them
+FILE_QUEUED = 'queued'
+FILE_UPLOADED = 'uploaded'
+FILE_EXTRACTED = 'extracted'
+FILE_PROFILED = 'profiled'
+FILE_FAILED = 'failed'
+# Candidate and application exist but the detailed profile could not be generated or saved
+FILE_PROFILE_FAILED = 'profile_failed'
+FILE_TERMINAL_STATES = (FILE_PROFILED, FILE_PROFILE_FAILED, FILE_FAILED)
+FILE_STATE_ORDER = [FILE_QUEUED, FILE_UPLOADED, FILE_EXTRACTED, FILE_PROFILED]
+
+
+class IngestionService:
+    """Runs CV ingestion batches in the background and tracks per-file progress.
+
+    Each file goes through CandidateService.create_candidate (upload and
+    extraction), JobService.add_application and GeminiService.generate_candidate_profile.
+    Large uploads are extracted together with CandidateService.create_candidates_batch.
+    Blocking steps run on a dedicated worker pool so the event loop stays free.
+    """
+
+    def __init__(self, max_workers: int = INGESTION_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cv-ingestion")
+        self._jobs = OrderedDict()
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, files: List[Tuple[bytes, str, str]]) -> str:
+        """Queue a batch of (file_content, file_name, content_type) and return its ingestion ID.
+
+        Must be called from a running event loop; processing starts immediately.
+        """
+        ingestion_id = str(uuid.uuid4())
+        record = {
+            'ingestionId': ingestion_id,
+            'jobId': job_id,
+            'status': 'queued',
+            'createdAt': datetime.now().isoformat(),
+            'completedAt': None,
+            'files': [
+                {
+                    'fileName': file_name,
+                    'state': FILE_QUEUED,
+                    'candidateId': None,
+                    'applicationId': None,
+                    'error': None
+                }
+                for _, file_name, _ in files
+            ],
+            # Full create_candidate / application results, kept for callers that wait on the batch
+            'candidates': [None] * len(files),
+            'applications': [None] * len(files)
+        }
+
+        with self._lock:
+            self._jobs[ingestion_id] = record
+            while len(self._jobs) > INGESTION_MAX_TRACKED_JOBS:
+                self._jobs.popitem(last=False)
+
+        task = asyncio.get_running_loop().create_task(self._run(ingestion_id, job_id, files))
+        self._tasks[ingestion_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(ingestion_id, None))
+
+        logger.info(f"Queued ingestion {ingestion_id} for job {job_id} with {len(files)} files")
+        return ingestion_id
+
+    async def wait(self, ingestion_id: str) -> None:
+        """Wait until an ingestion batch has finished processing.
+
+        Cancelling the waiter (e.g. the client disconnects) leaves the batch running.
+        """
+        task = self._tasks.get(ingestion_id)
+        if task:
+            await asyncio.shield(task)
+
+    def get_status(self, ingestion_id: str) -> Optional[Dict[str, Any]]:
+        """Return the progress of an ingestion batch, or None if it is unknown."""
+        with self._lock:
+            record = self._jobs.get(ingestion_id)
+            if record is None:
+                return None
+            files = copy.deepcopy(record['files'])
+            status = {key: record[key] for key in ('ingestionId', 'jobId', 'status', 'createdAt', 'completedAt')}
+
+        counts = {state: 0 for state in FILE_STATE_ORDER + [FILE_PROFILE_FAILED, FILE_FAILED]}
+        for file_status in files:
+            counts[file_status['state']] += 1
+
+        total = len(files)
+        finished = sum(counts[state] for state in FILE_TERMINAL_STATES)
+        return {
+            **status,
+            'totalFiles': total,
+            'counts': counts,
+            'progress': round(finished / total * 100.0, 2) if total else 100.0,
+            'files': files
+        }
+
+    def get_results(self, ingestion_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return the (candidates, applications) created by an ingestion batch."""
+        with self._lock:
+            record = self._jobs.get(ingestion_id)
+            if record is None:
+                return [], []
+            candidates = [c for c in record['candidates'] if c]
+            applications = [a for a in record['applications'] if a]
+        return copy.deepcopy(candidates), copy.deepcopy(applications)
+
+    def _update_job(self, ingestion_id: str, **fields) -> None:
+        with self._lock:
+            record = self._jobs.get(ingestion_id)
+            if record is not None:
+                record.update(fields)
+
+    def _update_file(self, ingestion_id: str, index: int, state: Optional[str] = None, **fields) -> None:
+        """Update a file's record. States only move forward, except to the failure states."""
+        with self._lock:
+            record = self._jobs.get(ingestion_id)
+            if record is None:
+                return
+            file_status = record['files'][index]
+            for key in ('candidate', 'application'):
+                if key in fields:
+                    record[key + 's'][index] = fields.pop(key)
+            file_status.update(fields)
+            if state in (FILE_FAILED, FILE_PROFILE_FAILED):
+                file_status['state'] = state
+            elif state and file_status['state'] not in (FILE_FAILED, FILE_PROFILE_FAILED):
+                if FILE_STATE_ORDER.index(state) > FILE_STATE_ORDER.index(file_status['state']):
+                    file_status['state'] = state
+
+    async def _run(self, ingestion_id: str, job_id: str, files: List[Tuple[bytes, str, str]]) -> None:
+        self._update_job(ingestion_id, status='processing')
+
+        gemini_service = None
+        try:
+            from services.gemini_service import get_gemini_service
+            gemini_service = get_gemini_service()
+        except Exception as e:
+            logger.error(f"Could not initialize GeminiService for ingestion {ingestion_id}: {e}")
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def process(index: int, file: Tuple[bytes, str, str]) -> None:
+            async with semaphore:
+                try:
+                    await self._process_file(ingestion_id, index, job_id, file, gemini_service)
+                except Exception as e:
+                    logger.error(f"Error ingesting file {file[1]} for job {job_id}: {e}")
+                    self._update_file(ingestion_id, index, FILE_FAILED, error=str(e))
+
+        async def finish(index: int, candidate_data: Optional[Dict[str, Any]]) -> None:
+            async with semaphore:
+                try:
+                    await self._finish_file(ingestion_id, index, job_id, candidate_data, gemini_service)
+                except Exception as e:
+                    logger.error(f"Error ingesting file {files[index][1]} for job {job_id}: {e}")
+                    self._update_file(ingestion_id, index, FILE_FAILED, error=str(e))
+
+        status = 'completed'
+        try:
+            batch_eligible = sum(1 for _, file_name, _ in files if DocumentService.supports_batch(file_name))
+            if batch_eligible >= DOCUMENTAI_BATCH_THRESHOLD:
+                # Large upload: extract every resume with Document AI batch requests, then fan out
+                logger.info(f"Ingestion {ingestion_id} using batch extraction for {batch_eligible} files")
+                loop = asyncio.get_running_loop()
+                candidates = await loop.run_in_executor(self._executor, functools.partial(
+                    CandidateService.create_candidates_batch,
+                    job_id,
+                    files,
+                    on_uploaded=lambda index: self._update_file(ingestion_id, index, FILE_UPLOADED)
+                ))
+                await asyncio.gather(*(finish(index, candidate_data) for index, candidate_data in enumerate(candidates)))
+            else:
+                await asyncio.gather(*(process(index, file) for index, file in enumerate(files)))
+        except asyncio.CancelledError:
+            status = 'cancelled'
+            self._fail_unfinished(ingestion_id, "Ingestion was cancelled before this file finished")
+            raise
+        except Exception as e:
+            status = 'failed'
+            logger.error(f"Ingestion {ingestion_id} for job {job_id} failed: {e}")
+            self._fail_unfinished(ingestion_id, str(e))
+        finally:
+            self._update_job(ingestion_id, status=status, completedAt=datetime.now().isoformat())
+            logger.info(f"Ingestion {ingestion_id} for job {job_id} {status}")
+
+    def _fail_unfinished(self, ingestion_id: str, error: str) -> None:
+        """Mark every file that has not reached a terminal state yet as failed."""
+        with self._lock:
+            record = self._jobs.get(ingestion_id)
+            unfinished = [] if record is None else [
+                index for index, file_status in enumerate(record['files'])
+                if file_status['state'] not in FILE_TERMINAL_STATES
+            ]
+        for index in unfinished:
+            self._update_file(ingestion_id, index, FILE_FAILED, error=error)
+
+    async def _process_file(self, ingestion_id: str, index: int, job_id: str,
+                            file: Tuple[bytes, str, str], gemini_service: Any) -> None:
+        loop = asyncio.get_running_loop()
+        file_content, file_name, content_type = file
+
+        # Upload and extract the resume
+        candidate_data = await loop.run_in_executor(self._executor, functools.partial(
+            CandidateService.create_candidate,
+            job_id=job_id,
+            file_content=file_content,
+            file_name=file_name,
+            content_type=content_type,
+            on_uploaded=lambda: self._update_file(ingestion_id, index, FILE_UPLOADED)
+        ))
+        await self._finish_file(ingestion_id, index, job_id, candidate_data, gemini_service)
+
+    async def _finish_file(self, ingestion_id: str, index: int, job_id: str,
+                           candidate_data: Optional[Dict[str, Any]], gemini_service: Any) -> None:
+        """Create the application and detailed profile for an extracted resume."""
+        loop = asyncio.get_running_loop()
+        if not candidate_data:
+            self._update_file(ingestion_id, index, FILE_FAILED, error="Failed to create candidate")
+            return
+
+        candidate_id = candidate_data['candidateId']
+        self._update_file(ingestion_id, index, FILE_EXTRACTED, candidateId=candidate_id, candidate=candidate_data)
+
+        # Create the application
+        application_id = await loop.run_in_executor(self._executor, JobService.add_application, job_id, candidate_id)
+        if not application_id:
+            self._update_file(ingestion_id, index, FILE_FAILED, error="Failed to create application", application={
+                'candidateId': candidate_id,
+                'success': False,
+                'error': 'Failed to create application'
+            })
+            return
+        self._update_file(ingestion_id, index, applicationId=application_id, application={
+            'applicationId': application_id,
+            'candidateId': candidate_id,
+            'success': True
+        })
+
+        # Generate the detailed profile; the candidate and application are kept if this fails
+        if gemini_service is None:
+            self._update_file(ingestion_id, index, FILE_PROFILE_FAILED, error="Profile generation unavailable")
+            return
+
+        logger.info(f"Generating detailed profile for candidate {candidate_id}")
+        try:
+            detailed_profile = await gemini_service.generate_candidate_profile({'extractedText': candidate_data.get('extractedData') or {}})
+            profile_update = CandidateUpdate(detailed_profile=detailed_profile)
+            success = await loop.run_in_executor(self._executor, CandidateService.update_candidate, candidate_id, profile_update)
+        except Exception as e:
+            logger.error(f"Error generating detailed profile for candidate {candidate_id}: {e}")
+            self._update_file(ingestion_id, index, FILE_PROFILE_FAILED, error=str(e))
+            return
+        if not success:
+            self._update_file(ingestion_id, index, FILE_PROFILE_FAILED, error="Failed to save detailed profile")
+            return
+
+        self._update_file(ingestion_id, index, FILE_PROFILED)
+        logger.info(f"Successfully generated and saved detailed profile for candidate {candidate_id}")
+
+    async def shutdown(self) -> None:
+        """Cancel unfinished ingestion batches and stop the worker pool.
+
+        Files that had not reached a terminal state are marked failed. Steps
+        already running on a worker thread cannot be interrupted and finish in
+        the background; queued steps are dropped.
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            logger.info(f"Cancelling {len(tasks)} unfinished ingestion batches")
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Create a singleton instance
+ingestion_service = IngestionService()
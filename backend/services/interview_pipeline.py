@@ -0,0 +1,416 @@
+import base64
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from firebase_admin import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+from starlette.concurrency import run_in_threadpool
+from google.api_core import exceptions as google_exceptions
+from services.nltk_resources import count_words
+from services.transcription_service import transcriber
+from services.interview_service import (
+    extract_audio_with_voice_effect, transcribe_audio_with_google_cloud, score_response
+)
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_PIPELINE_WORKERS = int(os.getenv("INTERVIEW_PIPELINE_WORKERS", "2"))
+# Resumable-upload chunk size for videos sent to storage; must be a multiple of 256 KB
+VIDEO_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Each answer is stored at interviewResponses.responses.<responseId>, so writing one answer
+# never rewrites the others; documents from before that keep them in a 'questions' array
+
+# Per-response processing stages, written to interviewResponses.responseStatus.<responseId>
+STAGE_QUEUED = 'queued'
+STAGE_EXTRACTING_AUDIO = 'extracting_audio'
+STAGE_TRANSCRIBING = 'transcribing'
+STAGE_SCORING = 'scoring'
+STAGE_COMPLETED = 'completed'
+STAGE_FAILED = 'failed'
+
+# Running sums of each score, plus the number of answers in 'count', kept in scoreTotals
+# with atomic increments; completing the interview turns them into averages in 'analysis'
+SCORE_FIELDS = {
+    'clarity': 'clarity',
+    'confidence': 'confidence',
+    'relevance': 'relevance',
+    'engagement': 'engagement',
+    'totalScore': 'total_score'
+}
+
+
+def _status_field(response_id: str) -> str:
+    # Response IDs contain '-', so the field path has to be quoted
+    return FieldPath('responseStatus', response_id).to_api_repr()
+
+
+def _response_field(response_id: str, *fields: str) -> str:
+    return FieldPath('responses', response_id, *fields).to_api_repr()
+
+
+def _submitted_at(answer: Dict[str, Any]) -> float:
+    # Answers written back by clients carry submitTime as an ISO string
+    submit_time = answer.get('submitTime')
+    if isinstance(submit_time, str):
+        submit_time = datetime.fromisoformat(submit_time)
+    return submit_time.timestamp() if submit_time else 0.0
+
+
+def ordered_answers(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the answers of an interviewResponses document in the order they were submitted."""
+    answers = list(data.get('questions', []))
+    answers.extend(sorted(data.get('responses', {}).values(), key=_submitted_at))
+    return answers
+
+
+def _averages(totals: Dict[str, Any]) -> Dict[str, float]:
+    count = totals.get('count', 0)
+    return {field: float(totals.get(field, 0)) / count if count > 0 else 0.0 for field in SCORE_FIELDS}
+
+
+class InterviewResponsePipeline:
+    """Processes submitted interview answers in the background.
+
+    submit-response only stores the video and records the answer; audio
+    extraction, voice effect, transcription and scoring run on a worker pool,
+    with the current stage of each answer written to its interviewResponses
+    document so clients can poll it.
+    """
+
+    def __init__(self, max_workers: int = INTERVIEW_PIPELINE_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="interview-pipeline")
+        # Audio uploads run beside transcription and scoring, two per answer
+        self._upload_executor = ThreadPoolExecutor(max_workers=max_workers * 2, thread_name_prefix="interview-upload")
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking request-path call (link checks, uploads, status reads) in the request threadpool.
+
+        This is deliberately not the processing pool, so new submissions and status
+        polls never queue behind answers that take minutes to transcribe and score.
+        """
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    def accept(self, db, storage_bucket, application_id: str, interview_id: str, question_id: str,
+               response_id: str, video_response: Optional[str]) -> Optional[str]:
+        """Store a base64 video and record the answer. Returns the local video path to process, if any."""
+        if not video_response:
+            self._record_answer(db, application_id, question_id, response_id, None, None, STAGE_COMPLETED)
+            return None
+
+        temp_video_file_path = None
+        try:
+            # Remove data URL prefix if present
+            video_data = video_response.split(',')[1] if ',' in video_response else video_response
+
+            # Decode base64 video data and keep a local copy for audio extraction
+            temp_video_file = tempfile.NamedTemporaryFile(delete=False, suffix=".webm")
+            temp_video_file_path = temp_video_file.name
+            temp_video_file.write(base64.b64decode(video_data))
+            temp_video_file.close()
+        except Exception as video_error:
+            logger.error(f"Video processing error: {str(video_error)}")
+            if temp_video_file_path and os.path.exists(temp_video_file_path):
+                os.unlink(temp_video_file_path)
+            self._record_answer(db, application_id, question_id, response_id, None,
+                                f"Video processing failed: {str(video_error)}", STAGE_FAILED, str(video_error))
+            return None
+
+        return self.accept_file(db, storage_bucket, application_id, interview_id, question_id, response_id, temp_video_file_path)
+
+    def accept_file(self, db, storage_bucket, application_id: str, interview_id: str, question_id: str,
+                    response_id: str, video_path: str) -> Optional[str]:
+        """Upload a local video file and record the answer. Returns the path to process, or None on failure."""
+        try:
+            # Upload video to Firebase Storage, streamed from disk in fixed-size chunks
+            video_storage_path = f"interview_responses/{application_id}/{interview_id}/{question_id}.webm"
+            video_blob = storage_bucket.blob(video_storage_path, chunk_size=VIDEO_UPLOAD_CHUNK_SIZE)
+            video_blob.upload_from_filename(video_path, content_type="video/webm")
+            video_blob.make_public()
+        except Exception as video_error:
+            logger.error(f"Video processing error: {str(video_error)}")
+            if os.path.exists(video_path):
+                os.unlink(video_path)
+            self._record_answer(db, application_id, question_id, response_id, None,
+                                f"Video processing failed: {str(video_error)}", STAGE_FAILED, str(video_error))
+            return None
+
+        self._record_answer(db, application_id, question_id, response_id, video_blob.public_url, None, STAGE_QUEUED)
+        return video_path
+
+    def _record_answer(self, db, application_id: str, question_id: str, response_id: str, video_url: Optional[str],
+                       transcript: Optional[str], stage: str, error: Optional[str] = None) -> None:
+        """Add the answer to the application's interviewResponses document."""
+        question_response = {
+            'questionId': question_id,
+            'responseId': response_id,
+            'submitTime': datetime.utcnow(),
+            'transcript': transcript,
+            'wordCount': 0,
+            'videoResponseUrl': video_url,
+            'audioExtractUrl': None,
+            'modifiedAudioUrl': None,
+            'wordTimings': [],
+            'wordTimingIndices': [],
+            'AIFeedback': None
+        }
+        status = {'stage': stage, 'error': error, 'updatedAt': datetime.utcnow()}
+
+        interview_doc_ref = db.collection('interviewResponses').document(application_id)
+        try:
+            # Initialize document with the first question; scores are added once it is processed.
+            # create() fails if another answer got there first, so concurrent first answers can't overwrite each other
+            interview_doc_ref.create({
+                'applicationId': application_id,
+                'analysis': {field: 0.0 for field in SCORE_FIELDS},
+                'scoreTotals': {**{field: 0.0 for field in SCORE_FIELDS}, 'count': 1},
+                'responses': {response_id: question_response},
+                'responseStatus': {response_id: status},
+                'createdAt': datetime.utcnow(),
+                'updatedAt': datetime.utcnow()
+            })
+        except google_exceptions.AlreadyExists:
+            interview_doc_ref.update({
+                _response_field(response_id): question_response,
+                'scoreTotals.count': firestore.Increment(1),
+                _status_field(response_id): status,
+                'updatedAt': datetime.utcnow()
+            })
+
+    def submit(self, db, storage_bucket, application_id: str, interview_id: str, question: str,
+               response_id: str, video_path: str) -> None:
+        """Process a stored answer in the background."""
+        self._executor.submit(
+            self._process, db, storage_bucket, application_id, interview_id, question, response_id, video_path
+        )
+
+    @staticmethod
+    def get_status(db, application_id: str, response_id: str) -> Optional[Dict[str, Any]]:
+        """Return the processing status and, once finished, the result of one answer."""
+        interview_doc_ref = db.collection('interviewResponses').document(application_id)
+        interview_doc = interview_doc_ref.get(field_paths=[_response_field(response_id), _status_field(response_id)])
+        if not interview_doc.exists:
+            return None
+        data = interview_doc.to_dict()
+        question_response = data.get('responses', {}).get(response_id)
+        if question_response is None:
+            legacy = interview_doc_ref.get(field_paths=['questions']).to_dict() or {}
+            question_response = next(
+                (q for q in legacy.get('questions', []) if q.get('responseId') == response_id), None
+            )
+        if question_response is None:
+            return None
+        status = data.get('responseStatus', {}).get(response_id, {'stage': STAGE_COMPLETED, 'error': None})
+        result = {
+            'responseId': response_id,
+            'stage': status.get('stage'),
+            'error': status.get('error'),
+            'updatedAt': status.get('updatedAt')
+        }
+        if status.get('stage') in (STAGE_COMPLETED, STAGE_FAILED):
+            result.update({
+                'transcript': question_response.get('transcript'),
+                'word_count': question_response.get('wordCount', 0),
+                'word_timings': question_response.get('wordTimings', []),
+                'word_timing_indices': question_response.get('wordTimingIndices', [])
+            })
+        return result
+
+    def _set_stage(self, db, application_id: str, response_id: str, stage: str, error: Optional[str] = None) -> None:
+        try:
+            db.collection('interviewResponses').document(application_id).update({
+                _status_field(response_id): {'stage': stage, 'error': error, 'updatedAt': datetime.utcnow()}
+            })
+        except Exception as e:
+            logger.warning(f"Could not record stage {stage} for response {response_id}: {e}")
+
+    def _process(self, db, storage_bucket, application_id: str, interview_id: str, question: str,
+                 response_id: str, video_path: str) -> None:
+        temp_audio_file_path = None
+        temp_modified_audio_path = None
+        updates = {}
+        uploads = {}
+        scores = {}
+        error = None
+
+        try:
+            # Create temporary paths for the clean and voice-effect audio
+            self._set_stage(db, application_id, response_id, STAGE_EXTRACTING_AUDIO)
+            temp_audio_file = tempfile.NamedTemporaryFile(delete=False, suffix="_audio.wav")
+            temp_audio_file_path = temp_audio_file.name
+            temp_audio_file.close()
+            temp_modified_file = tempfile.NamedTemporaryFile(delete=False, suffix="_modified.wav")
+            temp_modified_audio_path = temp_modified_file.name
+            temp_modified_file.close()
+
+            # One FFmpeg run writes both the extracted audio and the voice-effect version
+            extract_audio_with_voice_effect(video_path, temp_audio_file_path, temp_modified_audio_path, effect_type="helium")
+            logger.info(f"Extracted audio file path: {temp_audio_file_path}")
+
+            if not os.path.exists(temp_audio_file_path):
+                logger.error("Audio extraction failed: File not found")
+                updates['transcript'] = "Audio extraction failed"
+                error = "Audio extraction failed"
+                return
+
+            # Long-running recognition reads the clip from storage, so only then is the clean audio
+            # uploaded first; otherwise both files upload while the answer is transcribed and scored
+            audio_storage_path = f"interview_responses/{application_id}/{interview_id}/{response_id}_audio.wav"
+            modified_audio_storage_path = f"interview_responses/{application_id}/{interview_id}/{response_id}_modified_audio.wav"
+            gcs_uri = None
+            if transcriber.needs_storage_copy(temp_audio_file_path):
+                updates['audioExtractUrl'] = self._upload_audio(storage_bucket, audio_storage_path, temp_audio_file_path)
+                gcs_uri = f"gs://{storage_bucket.name}/{audio_storage_path}"
+            else:
+                uploads['audioExtractUrl'] = self._upload_executor.submit(
+                    self._upload_audio, storage_bucket, audio_storage_path, temp_audio_file_path
+                )
+            uploads['modifiedAudioUrl'] = self._upload_executor.submit(
+                self._upload_audio, storage_bucket, modified_audio_storage_path, temp_modified_audio_path
+            )
+
+            # Transcribe audio using Google Cloud Speech-to-Text
+            self._set_stage(db, application_id, response_id, STAGE_TRANSCRIBING)
+            transcription_result = transcribe_audio_with_google_cloud(gcs_uri, audio_path=temp_audio_file_path)
+            transcript = transcription_result['transcript']
+            word_timings = transcription_result.get('word_timings', [])
+            updates['transcript'] = transcript
+            updates['wordTimings'] = word_timings
+            # Position in wordTimings of each word of the normalized transcript
+            updates['wordTimingIndices'] = transcription_result.get('word_timing_indices', [])
+            updates['wordCount'] = count_words(transcript, updates['wordTimingIndices'])
+
+            # Analyze scores only if we have all required data
+            if transcript and len(transcript.strip()) > 0 and question:
+                self._set_stage(db, application_id, response_id, STAGE_SCORING)
+                scores = score_response(
+                    transcript=transcript,
+                    question_text=question,
+                    audio_path=temp_modified_audio_path,
+                    word_timings=word_timings
+                )
+            else:
+                logger.warning(f"Missing data for scoring: transcript={bool(transcript)}, question={bool(question)}")
+
+            logger.info(f"Response scores for {response_id}: {scores}")
+            logger.info(f"Word timings count: {len(word_timings)}")
+        except Exception as transcription_error:
+            logger.error(f"Transcription error: {str(transcription_error)}")
+            updates['transcript'] = f"Transcription failed: {str(transcription_error)}"
+            updates['wordCount'] = 0
+            scores = {}
+            error = str(transcription_error)
+        finally:
+            # The temporary files are only removed once their uploads are done
+            for field, upload in uploads.items():
+                try:
+                    updates[field] = upload.result()
+                except Exception as upload_error:
+                    logger.error(f"Error uploading {field} for response {response_id}: {upload_error}")
+                    error = error or f"Audio upload failed: {upload_error}"
+            try:
+                self._record_result(db, application_id, response_id, updates, scores, error)
+            except Exception as e:
+                logger.error(f"Error saving processed interview response {response_id}: {e}")
+                self._set_stage(db, application_id, response_id, STAGE_FAILED, str(e))
+
+            # Clean up temporary files
+            for temp_file in [video_path, temp_audio_file_path, temp_modified_audio_path]:
+                if temp_file and os.path.exists(temp_file):
+                    try:
+                        os.unlink(temp_file)
+                    except Exception as e:
+                        logger.error(f"Error deleting temporary file {temp_file}: {str(e)}")
+
+    @staticmethod
+    def _upload_audio(storage_bucket, storage_path: str, audio_path: str) -> str:
+        """Upload a WAV to storage and return its public URL."""
+        audio_blob = storage_bucket.blob(storage_path)
+        audio_blob.upload_from_filename(audio_path, content_type="audio/wav")
+        audio_blob.make_public()
+        return audio_blob.public_url
+
+    def _record_result(self, db, application_id: str, response_id: str, updates: Dict[str, Any],
+                       scores: Dict[str, Any], error: Optional[str]) -> None:
+        """Fill in the processed answer and add its scores to the running totals in one transaction.
+
+        Only the answer's own fields, its status and the score fields are
+        written, so concurrent answers never rewrite each other.
+        """
+        interview_doc_ref = db.collection('interviewResponses').document(application_id)
+
+        @firestore.transactional
+        def apply_result(transaction):
+            data = interview_doc_ref.get(
+                field_paths=['scoreTotals', 'scoresFinalized'], transaction=transaction
+            ).to_dict() or {}
+            answer_update = {_response_field(response_id, field): value for field, value in updates.items()}
+            # Scores are applied as increments, not from what was read, so no sum can be lost
+            score_increments = {
+                f'scoreTotals.{field}': firestore.Increment(float(scores.get(key, 0)))
+                for field, key in SCORE_FIELDS.items()
+                if scores.get(key)
+            }
+            analysis_update = {}
+            if data.get('scoresFinalized'):
+                # The interview was completed before this answer finished; refresh the averages with it
+                totals = dict(data.get('scoreTotals', {}))
+                for field, key in SCORE_FIELDS.items():
+                    totals[field] = totals.get(field, 0) + float(scores.get(key, 0))
+                analysis_update = {f'analysis.{field}': value for field, value in _averages(totals).items()}
+            transaction.update(interview_doc_ref, {
+                **answer_update,
+                **score_increments,
+                **analysis_update,
+                _status_field(response_id): {
+                    'stage': STAGE_FAILED if error else STAGE_COMPLETED,
+                    'error': error,
+                    'updatedAt': datetime.utcnow()
+                },
+                'updatedAt': datetime.utcnow()
+            })
+
+        apply_result(db.transaction())
+
+    @staticmethod
+    def finalize_scores(db, application_id: str) -> Optional[Dict[str, float]]:
+        """Write the average of each score into 'analysis' and return the averages.
+
+        Answers still being processed are averaged in when their results are
+        recorded, so completing an interview never has to wait for them.
+        """
+        interview_doc_ref = db.collection('interviewResponses').document(application_id)
+
+        @firestore.transactional
+        def apply_averages(transaction):
+            doc = interview_doc_ref.get(field_paths=['scoreTotals'], transaction=transaction)
+            if not doc.exists:
+                return None
+
+            update = {'scoresFinalized': True}
+            totals = doc.to_dict().get('scoreTotals')
+            if totals is None:
+                # Documents from before scoreTotals hold the sums in 'analysis', one per question
+                data = interview_doc_ref.get(field_paths=['analysis', 'questions'], transaction=transaction).to_dict()
+                totals = {**{field: data.get('analysis', {}).get(field, 0) for field in SCORE_FIELDS},
+                          'count': len(data.get('questions', []))}
+                update['scoreTotals'] = totals
+
+            averages = _averages(totals)
+            update.update({f'analysis.{field}': value for field, value in averages.items()})
+            transaction.update(interview_doc_ref, update)
+            return averages
+
+        return apply_averages(db.transaction())
+
+    def shutdown(self) -> None:
+        """Stop the worker pools, waiting for answers being processed to finish."""
+        self._executor.shutdown(wait=True)
+        self._upload_executor.shutdown(wait=True)
+
+
+# Create a singleton instance
+interview_pipeline = InterviewResponsePipeline()
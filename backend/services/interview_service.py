@@ -11,26 +11,79 @@ import smtplib
 import time
 import logging
 import tempfile
-from google.cloud import speech
 import subprocess
 from concurrent.futures import ThreadPoolExecutor
 import io
-import platform
+import mmap
+import struct
 import numpy as np
 from google.cloud import language_v1
-import librosa
-import torch
-from transformers import AutoTokenizer, AutoModel
-from sklearn.metrics.pairwise import cosine_similarity
+from google.api_core import exceptions as google_exceptions
+from functools import lru_cache
 import requests
+from services.service_registry import service_registry
+from services.embedding_service import embedding_service
+from services.ffmpeg_service import get_ffmpeg
+from services.transcription_service import transcriber
 
 logger = logging.getLogger(__name__)
 LINK_EXPIRY_DAYS = 7
 
-# Initialize clients and models globally
-nlp_client = language_v1.LanguageServiceClient()
-tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-model = AutoModel.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+# Clients and models are built on first use (or by the startup warm-up) and then shared
+service_registry.register("nlp_client", language_v1.LanguageServiceClient,
+                          closer=lambda client: client.transport.close())
+
+def get_nlp_client() -> language_v1.LanguageServiceClient:
+    """Return the shared Natural Language API client."""
+    return service_registry.get("nlp_client")
+
+# Everything the four analyzers need from one transcript, fetched in a single annotate_text call
+TRANSCRIPT_FEATURES = language_v1.AnnotateTextRequest.Features(
+    extract_syntax=True,
+    extract_entities=True,
+    extract_document_sentiment=True,
+    classify_text=True
+)
+TRANSCRIPT_FEATURES_UNCLASSIFIED = language_v1.AnnotateTextRequest.Features(
+    extract_syntax=True,
+    extract_entities=True,
+    extract_document_sentiment=True
+)
+QUESTION_FEATURES = language_v1.AnnotateTextRequest.Features(
+    extract_entities=True,
+    extract_document_sentiment=True
+)
+
+class TranscriptAnnotation:
+    """Natural Language API results for one transcript, shared by the analyze_* functions."""
+
+    def __init__(self, response: language_v1.AnnotateTextResponse, classified: bool):
+        self.sentiment = response.document_sentiment
+        self.tokens = response.tokens
+        self.sentences = response.sentences
+        self.entities = response.entities
+        # None when the text could not be classified (e.g. too short)
+        self.categories = response.categories if classified else None
+
+def annotate_transcript(transcript):
+    """Annotate a transcript with syntax, entities, sentiment and categories in one API call."""
+    doc = language_v1.Document(content=transcript, type_=language_v1.Document.Type.PLAIN_TEXT)
+    try:
+        response = get_nlp_client().annotate_text(document=doc, features=TRANSCRIPT_FEATURES)
+        return TranscriptAnnotation(response, classified=True)
+    except google_exceptions.InvalidArgument as e:
+        # classify_text rejects texts that are too short; keep the other annotations
+        logging.warning(f"Annotating transcript without classification: {str(e)}")
+        response = get_nlp_client().annotate_text(document=doc, features=TRANSCRIPT_FEATURES_UNCLASSIFIED)
+        return TranscriptAnnotation(response, classified=False)
+
+@lru_cache(maxsize=256)
+def annotate_question(question):
+    """Return (entity keywords, sentiment score) for an interview question, memoized per question text."""
+    doc = language_v1.Document(content=question, type_=language_v1.Document.Type.PLAIN_TEXT)
+    response = get_nlp_client().annotate_text(document=doc, features=QUESTION_FEATURES)
+    keywords = frozenset(entity.name.lower() for entity in response.entities)
+    return keywords, response.document_sentiment.score
 
 def get_db():
     """Return the Firestore database client"""
@@ -226,6 +279,57 @@ def validate_interview_link(interview_id: str, link_code: str):
     
     return interview_data
 
+def extract_audio_with_voice_effect(input_video_path, output_audio_path, output_modified_audio_path, effect_type="helium"):
+    """
+    Extract the clean audio and the voice-effect audio of a video in one FFmpeg run
+
+    The audio is decoded and filtered once, then split into both outputs, instead of
+    writing the clean WAV and reading it back in a second FFmpeg process. Falls back
+    to extract_audio_with_ffmpeg and apply_voice_effect if the combined run fails.
+
+    Args:
+        input_video_path (str): Path to input video file
+        output_audio_path (str): Path for the clean 16 kHz mono WAV
+        output_modified_audio_path (str): Path for the voice-effect WAV
+        effect_type (str): Voice effect, as for apply_voice_effect
+
+    Returns:
+        tuple: (output_audio_path, output_modified_audio_path)
+    """
+    if not input_video_path or not os.path.exists(input_video_path):
+        raise ValueError(f"Invalid input video path: {input_video_path}")
+
+    ffmpeg = get_ffmpeg()
+    wav_output = ['-acodec', 'pcm_s16le', '-ar', '16000', '-ac', '1']
+    filter_graph = (
+        f"[0:a]{ffmpeg.clean_audio_filters()},aresample=16000,aformat=channel_layouts=mono,asplit=2[clean][effect_in];"
+        f"[effect_in]{ffmpeg.voice_effect_filter(effect_type)}[effect]"
+    )
+    command = [
+        ffmpeg.path,
+        '-i', input_video_path,
+        '-filter_complex', filter_graph,
+        '-map', '[clean]', *wav_output, '-y', output_audio_path,
+        '-map', '[effect]', *wav_output, '-y', output_modified_audio_path
+    ]
+
+    try:
+        subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        for path in (output_audio_path, output_modified_audio_path):
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                raise RuntimeError(f"Audio extraction failed: Output file not created or empty at {path}")
+
+        logging.info(f"Extracted audio and applied voice effect '{effect_type}' in one pass: {output_audio_path}, {output_modified_audio_path}")
+        return output_audio_path, output_modified_audio_path
+    except subprocess.CalledProcessError as e:
+        logging.warning(f"Combined FFmpeg run failed, falling back to separate passes: {e.stderr.decode() if e.stderr else str(e)}")
+    except RuntimeError as e:
+        logging.warning(f"{e}; falling back to separate passes")
+
+    extract_audio_with_ffmpeg(input_video_path, output_audio_path)
+    apply_voice_effect(output_audio_path, effect_type=effect_type, output_audio_path=output_modified_audio_path)
+    return output_audio_path, output_modified_audio_path
+
 # Update these functions in interview_service.py
 
 def extract_audio_with_ffmpeg(input_video_path, output_audio_path=None):
@@ -239,37 +343,8 @@ def extract_audio_with_ffmpeg(input_video_path, output_audio_path=None):
     Returns:
         str: Path to extracted audio file
     """
-    ffmpeg_path = None
-
-    # Determine ffmpeg path based on platform
-    if platform.system() == "Darwin":  # macOS
-        potential_paths = [
-            '/opt/homebrew/Cellar/ffmpeg@6/6.1.2_8/bin/ffmpeg',
-            '/opt/homebrew/bin/ffmpeg',
-            '/usr/local/bin/ffmpeg'
-        ]
-        
-        for path in potential_paths:
-            if os.path.exists(path):
-                ffmpeg_path = path
-                break
-                
-        if not ffmpeg_path:
-            raise RuntimeError("FFmpeg not found. Please install it with 'brew install ffmpeg'")
-    else:
-        # For Windows and others, try multiple paths
-        potential_windows_paths = [
-            r'C:\Users\ooiru\Downloads\ffmpeg-2025-03-31-git-35c091f4b7-full_build\ffmpeg-2025-03-31-git-35c091f4b7-full_build\bin\ffmpeg.exe',
-            r'C:\Users\hongy\Downloads\ffmpeg-n6.1-latest-win64-gpl-6.1\bin\ffmpeg.exe'
-        ]
-        
-        for path in potential_windows_paths:
-            if os.path.exists(path):
-                ffmpeg_path = path
-                break
-                
-        if not ffmpeg_path:
-            ffmpeg_path = 'ffmpeg'  # Fallback to PATH
+    ffmpeg = get_ffmpeg()
+    ffmpeg_path = ffmpeg.path
     
     if not input_video_path or not os.path.exists(input_video_path):
         raise ValueError(f"Invalid input video path: {input_video_path}")
@@ -290,7 +365,7 @@ def extract_audio_with_ffmpeg(input_video_path, output_audio_path=None):
             '-ar', '16000',           # IMPROVED: Higher sample rate (16kHz) for better quality
             '-ac', '1',               # Mono channel
             # IMPROVED: Add audio filtering for better voice clarity
-            '-af', 'highpass=f=80,lowpass=f=7500,dynaudnorm=f=150:g=15',  
+            '-af', ffmpeg.clean_audio_filters(),
             '-y',                     # Overwrite output file
             output_audio_path         # Output audio file
         ]
@@ -339,61 +414,22 @@ def extract_audio_with_ffmpeg(input_video_path, output_audio_path=None):
         logging.error(f"Unexpected error in audio extraction: {str(e)}")
         raise
 
-def transcribe_audio_with_google_cloud(gcs_uri):
+def transcribe_audio_with_google_cloud(gcs_uri=None, audio_path=None):
     """
-    Improved transcription function using Google Cloud Speech-to-Text API
+    Improved transcription function using Google Cloud Speech-to-Text API, or the
+    backend selected by TRANSCRIPTION_BACKEND
     
     Args:
-        gcs_uri (str): GCS URI of the audio file
+        gcs_uri (str, optional): GCS URI of the audio file, needed only for clips too long to stream
+        audio_path (str, optional): Local 16 kHz mono WAV, sent inline or streamed
 
     Returns:
         dict: Enhanced transcription results with transcript and confidence
     """
     try:
-        # Instantiate a client
-        client = speech.SpeechClient()
+        transcription = transcriber.transcribe(audio_path=audio_path, gcs_uri=gcs_uri)
 
-        # Configure audio input using the GCS URI
-        audio = speech.RecognitionAudio(uri=gcs_uri)
-        
-        # IMPROVED: Add more domain-specific phrases for better recognition
-        interview_phrases = [
-            "interview", "job", "experience", "skills", "role", "position",
-            "team", "project", "management", "development", "challenges",
-            "achievements", "responsibilities", "education", "degree",
-            "certificate", "training", "leadership", "communication",
-            "problem-solving", "technical", "professional", "background", 
-            "opportunity", "career", "goals", "objectives", "salary",
-            "work", "employment", "remote", "hybrid", "flexible"
-        ]
-        
-        # IMPROVED: Enhanced configuration for better transcription
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,  # IMPROVED: Match the new extraction sample rate
-            language_code='en-US',
-            enable_automatic_punctuation=True,
-            model='video',  # IMPROVED: Use video model which is better for recorded speech
-            use_enhanced=True,  # IMPROVED: Use enhanced model
-            profanity_filter=False,
-            speech_contexts=[
-                speech.SpeechContext(
-                    phrases=interview_phrases,
-                    boost=15.0  # Boost recognition of these phrases
-                )
-            ],
-            # IMPROVED: Get word-level timestamps and confidence
-            enable_word_time_offsets=True,
-            enable_word_confidence=True,
-            # IMPROVED: Get alternative transcriptions
-            max_alternatives=2
-        )
-
-        # Use long_running_recognize for all audio files
-        operation = client.long_running_recognize(config=config, audio=audio)
-        response = operation.result(timeout=180)  # Longer timeout for processing
-
-        if not response.results:
+        if not transcription['transcript'].strip():
             return {
                 'transcript': "No transcription results (empty speech detected)",
                 'confidence': 0.0,
@@ -401,55 +437,9 @@ def transcribe_audio_with_google_cloud(gcs_uri):
                 'word_timings': []  # Return empty array for word timings
             }
         
-        # IMPROVED: Better processing of results
-        transcripts = []
-        confidence_scores = []
-        word_count = 0
-        word_timings = []  # List to store word timing information
-        word_index = 0  # Global index to track position in full transcript
-        
-        for result in response.results:
-            # Use the highest confidence alternative
-            best_alternative = result.alternatives[0]
-            transcripts.append(best_alternative.transcript)
-            confidence_scores.append(best_alternative.confidence)
-            
-            # Process word-level information
-            for word_info in best_alternative.words:
-                # Convert to seconds
-                start_time = word_info.start_time.total_seconds()
-                end_time = word_info.end_time.total_seconds()
-                
-                # Add to word timings array with necessary information
-                word_timings.append({
-                    'word': word_info.word,
-                    'startTime': start_time,
-                    'endTime': end_time,
-                    'confidence': word_info.confidence,
-                    'index': word_index
-                })
-                
-                word_index += 1
-            
-            # Count words for statistics
-            words = best_alternative.transcript.split()
-            word_count += len(words)
-        
         # IMPROVED: Post-process transcript for better readability
-        full_transcript = ' '.join(transcripts)
-        
-        # Normalize the transcript
-        processed_transcript = post_process_transcript(full_transcript)
-        
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
-        
-        return {
-            'transcript': processed_transcript,
-            'confidence': avg_confidence,
-            'word_count': word_count,
-            'word_timings': word_timings,  # Include word timings in the response
-            'raw_results': response.results
-        }
+        transcription['transcript'], transcription['word_timing_indices'] = normalize_transcript(transcription['transcript'])
+        return transcription
     
     except Exception as e:
         logging.error(f"Google Cloud Speech-to-Text error: {str(e) if e is not None else 'Unknown error'}")
@@ -460,6 +450,46 @@ def transcribe_audio_with_google_cloud(gcs_uri):
             'raw_results': None
         }
 
+SENTENCE_ENDINGS = ('.', '!', '?')
+
+def normalize_transcript(transcript):
+    """
+    Normalize a raw transcript in a single pass over its words
+    
+    Collapses whitespace, drops immediately repeated words, capitalizes each
+    sentence start and ensures terminal punctuation.
+    
+    Args:
+        transcript: Raw transcript text
+        
+    Returns:
+        tuple: (normalized transcript, list mapping each normalized word to its
+               index in the raw words, i.e. in word_timings)
+    """
+    words = []
+    word_indices = []
+    previous = None
+    capitalize_next = True
+
+    for index, word in enumerate(transcript.split()):
+        lowered = word.lower()
+        # Remove repeated words (common in speech-to-text output)
+        if lowered == previous:
+            continue
+        previous = lowered
+
+        if capitalize_next:
+            word = word[0].upper() + word[1:]
+        capitalize_next = word.endswith(SENTENCE_ENDINGS)
+        words.append(word)
+        word_indices.append(index)
+
+    # Ensure transcript ends with punctuation
+    if words and not capitalize_next:
+        words[-1] += '.'
+
+    return ' '.join(words), word_indices
+
 # ADDED: New helper function for transcript post-processing
 def post_process_transcript(transcript):
     """
@@ -471,33 +501,7 @@ def post_process_transcript(transcript):
     Returns:
         str: Improved transcript
     """
-    # Remove extra spaces
-    cleaned = ' '.join(transcript.split())
-    
-    # Remove repeated words (common in speech-to-text output)
-    words = cleaned.split()
-    deduped_words = []
-    for i, word in enumerate(words):
-        if i == 0 or word.lower() != words[i-1].lower():
-            deduped_words.append(word)
-    
-    cleaned = ' '.join(deduped_words)
-    
-    # Fix capitalization
-    if cleaned and len(cleaned) > 0:
-        # Capitalize first letter
-        cleaned = cleaned[0].upper() + cleaned[1:]
-        
-        # Capitalize after periods, question marks, and exclamation points
-        for i in range(1, len(cleaned)-1):
-            if cleaned[i-1] in ['.', '!', '?'] and cleaned[i] == ' ':
-                cleaned = cleaned[:i+1] + cleaned[i+1].upper() + cleaned[i+2:]
-    
-    # Ensure transcript ends with punctuation
-    if cleaned and not cleaned[-1] in ['.', '!', '?']:
-        cleaned += '.'
-    
-    return cleaned
+    return normalize_transcript(transcript)[0]
 
 def parallel_audio_extraction(video_paths):
     """
@@ -526,43 +530,13 @@ def apply_voice_effect(input_audio_path, effect_type="helium", output_audio_path
         str: Path to modified audio file
     """
 
-     # Determine ffmpeg path based on platform
-    if platform.system() == "Darwin":  # macOS
-        # Try homebrew path first, fallback to others
-        potential_paths = [
-            '/opt/homebrew/Cellar/ffmpeg@6/6.1.2_8/bin/ffmpeg',  
-            '/opt/homebrew/bin/ffmpeg',                          # Common Homebrew location
-            '/usr/local/bin/ffmpeg'                              # Alternative location
-        ]
-        
-        ffmpeg_path = None
-        for path in potential_paths:
-            if os.path.exists(path):
-                ffmpeg_path = path
-                break
-                
-        if not ffmpeg_path:
-            raise RuntimeError("FFmpeg not found. Please install it with 'brew install ffmpeg'")
-    else:
-        # For Windows and others, try multiple paths
-        potential_windows_paths = [
-            r'C:\Users\ooiru\Downloads\ffmpeg-2025-03-31-git-35c091f4b7-full_build\ffmpeg-2025-03-31-git-35c091f4b7-full_build\bin\ffmpeg.exe',
-            r'C:\Users\hongy\Downloads\ffmpeg-n6.1-latest-win64-gpl-6.1\bin\ffmpeg.exe'
-        ]
-        
-        ffmpeg_path = None
-        for path in potential_windows_paths:
-            if os.path.exists(path):
-                ffmpeg_path = path
-                break
-                
-        if not ffmpeg_path:
-            ffmpeg_path = 'ffmpeg'  # Fallback to PATH
+    ffmpeg = get_ffmpeg()
     
     if not input_audio_path or not os.path.exists(input_audio_path):
         raise ValueError(f"Invalid or non-existent input audio path: {input_audio_path}")
 
     # If no output path specified, generate one in the system's temp directory
+    temp_output_path = None
     if output_audio_path is None:
         # Create a temporary file that persists after closing, get its name
         fd, temp_output_path = tempfile.mkstemp(suffix="_modified.wav")
@@ -576,46 +550,13 @@ def apply_voice_effect(input_audio_path, effect_type="helium", output_audio_path
             os.makedirs(output_dir, exist_ok=True)
             logging.info(f"Created output directory: {output_dir}")
 
-    # Define base filter chain for clarity: Loudness normalization, band-pass filter
-    # Adjust frequencies as needed: highpass removes rumble, lowpass removes hiss/high noise
-    # Using EBU R128 standard for loudness normalization
-    clarity_filters = "loudnorm=I=-16:LRA=11:TP=-1.5,highpass=f=100,lowpass=f=7000"
-
     # Define FFmpeg command based on effect type
     command = [
-        ffmpeg_path,
+        ffmpeg.path,
         '-i', input_audio_path,
+        '-af', ffmpeg.voice_effect_filter(effect_type)
     ]
 
-    effect_type_lower = effect_type.lower()
-
-    if effect_type_lower == "disguise_up":
-        # Moderate pitch up (e.g., 15-25% higher pitch = 1.15 to 1.25 factor)
-        pitch_factor = 1.20
-        # Apply pitch shift first, then clarity filters
-        command.extend(['-af', f'rubberband=pitch={pitch_factor},{clarity_filters}'])
-        logging.info(f"Applying 'disguise_up' effect with pitch factor {pitch_factor}")
-    elif effect_type_lower == "disguise_down":
-        # Moderate pitch down (e.g., 15-25% lower pitch = 0.85 to 0.75 factor)
-        pitch_factor = 0.80
-        # Apply pitch shift first, then clarity filters
-        command.extend(['-af', f'rubberband=pitch={pitch_factor},{clarity_filters}'])
-        logging.info(f"Applying 'disguise_down' effect with pitch factor {pitch_factor}")
-    elif effect_type_lower == "helium":
-        # Original Helium effect (higher pitch shift)
-        pitch_factor = 1.5 # Example value for helium, adjust if needed
-        command.extend(['-af', f'rubberband=pitch={pitch_factor},{clarity_filters}'])
-        logging.info(f"Applying 'helium' effect with pitch factor {pitch_factor}")
-    else:
-        # No effect or unrecognized effect type, just copy (or apply clarity only)
-        # Option 1: Just copy
-        # command.extend(['-c', 'copy'])
-        # Option 2: Apply clarity filters without pitch shift
-        command.extend(['-af', clarity_filters])
-        logging.info(f"Effect type '{effect_type}' not recognized or 'none'. Applying only clarity filters.")
-        # If you truly want *no* changes for 'none', uncomment the '-c copy' line
-        # and comment out the '-af clarity_filters' line above.
-
     # Common output settings for consistency and clarity
     command.extend([
         '-ar', '16000',  # Standard sample rate for speech processing
@@ -672,27 +613,46 @@ def apply_voice_effect(input_audio_path, effect_type="helium", output_audio_path
                  logging.error(f"Error removing temporary file {temp_output_path}: {rm_err}")
         raise # Re-raise the original exception
 
-def score_response(transcript, audio_url, question_text):
+def score_response(transcript, audio_url=None, question_text=None, audio_path=None, audio_samples=None, sample_rate=None,
+                   word_timings=None):
     """
     Score an interview response based on the provided inputs
     
     Args:
         transcript (str): The transcribed text of the response
-        audio_url (str): URL to the audio file
+        audio_url (str, optional): URL to the audio file, only used when no local audio is given
         question_text (str): The interview question text
+        audio_path (str, optional): Local WAV file of the response
+        audio_samples (numpy.ndarray, optional): Mono PCM samples of the response
+        sample_rate (int, optional): Sample rate of audio_samples
+        word_timings (list, optional): Word timings from transcription, used for the speech rate
         
     Returns:
         dict: Scores for relevance, confidence, clarity, and engagement
     """
     try:
-        # Extract audio features from URL
-        audio_features = extract_audio_features(audio_url)
+        # Extract audio features, preferring local audio over downloading it again
+        audio_features = extract_audio_features(
+            audio_url=audio_url,
+            audio_path=audio_path,
+            audio_samples=audio_samples,
+            sample_rate=sample_rate,
+            word_timings=word_timings
+        )
+        
+        # Annotate the transcript once and share the result across all analyzers;
+        # if that fails they fall back to their defaults rather than retrying the call
+        try:
+            annotation = annotate_transcript(transcript)
+        except Exception as e:
+            logging.error(f"Error annotating transcript: {str(e)}")
+            annotation = None
         
         # Calculate individual scores
-        relevance_scores = analyze_relevance(transcript, question_text)
-        confidence_scores = analyze_confidence(transcript, audio_features)
-        clarity_scores = analyze_clarity(transcript, audio_features)
-        engagement_scores = analyze_engagement(transcript, audio_features)
+        relevance_scores = analyze_relevance(transcript, question_text, annotation)
+        confidence_scores = analyze_confidence(transcript, audio_features, annotation)
+        clarity_scores = analyze_clarity(transcript, audio_features, annotation)
+        engagement_scores = analyze_engagement(transcript, audio_features, annotation)
         
         # Calculate total scores based on the table weights
         total_relevance = (relevance_scores['transcript'] * 0.25) + (relevance_scores['audio'] * 0.05)
@@ -717,57 +677,175 @@ def score_response(transcript, audio_url, question_text):
             'overall_score': 0
         }
 
-def extract_audio_features(audio_url):
+# Framing and segmentation settings for compute_audio_features
+AUDIO_FRAME_SECONDS = 0.025
+AUDIO_HOP_SECONDS = 0.010
+SILENCE_THRESHOLD_DB = 35.0  # Frames this far below the loud level count as silence
+SILENCE_FLOOR_DB = -60.0  # Frames quieter than this are always silence
+VOICED_ZCR_THRESHOLD = 0.25
+
+def load_wav_mmap(audio_path):
     """
-    Extract audio features from an audio URL
+    Read a PCM WAV file through a memory map instead of copying it into Python
     
     Args:
-        audio_url (str): URL to the audio file
+        audio_path (str): Path to a WAV file (16-bit PCM or 32-bit float)
         
     Returns:
-        dict: Audio features including SNR, speech rate, etc.
+        tuple: (mono float32 samples in [-1, 1], sample rate)
     """
-    try:
-        # Download audio file to temporary location
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        response = requests.get(audio_url)
-        with open(temp_path, 'wb') as f:
-            f.write(response.content)
-        
-        # Load audio with librosa
-        y, sr = librosa.load(temp_path, sr=None)
-        
-        # Calculate audio features
-        # Speech rate (words per minute) - estimate from duration and transcript length
-        duration = librosa.get_duration(y=y, sr=sr)
-        
-        # Signal-to-noise ratio (SNR)
-        signal_power = np.mean(y**2)
-        noise_sample = y[:int(sr/10)] if len(y) > sr/10 else y  # Use first 100ms as noise sample
-        noise_power = np.mean(noise_sample**2)
-        snr = 10 * np.log10(signal_power / max(noise_power, 1e-10)) if noise_power > 0 else 20.0
-        
-        # Volume consistency (standard deviation of amplitude envelope)
-        envelope = np.abs(librosa.feature.rms(y=y)[0])
-        volume_consistency = 1.0 - min(1.0, np.std(envelope) / np.mean(envelope) if np.mean(envelope) > 0 else 0)
+    with open(audio_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != b'RIFF' or mm[8:12] != b'WAVE':
+            raise ValueError(f"Not a WAV file: {audio_path}")
+        
+        # Walk the RIFF chunks to find the format and the sample data
+        offset = 12
+        audio_format = channels = sample_rate = bits_per_sample = None
+        data_offset = data_size = None
+        while offset + 8 <= len(mm):
+            chunk_id = mm[offset:offset + 4]
+            chunk_size = struct.unpack('<I', mm[offset + 4:offset + 8])[0]
+            if chunk_id == b'fmt ':
+                audio_format, channels, sample_rate = struct.unpack('<HHI', mm[offset + 8:offset + 16])
+                bits_per_sample = struct.unpack('<H', mm[offset + 22:offset + 24])[0]
+            elif chunk_id == b'data':
+                data_offset = offset + 8
+                # ffmpeg writes a placeholder size when streaming; trust the file length instead
+                data_size = min(chunk_size, len(mm) - data_offset)
+                break
+            offset += 8 + chunk_size + (chunk_size & 1)
+        
+        if data_offset is None or audio_format is None:
+            raise ValueError(f"WAV file has no fmt/data chunk: {audio_path}")
+        if audio_format == 1 and bits_per_sample == 16:
+            dtype, scale = np.int16, 1.0 / 32768.0
+        elif audio_format == 3 and bits_per_sample == 32:
+            dtype, scale = np.float32, 1.0
+        else:
+            raise ValueError(f"Unsupported WAV encoding (format {audio_format}, {bits_per_sample} bits)")
+        
+        # View the samples in place, then downmix/scale into the one float32 array we keep
+        frame_count = data_size // (np.dtype(dtype).itemsize * channels)
+        view = np.frombuffer(mm, dtype=dtype, count=frame_count * channels, offset=data_offset)
+        frames = view.reshape(-1, channels)
+        y = (frames.mean(axis=1) if channels > 1 else frames[:, 0]).astype(np.float32) * np.float32(scale)
+        # Release the view so the map can close (and the temp file can be deleted on Windows)
+        del view, frames
+    
+    return y, sample_rate
+
+def compute_audio_features(y, sr, word_timings=None):
+    """
+    Compute scoring features from mono audio samples in one pass over strided frames
+    
+    Args:
+        y (numpy.ndarray): Mono float samples
+        sr (int): Sample rate
+        word_timings (list, optional): Word timings from transcription, used for the speech rate
         
-        # Pause ratio (estimated from zero crossings)
-        zero_crossings = librosa.feature.zero_crossing_rate(y)[0]
-        pause_ratio = 1.0 - np.mean(zero_crossings)
+    Returns:
+        dict: Audio features including SNR, speech rate, etc.
+    """
+    y = np.ascontiguousarray(y, dtype=np.float32)
+    duration = len(y) / sr if sr else 0.0
+    
+    frame_length = max(1, int(sr * AUDIO_FRAME_SECONDS))
+    hop_length = max(1, int(sr * AUDIO_HOP_SECONDS))
+    if len(y) < frame_length:
+        y = np.pad(y, (0, frame_length - len(y)))
+    
+    # Overlapping frames as a strided view of the signal (no copy)
+    frames = np.lib.stride_tricks.sliding_window_view(y, frame_length)[::hop_length]
+    frame_starts = np.arange(len(frames)) * hop_length
+    
+    # Energy per frame
+    power = np.einsum('ij,ij->i', frames, frames) / frame_length
+    rms = np.sqrt(power)
+    
+    # Zero-crossing rate per frame from one cumulative count over the whole signal
+    crossings = np.concatenate(([0], np.cumsum(np.signbit(y[1:]) != np.signbit(y[:-1]))))
+    zcr = (crossings[frame_starts + frame_length - 1] - crossings[frame_starts]) / frame_length
+    
+    # Silence: frames far below the loud (speech) level or below an absolute floor
+    power_db = 10 * np.log10(np.maximum(power, 1e-12))
+    reference_db = np.percentile(power_db, 95)
+    silent = (power_db < reference_db - SILENCE_THRESHOLD_DB) | (power_db < SILENCE_FLOOR_DB)
+    speech = ~silent
+    # Voiced speech has low ZCR; unvoiced speech (fricatives) has high ZCR
+    voiced = speech & (zcr < VOICED_ZCR_THRESHOLD)
+    
+    # Signal-to-noise ratio: speech power against silence (or the quietest frames)
+    noise_power = np.mean(power[silent]) if silent.any() else np.percentile(power, 10)
+    signal_power = np.mean(power[speech]) if speech.any() else np.mean(power)
+    snr = 10 * np.log10(signal_power / max(noise_power, 1e-10)) if signal_power > 0 else 20.0
+    
+    # Volume consistency over frames that contain speech
+    speech_rms = rms[voiced] if voiced.any() else rms
+    mean_rms = np.mean(speech_rms)
+    volume_consistency = 1.0 - min(1.0, np.std(speech_rms) / mean_rms if mean_rms > 0 else 0)
+    
+    # Pause ratio: silent frames between the first and last speech frame
+    speech_indices = np.flatnonzero(speech)
+    if len(speech_indices):
+        pause_ratio = float(np.mean(silent[speech_indices[0]:speech_indices[-1] + 1]))
+    else:
+        pause_ratio = 1.0
+    
+    # Speech rate in words per minute over the span actually spoken
+    speech_rate = 150  # Default estimate when there are no word timings
+    if word_timings:
+        span = word_timings[-1].get('endTime', 0) - word_timings[0].get('startTime', 0)
+        if span > 0:
+            speech_rate = len(word_timings) / span * 60.0
+    
+    return {
+        'duration': float(duration),
+        'snr': float(snr),
+        'volume_consistency': float(volume_consistency),
+        'pause_ratio': pause_ratio,
+        'speech_rate': float(speech_rate)
+    }
+
+def extract_audio_features(audio_url=None, audio_path=None, audio_samples=None, sample_rate=None, word_timings=None):
+    """
+    Extract audio features from in-memory samples, a local WAV file, or (legacy) an audio URL
+    
+    Args:
+        audio_url (str, optional): URL to the audio file, downloaded only if no local audio is given
+        audio_path (str, optional): Path to a local WAV file, read through a memory map
+        audio_samples (numpy.ndarray, optional): Mono PCM samples already in memory
+        sample_rate (int, optional): Sample rate of audio_samples
+        word_timings (list, optional): Word timings from transcription, used for the speech rate
         
-        # Clean up temporary file
-        os.unlink(temp_path)
+    Returns:
+        dict: Audio features including SNR, speech rate, etc.
+    """
+    temp_path = None
+    try:
+        if audio_samples is not None:
+            y, sr = np.asarray(audio_samples, dtype=np.float32), sample_rate
+        elif audio_path:
+            try:
+                y, sr = load_wav_mmap(audio_path)
+            except ValueError as e:
+                logging.warning(f"Falling back to librosa for {audio_path}: {str(e)}")
+                import librosa
+                y, sr = librosa.load(audio_path, sr=None)
+        else:
+            # Download audio file to temporary location
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+            temp_path = temp_file.name
+            temp_file.close()
+            
+            response = requests.get(audio_url)
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            
+            # Load audio with librosa
+            import librosa
+            y, sr = librosa.load(temp_path, sr=None)
         
-        return {
-            'duration': duration,
-            'snr': snr,
-            'volume_consistency': volume_consistency,
-            'pause_ratio': pause_ratio,
-            'speech_rate': 150  # Default estimate, will be updated with transcript
-        }
+        return compute_audio_features(y, sr, word_timings)
     except Exception as e:
         logging.error(f"Error extracting audio features: {str(e)}")
         return {
@@ -777,28 +855,28 @@ def extract_audio_features(audio_url):
             'pause_ratio': 0.2,
             'speech_rate': 150
         }
+    finally:
+        # Clean up temporary file
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
 
-def analyze_relevance(transcript, question):
+def analyze_relevance(transcript, question, annotation=None):
     """
     Analyze the relevance of the transcript to the question
     Args:
     transcript (str): The transcription text
     question (str): The question text
+    annotation (TranscriptAnnotation): Shared transcript annotation; defaults are returned without it
     Returns:
     dict: Relevance scores for transcript and audio
     """
     try:
-        # Create document objects for Google NLP
-        transcript_doc = language_v1.Document(content=transcript, type_=language_v1.Document.Type.PLAIN_TEXT)
-        question_doc = language_v1.Document(content=question, type_=language_v1.Document.Type.PLAIN_TEXT)
-        
-        # Analyze entities and keywords
-        transcript_entities = nlp_client.analyze_entities(document=transcript_doc).entities
-        question_entities = nlp_client.analyze_entities(document=question_doc).entities
+        if annotation is None:
+            raise ValueError("Transcript annotation unavailable")
+        question_keywords, question_sentiment_score = annotate_question(question)
         
         # Extract keywords
-        transcript_keywords = {entity.name.lower() for entity in transcript_entities}
-        question_keywords = {entity.name.lower() for entity in question_entities}
+        transcript_keywords = {entity.name.lower() for entity in annotation.entities}
         
         # Calculate keyword overlap with bonus
         keyword_overlap = len(transcript_keywords.intersection(question_keywords))
@@ -806,16 +884,15 @@ def analyze_relevance(transcript, question):
         keyword_score = min(1.0, (keyword_overlap + 0.5) / max(len(question_keywords), 1))
         
         # Calculate semantic similarity using sentence embeddings
-        transcript_embedding = get_embedding(transcript)
-        question_embedding = get_embedding(question)
-        semantic_similarity = cosine_similarity(transcript_embedding, question_embedding)[0][0]
+        # The question embedding is cached since every candidate answers the same questions
+        transcript_embedding = embedding_service.embed([transcript])
+        question_embedding = embedding_service.embed_cached([question])
+        semantic_similarity = embedding_service.cosine_similarity(transcript_embedding, question_embedding)[0]
         # Increase the baseline for semantic similarity
         semantic_score = max(0.3, (semantic_similarity + 1) / 2)  # Scale from [-1,1] to [0.3,1]
         
         # Analyze sentiment alignment with greater tolerance
-        transcript_sentiment = nlp_client.analyze_sentiment(document=transcript_doc).document_sentiment
-        question_sentiment = nlp_client.analyze_sentiment(document=question_doc).document_sentiment
-        sentiment_alignment = max(0.3, 1.0 - abs(transcript_sentiment.score - question_sentiment.score) / 2)
+        sentiment_alignment = max(0.3, 1.0 - abs(annotation.sentiment.score - question_sentiment_score) / 2)
         
         # Combine scores with higher baseline for transcript relevance
         transcript_relevance = 0.7 * semantic_score + 0.2 * keyword_score + 0.1 * sentiment_alignment
@@ -832,25 +909,22 @@ def analyze_relevance(transcript, question):
         return {'transcript': 0.6, 'audio': 0.5}  # Higher default values
 
 
-def analyze_confidence(transcript, audio_features):
+def analyze_confidence(transcript, audio_features, annotation=None):
     """
     Analyze confidence based on transcript and audio features
     Args:
     transcript (str): The transcription text
     audio_features (dict): Audio features extracted from the audio file
+    annotation (TranscriptAnnotation): Shared transcript annotation; defaults are returned without it
     Returns:
     dict: Confidence scores for transcript and audio
     """
     try:
-        # Create document object for Google NLP
-        doc = language_v1.Document(content=transcript, type_=language_v1.Document.Type.PLAIN_TEXT)
+        if annotation is None:
+            raise ValueError("Transcript annotation unavailable")
         
-        # Analyze sentiment for confidence indicators
-        sentiment = nlp_client.analyze_sentiment(document=doc).document_sentiment
-        sentiment_magnitude = sentiment.magnitude
-        
-        # Analyze syntax for confidence indicators (use of active voice, assertive statements)
-        syntax_analysis = nlp_client.analyze_syntax(document=doc)
+        # Sentiment for confidence indicators
+        sentiment_magnitude = annotation.sentiment.magnitude
         
         # Count assertive words, first-person pronouns, hedging phrases
         assertive_count = 0
@@ -864,7 +938,7 @@ def analyze_confidence(transcript, audio_features):
         for phrase in hedging_phrases:
             hedging_count += lowercase_transcript.count(phrase)
             
-        for token in syntax_analysis.tokens:
+        for token in annotation.tokens:
             # Check for first person pronouns
             if token.part_of_speech.case == language_v1.PartOfSpeech.Case.NOMINATIVE and \
                token.lemma.lower() in ['i', 'we']:
@@ -907,24 +981,22 @@ def analyze_confidence(transcript, audio_features):
         return {'transcript': 0.6, 'audio': 0.6}  # Higher default values
 
 
-def analyze_clarity(transcript, audio_features):
+def analyze_clarity(transcript, audio_features, annotation=None):
     """
     Analyze clarity based on transcript and audio features
     Args:
     transcript (str): The transcription text
     audio_features (dict): Audio features extracted from the audio file
+    annotation (TranscriptAnnotation): Shared transcript annotation; defaults are returned without it
     Returns:
     dict: Clarity scores for transcript and audio
     """
     try:
-        # Create document object for Google NLP
-        doc = language_v1.Document(content=transcript, type_=language_v1.Document.Type.PLAIN_TEXT)
-        
-        # Analyze syntax for clarity indicators
-        syntax_analysis = nlp_client.analyze_syntax(document=doc)
+        if annotation is None:
+            raise ValueError("Transcript annotation unavailable")
         
         # Calculate sentence complexity with wider acceptable range
-        sentences = [sentence.text.content for sentence in syntax_analysis.sentences]
+        sentences = [sentence.text.content for sentence in annotation.sentences]
         avg_sentence_length = sum(len(sentence.split()) for sentence in sentences) / max(len(sentences), 1)
         
         # More tolerant sentence length factor (accepting 8-25 words as good)
@@ -933,7 +1005,7 @@ def analyze_clarity(transcript, audio_features):
         sentence_length_factor = max(0.5, 1.0 - abs(avg_sentence_length - optimal_length) / tolerance)
         
         # Check for repeated words/phrases indicating confusion
-        words = [token.text.content.lower() for token in syntax_analysis.tokens
+        words = [token.text.content.lower() for token in annotation.tokens
                 if token.part_of_speech.tag != language_v1.PartOfSpeech.Tag.PUNCT]
         
         # Count filler words but with reduced penalty
@@ -946,8 +1018,9 @@ def analyze_clarity(transcript, audio_features):
         filler_ratio = min(0.4, filler_count / max(len(words), 1))  # Cap the penalty
         
         # Calculate coherence using classification with bonus
-        classification = nlp_client.classify_text(document=doc)
-        category_count = len(classification.categories) if hasattr(classification, 'categories') else 0
+        if annotation.categories is None:
+            raise ValueError("Transcript could not be classified")
+        category_count = len(annotation.categories)
         topic_focus = min(1.0, max(0.5, 1.2 / max(category_count, 1)))  # Bonus for focus
         
         # Calculate transcript clarity score with minimum threshold
@@ -978,22 +1051,22 @@ def analyze_clarity(transcript, audio_features):
         return {'transcript': 0.6, 'audio': 0.6}  # Higher default values
 
 
-def analyze_engagement(transcript, audio_features):
+def analyze_engagement(transcript, audio_features, annotation=None):
     """
     Analyze engagement based on transcript and audio features
     Args:
     transcript (str): The transcription text
     audio_features (dict): Audio features extracted from the audio file
+    annotation (TranscriptAnnotation): Shared transcript annotation; defaults are returned without it
     Returns:
     dict: Engagement scores for transcript and audio
     """
     try:
-        # Create document object for Google NLP
-        doc = language_v1.Document(content=transcript, type_=language_v1.Document.Type.PLAIN_TEXT)
+        if annotation is None:
+            raise ValueError("Transcript annotation unavailable")
         
-        # Analyze sentiment for engagement indicators
-        sentiment = nlp_client.analyze_sentiment(document=doc).document_sentiment
-        sentiment_magnitude = sentiment.magnitude  # Higher magnitude = more emotional engagement
+        # Sentiment for engagement indicators
+        sentiment_magnitude = annotation.sentiment.magnitude  # Higher magnitude = more emotional engagement
         
         # Give partial credit for transcript despite scoring table
         transcript_engagement = min(1.0, sentiment_magnitude + 0.3)  # Bonus for any emotion
@@ -1039,7 +1112,4 @@ def get_embedding(text):
     Returns:
         numpy.ndarray: Embedding vector
     """
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    return outputs.last_hidden_state.mean(dim=1).numpy()
\ No newline at end of file
+    return embedding_service.embed([text])
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 import uuid
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from firebase_admin import firestore
 from core.firebase import firebase_client
 from models.job import JobCreate, JobResponse, JobUpdate
 from models.candidate import CandidateCreate, Application
@@ -116,11 +117,8 @@ class JobService:
                 logger.error(f"Failed to create application {application_id}")
                 return None
             
-            # Increment application count for the job
-            job = firebase_client.get_document('jobs', job_id)
-            if job:
-                current_count = job.get('applicationCount', 0)
-                firebase_client.update_document('jobs', job_id, {'applicationCount': current_count + 1})
+            # Atomically increment application count for the job so concurrent uploads don't lose counts
+            firebase_client.update_document('jobs', job_id, {'applicationCount': firestore.Increment(1)})
             
             return application_id
         except Exception as e:
@@ -134,12 +132,16 @@ class JobService:
             # Get applications for job
             applications = firebase_client.get_collection('applications', [('jobId', '==', job_id)])
             
+            # Fetch all candidates in batched reads instead of one round trip per application
+            candidate_ids = [app.get('candidateId') for app in applications if app.get('candidateId')]
+            candidates = firebase_client.get_documents('candidates', candidate_ids)
+
             # Enrich with candidate information
             results = []
             for app in applications:
                 candidate_id = app.get('candidateId')
                 if candidate_id:
-                    candidate = firebase_client.get_document('candidates', candidate_id)
+                    candidate = candidates.get(candidate_id)
                     if candidate:
                         # Add candidate info to application
                         app_with_candidate = {
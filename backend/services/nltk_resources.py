@@ -0,0 +1,45 @@
+import logging
+from typing import FrozenSet, List, Optional
+from services.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+# NLTK data packages and where nltk.data.find looks for them (punkt_tab is needed by NLTK 3.8.2+)
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab'
+}
+
+
+def _bootstrap_nltk() -> FrozenSet[str]:
+    """Check NLTK data once, downloading only what is missing. Returns the available packages."""
+    import nltk
+    available = set()
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            logger.info(f"Downloading NLTK resource {name}")
+            if not nltk.download(name, quiet=True):
+                logger.warning(f"NLTK resource {name} could not be downloaded")
+                continue
+        available.add(name)
+    return frozenset(available)
+
+service_registry.register("nltk_data", _bootstrap_nltk)
+
+
+def count_words(transcript: Optional[str], word_timing_indices: Optional[List[int]] = None) -> int:
+    """Count the words of a transcript.
+
+    Uses the word-timing mapping from transcription when there is one, which
+    already holds one entry per word; tokenizes with NLTK only as a fallback.
+    """
+    if word_timing_indices:
+        return len(word_timing_indices)
+    if not transcript:
+        return 0
+
+    from nltk.tokenize import word_tokenize
+    service_registry.get("nltk_data")
+    return len(word_tokenize(transcript))
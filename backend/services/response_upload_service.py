@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from typing import AsyncIterator, Dict, Any, Optional
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on one interview video, so an upload cannot fill the disk
+INTERVIEW_UPLOAD_MAX_BYTES = int(os.getenv("INTERVIEW_UPLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+# Chunk size suggested to clients; each request body is streamed to disk, never held whole
+INTERVIEW_UPLOAD_CHUNK_SIZE = int(os.getenv("INTERVIEW_UPLOAD_CHUNK_SIZE", str(4 * 1024 * 1024)))
+# Unfinished uploads older than this are discarded
+INTERVIEW_UPLOAD_TTL_SECONDS = int(os.getenv("INTERVIEW_UPLOAD_TTL_SECONDS", "3600"))
+
+
+class UploadOffsetMismatch(Exception):
+    """A chunk was sent for an offset other than the current end of the upload."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadNotFound(Exception):
+    """The upload does not exist, has expired or has already been completed."""
+
+
+class ResponseUploadStore:
+    """Resumable, chunked uploads of interview videos to local temp files.
+
+    Each chunk is appended at an explicit offset, so an interrupted client can
+    ask for the current offset and continue from there. Request bodies are
+    streamed to disk piece by piece, keeping memory per request bounded.
+
+    Sessions and their temp files live in this process, so every request of an
+    upload must reach the same worker: run a single worker, or route uploads
+    to one worker with sticky sessions.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+
+    def create(self, application_id: str, interview_id: str, question_id: str, question: str) -> Dict[str, Any]:
+        """Start an upload session and return it."""
+        self._discard_expired()
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".webm")
+        temp_file.close()
+        upload_id = str(uuid.uuid4())
+        session = {
+            'uploadId': upload_id,
+            'applicationId': application_id,
+            'interviewId': interview_id,
+            'questionId': question_id,
+            'question': question,
+            'path': temp_file.name,
+            'offset': 0,
+            'createdAt': time.time(),
+            'lock': asyncio.Lock()
+        }
+        self._sessions[upload_id] = session
+        logger.info(f"Started upload {upload_id} for application {application_id}, question {question_id}")
+        return session
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        return self._sessions.get(upload_id)
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """Stream a chunk onto the end of an upload and return the new offset."""
+        session = self._sessions.get(upload_id)
+        if session is None:
+            raise UploadNotFound(upload_id)
+        async with session['lock']:
+            # The session may have been completed or expired while we waited for the lock
+            if self._sessions.get(upload_id) is not session:
+                raise UploadNotFound(upload_id)
+            if offset != session['offset']:
+                raise UploadOffsetMismatch(session['offset'])
+
+            async with aiofiles.open(session['path'], 'r+b') as f:
+                await f.seek(offset)
+                async for piece in chunks:
+                    if session['offset'] + len(piece) > INTERVIEW_UPLOAD_MAX_BYTES:
+                        raise ValueError(f"Upload exceeds {INTERVIEW_UPLOAD_MAX_BYTES} bytes")
+                    await f.write(piece)
+                    # Advance as data lands so a broken connection resumes from what was written
+                    session['offset'] += len(piece)
+                await f.flush()
+            return session['offset']
+
+    async def pop(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session once no chunk is being written; the caller takes ownership of its file."""
+        session = self._sessions.get(upload_id)
+        if session is None:
+            return None
+        async with session['lock']:
+            return self._sessions.pop(upload_id, None)
+
+    def _discard_expired(self) -> None:
+        cutoff = time.time() - INTERVIEW_UPLOAD_TTL_SECONDS
+        # Sessions with a chunk being written are left for the next sweep
+        for upload_id in [key for key, session in self._sessions.items()
+                          if session['createdAt'] < cutoff and not session['lock'].locked()]:
+            session = self._sessions.pop(upload_id)
+            if os.path.exists(session['path']):
+                os.unlink(session['path'])
+            logger.info(f"Discarded expired upload {upload_id}")
+
+
+# Create a singleton instance
+response_upload_store = ResponseUploadStore()
@@ -0,0 +1,113 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from core.firebase import firebase_client
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_COLLECTION = 'scoreCache'
+SCORE_CACHE_TTL_SECONDS = int(os.getenv("SCORE_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "2000"))
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """Content-addressed cache of applicant scores.
+
+    Entries are kept in an in-memory LRU and persisted to Firestore so that
+    re-ranking the same pool with the same criteria skips Gemini entirely.
+    The key covers the job description, so editing a job needs no explicit
+    invalidation: its new scores get new keys and the old entries expire.
+    """
+
+    def __init__(self, ttl_seconds: int = SCORE_CACHE_TTL_SECONDS, max_entries: int = SCORE_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(extracted_text: Dict[str, Any], job_description: str, criteria: str,
+                 model_name: str, prompt_version: str) -> str:
+        """Build the cache key from everything that influences a score."""
+        payload = json.dumps({
+            'extractedText': extracted_text,
+            'jobDescriptionHash': hash_text(job_description or ""),
+            'criteria': criteria,
+            'model': model_name,
+            'promptVersion': prompt_version
+        }, sort_keys=True, default=str)
+        return hash_text(payload)
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get('cachedAt', 0) > self.ttl_seconds
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry in the in-memory LRU, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached score for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_expired(entry):
+                    del self._entries[key]
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = firebase_client.get_document(SCORE_CACHE_COLLECTION, key)
+            if entry is not None and self._is_expired(entry):
+                firebase_client.delete_document(SCORE_CACHE_COLLECTION, key)
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(entry['result'])
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache a score result in memory and in Firestore."""
+        entry = {
+            'result': copy.deepcopy(result),
+            'cachedAt': time.time()
+        }
+        self._remember(key, entry)
+        firebase_client.create_document(SCORE_CACHE_COLLECTION, key, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the in-memory size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / total if total else 0.0,
+                'entries': len(self._entries)
+            }
+
+
+# Create a singleton instance
+score_cache = ScoreCache()
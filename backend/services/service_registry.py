@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Process-wide, lazily constructed service instances.
+
+    Each service is built on first use and then shared by every request and
+    thread, so expensive setup (API configuration, model objects, database
+    clients) happens once per process instead of once per request.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._closers = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+        self._constructions = {}
+        self._reuses = {}
+        self._construct_seconds = {}
+
+    def register(self, name: str, factory: Callable[[], Any], closer: Optional[Callable[[Any], None]] = None) -> None:
+        """Register how to build (and optionally close) a named service."""
+        with self._lock:
+            self._factories[name] = factory
+            if closer:
+                self._closers[name] = closer
+            self._constructions.setdefault(name, 0)
+            self._reuses.setdefault(name, 0)
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance of a service, constructing it on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            with self._lock:
+                self._reuses[name] += 1
+            return instance
+
+        with self._lock:
+            factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(f"Service {name} is not registered")
+            # One lock per service so a slow model load doesn't block other services
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        with build_lock:
+            # Another thread may have built it while we waited for the lock
+            instance = self._instances.get(name)
+            if instance is not None:
+                with self._lock:
+                    self._reuses[name] += 1
+                return instance
+
+            logger.info(f"Constructing shared service {name}")
+            start = time.perf_counter()
+            instance = factory()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._instances[name] = instance
+                self._constructions[name] += 1
+                self._construct_seconds[name] = elapsed
+            logger.info(f"Constructed shared service {name} in {elapsed:.2f}s")
+            return instance
+
+    def warm_up(self, names: List[str]) -> None:
+        """Construct services ahead of their first request, logging any that fail."""
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"Warm-up of service {name} failed: {e}")
+
+    def shutdown(self) -> None:
+        """Close and drop every constructed service; they are rebuilt if used again."""
+        with self._lock:
+            instances = self._instances
+            self._instances = {}
+
+        for name, instance in instances.items():
+            closer = self._closers.get(name)
+            if not closer:
+                continue
+            try:
+                closer(instance)
+                logger.info(f"Closed shared service {name}")
+            except Exception as e:
+                logger.warning(f"Error closing service {name}: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return construction and reuse counts per service."""
+        with self._lock:
+            return {
+                name: {
+                    'constructed': self._constructions[name],
+                    'reuses': self._reuses[name],
+                    'active': name in self._instances,
+                    'constructSeconds': self._construct_seconds.get(name)
+                }
+                for name in self._factories
+            }
+
+
+# Create a singleton instance
+service_registry = ServiceRegistry()
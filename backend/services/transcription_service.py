@@ -0,0 +1,306 @@
+import hashlib
+import logging
+import os
+import random
+import struct
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from google.cloud import speech
+from services.service_registry import service_registry
+
+logger = logging.getLogger(__name__)
+
+# Synchronous recognize accepts up to a minute of inline audio
+TRANSCRIBE_SYNC_MAX_SECONDS = float(os.getenv("TRANSCRIBE_SYNC_MAX_SECONDS", "55"))
+# A streaming session is limited to about five minutes; longer clips use a long-running job
+TRANSCRIBE_STREAMING_MAX_SECONDS = float(os.getenv("TRANSCRIBE_STREAMING_MAX_SECONDS", "290"))
+# Bytes of PCM per streaming request (0.5 s of 16 kHz 16-bit mono); requests are capped at 25 KB
+TRANSCRIBE_STREAMING_CHUNK_BYTES = int(os.getenv("TRANSCRIBE_STREAMING_CHUNK_BYTES", "16000"))
+TRANSCRIBE_TIMEOUT_SECONDS = float(os.getenv("TRANSCRIBE_TIMEOUT_SECONDS", "180"))
+# "google" for Speech-to-Text, "local" for the offline stand-in used in load tests and CI
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "google")
+# Concurrent requests when transcribing a batch of clips
+TRANSCRIBE_BATCH_WORKERS = int(os.getenv("TRANSCRIBE_BATCH_WORKERS", "4"))
+LOCAL_TRANSCRIBER_WORDS_PER_SECOND = 2.5
+
+MODE_SYNC = 'sync'
+MODE_STREAMING = 'streaming'
+MODE_LONG_RUNNING = 'long_running'
+
+# Domain-specific phrases boosted for better recognition
+INTERVIEW_PHRASES = [
+    "interview", "job", "experience", "skills", "role", "position",
+    "team", "project", "management", "development", "challenges",
+    "achievements", "responsibilities", "education", "degree",
+    "certificate", "training", "leadership", "communication",
+    "problem-solving", "technical", "professional", "background",
+    "opportunity", "career", "goals", "objectives", "salary",
+    "work", "employment", "remote", "hybrid", "flexible"
+]
+
+RECOGNITION_CONFIG = speech.RecognitionConfig(
+    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    sample_rate_hertz=16000,  # Match the extraction sample rate
+    language_code='en-US',
+    enable_automatic_punctuation=True,
+    model='video',  # Video model is better for recorded speech
+    use_enhanced=True,
+    profanity_filter=False,
+    speech_contexts=[
+        speech.SpeechContext(
+            phrases=INTERVIEW_PHRASES,
+            boost=15.0  # Boost recognition of these phrases
+        )
+    ],
+    # Word-level timestamps and confidence
+    enable_word_time_offsets=True,
+    enable_word_confidence=True,
+    max_alternatives=2
+)
+
+service_registry.register("speech_client", speech.SpeechClient,
+                          closer=lambda client: client.transport.close())
+
+
+def get_speech_client() -> speech.SpeechClient:
+    """Return the shared Speech-to-Text client."""
+    return service_registry.get("speech_client")
+
+
+def wav_data_layout(audio_path: str) -> Tuple[int, int, int]:
+    """Find the PCM samples of a WAV file by walking its RIFF chunks.
+
+    ffmpeg writes LIST and other chunks before the samples, so the header is not
+    always 44 bytes. Returns (data offset, data size in bytes, bytes per second).
+    """
+    file_size = os.path.getsize(audio_path)
+    with open(audio_path, 'rb') as audio_file:
+        header = audio_file.read(12)
+        if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError(f"Not a WAV file: {audio_path}")
+
+        bytes_per_second = None
+        while True:
+            chunk_header = audio_file.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"WAV file has no fmt/data chunk: {audio_path}")
+            chunk_id, chunk_size = chunk_header[:4], struct.unpack('<I', chunk_header[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = audio_file.read(chunk_size)
+                bytes_per_second = struct.unpack('<I', fmt[8:12])[0]  # Byte rate field
+                audio_file.seek(chunk_size & 1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if not bytes_per_second:
+                    raise ValueError(f"WAV file has no fmt chunk before its data: {audio_path}")
+                data_offset = audio_file.tell()
+                # ffmpeg may leave a placeholder data size, so never read past the end of the file
+                return data_offset, min(chunk_size, file_size - data_offset), bytes_per_second
+            else:
+                audio_file.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def wav_duration_seconds(audio_path: str) -> float:
+    """Duration of a PCM WAV file, from its format and the size of its sample data."""
+    _, data_size, bytes_per_second = wav_data_layout(audio_path)
+    return data_size / bytes_per_second
+
+
+def read_wav_pcm(audio_path: str, chunk_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the raw PCM samples of a WAV file, without its header, in chunks of at most chunk_bytes."""
+    data_offset, data_size, _ = wav_data_layout(audio_path)
+    with open(audio_path, 'rb') as audio_file:
+        audio_file.seek(data_offset)
+        remaining = data_size
+        while remaining > 0:
+            chunk = audio_file.read(min(chunk_bytes or remaining, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class Transcriber(ABC):
+    """Turns a 16 kHz mono WAV into a transcript with word timings.
+
+    transcribe returns a dict with transcript, confidence, word_count,
+    word_timings ({word, startTime, endTime, confidence, index}) and raw_results.
+    """
+
+    batch_workers = 1
+
+    @abstractmethod
+    def transcribe(self, audio_path: Optional[str] = None, gcs_uri: Optional[str] = None) -> Dict[str, Any]:
+        """Transcribe one clip, from the local file or its storage copy."""
+
+    def needs_storage_copy(self, audio_path: str) -> bool:
+        """Whether transcribing this local clip requires its gcs_uri."""
+        return False
+
+    def transcribe_batch(self, clips: List[Dict[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """Transcribe many clips, each given as {'audio_path': ..., 'gcs_uri': ...}, in input order."""
+        if self.batch_workers <= 1 or len(clips) <= 1:
+            return [self.transcribe(**clip) for clip in clips]
+        with ThreadPoolExecutor(max_workers=min(self.batch_workers, len(clips))) as executor:
+            return list(executor.map(lambda clip: self.transcribe(**clip), clips))
+
+
+class SpeechTranscriber(Transcriber):
+    """Google Speech-to-Text with the recognition mode chosen by clip duration.
+
+    Short answers are sent inline to synchronous recognize, medium ones are
+    streamed from the local file, and only answers too long for a streaming
+    session go through a long-running job on the uploaded copy in storage.
+    """
+
+    batch_workers = TRANSCRIBE_BATCH_WORKERS
+
+    def choose_mode(self, duration: float) -> str:
+        if duration <= TRANSCRIBE_SYNC_MAX_SECONDS:
+            return MODE_SYNC
+        if duration <= TRANSCRIBE_STREAMING_MAX_SECONDS:
+            return MODE_STREAMING
+        return MODE_LONG_RUNNING
+
+    def needs_storage_copy(self, audio_path: str) -> bool:
+        return self.choose_mode(wav_duration_seconds(audio_path)) == MODE_LONG_RUNNING
+
+    def transcribe(self, audio_path: Optional[str] = None, gcs_uri: Optional[str] = None) -> Dict[str, Any]:
+        """Transcribe a 16 kHz mono WAV, preferring the local file over the storage copy."""
+        if audio_path and os.path.exists(audio_path):
+            duration = wav_duration_seconds(audio_path)
+            mode = self.choose_mode(duration)
+            if mode == MODE_LONG_RUNNING and not gcs_uri:
+                raise ValueError(f"Audio is {duration:.0f}s long; a GCS URI is required for long-running recognition")
+        elif gcs_uri:
+            duration = None
+            mode = MODE_LONG_RUNNING
+        else:
+            raise ValueError("Either audio_path or gcs_uri is required")
+
+        logger.info(f"Transcribing {audio_path or gcs_uri} ({duration}s) with {mode} recognition")
+        if mode == MODE_SYNC:
+            results = self.recognize_sync(audio_path)
+        elif mode == MODE_STREAMING:
+            results = self.recognize_streaming(audio_path)
+        else:
+            results = self.recognize_long_running(gcs_uri)
+
+        transcription = self.parse_results(results)
+        transcription['mode'] = mode
+        return transcription
+
+    def recognize_sync(self, audio_path: str) -> List[Any]:
+        audio = speech.RecognitionAudio(content=b''.join(read_wav_pcm(audio_path)))
+        response = get_speech_client().recognize(config=RECOGNITION_CONFIG, audio=audio, timeout=TRANSCRIBE_TIMEOUT_SECONDS)
+        return list(response.results)
+
+    def recognize_streaming(self, audio_path: str) -> List[Any]:
+        streaming_config = speech.StreamingRecognitionConfig(config=RECOGNITION_CONFIG, interim_results=False)
+        responses = get_speech_client().streaming_recognize(
+            config=streaming_config, requests=self._audio_requests(audio_path), timeout=TRANSCRIBE_TIMEOUT_SECONDS
+        )
+        return [result for response in responses for result in response.results if result.is_final]
+
+    def recognize_long_running(self, gcs_uri: str) -> List[Any]:
+        audio = speech.RecognitionAudio(uri=gcs_uri)
+        operation = get_speech_client().long_running_recognize(config=RECOGNITION_CONFIG, audio=audio)
+        return list(operation.result(timeout=TRANSCRIBE_TIMEOUT_SECONDS).results)
+
+    @staticmethod
+    def _audio_requests(audio_path: str) -> Iterator[speech.StreamingRecognizeRequest]:
+        # Read the samples as they are sent so the whole clip is never held in memory
+        for chunk in read_wav_pcm(audio_path, TRANSCRIBE_STREAMING_CHUNK_BYTES):
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    @staticmethod
+    def parse_results(results: List[Any]) -> Dict[str, Any]:
+        """Join the best alternative of each result and collect word timings."""
+        transcripts = []
+        confidence_scores = []
+        word_count = 0
+        word_timings = []
+        word_index = 0  # Global index to track position in full transcript
+
+        for result in results:
+            if not result.alternatives:
+                continue
+            # Use the highest confidence alternative
+            best_alternative = result.alternatives[0]
+            transcripts.append(best_alternative.transcript)
+            confidence_scores.append(best_alternative.confidence)
+
+            for word_info in best_alternative.words:
+                word_timings.append({
+                    'word': word_info.word,
+                    'startTime': word_info.start_time.total_seconds(),
+                    'endTime': word_info.end_time.total_seconds(),
+                    'confidence': word_info.confidence,
+                    'index': word_index
+                })
+                word_index += 1
+
+            word_count += len(best_alternative.transcript.split())
+
+        return {
+            'transcript': ' '.join(transcripts),
+            'confidence': sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0,
+            'word_count': word_count,
+            'word_timings': word_timings,
+            'raw_results': results
+        }
+
+
+class LocalTranscriber(Transcriber):
+    """Deterministic offline stand-in for Speech-to-Text.
+
+    Produces words at a steady rate over the clip's duration, picked by a hash
+    of the audio, so the same file always yields the same transcript and the
+    submit path can be exercised without network access.
+    """
+
+    def transcribe(self, audio_path: Optional[str] = None, gcs_uri: Optional[str] = None) -> Dict[str, Any]:
+        if not audio_path or not os.path.exists(audio_path):
+            raise ValueError("The local transcriber needs a local audio_path")
+
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as audio_file:
+            for chunk in iter(lambda: audio_file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        rng = random.Random(digest.hexdigest())
+
+        duration = wav_duration_seconds(audio_path)
+        word_seconds = 1.0 / LOCAL_TRANSCRIBER_WORDS_PER_SECOND
+        word_timings = [
+            {
+                'word': rng.choice(INTERVIEW_PHRASES),
+                'startTime': round(index * word_seconds, 3),
+                'endTime': round((index + 0.8) * word_seconds, 3),
+                'confidence': 0.9,
+                'index': index
+            }
+            for index in range(int(duration * LOCAL_TRANSCRIBER_WORDS_PER_SECOND))
+        ]
+
+        return {
+            'transcript': ' '.join(timing['word'] for timing in word_timings),
+            'confidence': 0.9 if word_timings else 0.0,
+            'word_count': len(word_timings),
+            'word_timings': word_timings,
+            'raw_results': None,
+            'mode': 'local'
+        }
+
+
+TRANSCRIBERS = {
+    'google': SpeechTranscriber,
+    'local': LocalTranscriber
+}
+
+if TRANSCRIPTION_BACKEND not in TRANSCRIBERS:
+    raise ValueError(
+        f"Unknown TRANSCRIPTION_BACKEND '{TRANSCRIPTION_BACKEND}'; expected one of: {', '.join(TRANSCRIBERS)}"
+    )
+
+# Create a singleton instance
+transcriber = TRANSCRIBERS[TRANSCRIPTION_BACKEND]()
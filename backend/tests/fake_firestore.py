@@ -0,0 +1,179 @@
+"""A small thread-safe in-memory stand-in for the Firestore client.
+
+It implements the parts the services use: documents with create/get/update/set/delete,
+dotted and quoted field paths (including get(field_paths=...) projections), the Increment and ArrayUnion transforms,
+batched get_all reads and transactions. Like the server SDK, a transaction holds a lock for its whole
+read-modify-write, while plain get() and update() calls are separate
+operations, so code that reads a value and writes it back can lose updates.
+"""
+import copy
+import threading
+import time
+from google.api_core import exceptions as google_exceptions
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.transforms import ArrayUnion, Increment
+from core.firebase import FirebaseClient
+
+
+def _apply(data, updates):
+    for key, value in updates.items():
+        path = FieldPath.from_string(key).parts
+        target = data
+        for part in path[:-1]:
+            target = target.setdefault(part, {})
+        field = path[-1]
+        if isinstance(value, Increment):
+            target[field] = target.get(field, 0) + value.value
+        elif isinstance(value, ArrayUnion):
+            existing = target.setdefault(field, [])
+            existing.extend(item for item in value.values if item not in existing)
+        else:
+            target[field] = copy.deepcopy(value)
+
+
+def _project(data, field_paths):
+    """Keep only the given field paths of a document, as a field mask does."""
+    if data is None or field_paths is None:
+        return data
+    projected = {}
+    for key in field_paths:
+        path = FieldPath.from_string(key).parts
+        source = data
+        for part in path:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = source
+    return projected
+
+
+class FakeSnapshot:
+    def __init__(self, document_id, data):
+        self.id = document_id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+class FakeDocumentReference:
+    def __init__(self, db, key):
+        self._db = db
+        self._key = key
+
+    def get(self, field_paths=None, transaction=None):
+        with self._db.lock:
+            data = copy.deepcopy(_project(self._db.documents.get(self._key), field_paths))
+        # Widen the window between a read and a later write, as a network round trip would
+        self._db.round_trip()
+        return FakeSnapshot(self._key[1], data)
+
+    def create(self, data):
+        with self._db.lock:
+            if self._key in self._db.documents:
+                raise google_exceptions.AlreadyExists(f"Document {self._key} already exists")
+            self._db.documents[self._key] = {}
+            _apply(self._db.documents[self._key], data)
+
+    def set(self, data, merge=False):
+        with self._db.lock:
+            if not merge or self._key not in self._db.documents:
+                self._db.documents[self._key] = {}
+            _apply(self._db.documents[self._key], data)
+
+    def update(self, data):
+        with self._db.lock:
+            if self._key not in self._db.documents:
+                raise google_exceptions.NotFound(f"Document {self._key} not found")
+            _apply(self._db.documents[self._key], data)
+
+    def delete(self):
+        with self._db.lock:
+            self._db.documents.pop(self._key, None)
+
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+
+    def document(self, document_id):
+        return FakeDocumentReference(self._db, (self._name, document_id))
+
+
+class FakeTransaction:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def update(self, reference, data):
+        self._writes.append((reference.update, data, {}))
+
+    @property
+    def written_fields(self):
+        """Every field path this transaction writes."""
+        return [key for _, data, _ in self._writes for key in data]
+
+    def set(self, reference, data, merge=False):
+        self._writes.append((reference.set, data, {'merge': merge}))
+
+
+class FakeFirestore:
+    def __init__(self, latency=0.0005):
+        self.documents = {}
+        # Re-entrant so reads inside a transaction can take it again
+        self.lock = threading.RLock()
+        self.latency = latency
+        self.round_trips = 0
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        time.sleep(self.latency)
+
+    def get_all(self, references):
+        """Read many documents in one round trip."""
+        with self.lock:
+            snapshots = [FakeSnapshot(reference._key[1], copy.deepcopy(self.documents.get(reference._key)))
+                         for reference in references]
+        self.round_trip()
+        return iter(snapshots)
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    def data(self, collection, document_id):
+        with self.lock:
+            return copy.deepcopy(self.documents.get((collection, document_id)))
+
+
+def make_firebase_client(db) -> FirebaseClient:
+    """A FirebaseClient backed by the given fake database."""
+    # Skip __init__, which looks for Firebase credentials
+    client = FirebaseClient.__new__(FirebaseClient)
+    client.db = db
+    client.bucket = None
+    client.initialized = True
+    return client
+
+
+def fake_transactional(func):
+    """Stand-in for firestore.transactional: run the function and its writes under the database lock."""
+    def run(transaction, *args, **kwargs):
+        with transaction._db.lock:
+            result = func(transaction, *args, **kwargs)
+            for write, data, options in transaction._writes:
+                write(data, **options)
+            return result
+    return run
@@ -0,0 +1,25 @@
+"""A storage bucket stand-in that keeps uploads in a local directory."""
+import os
+import shutil
+
+
+class LocalBlob:
+    def __init__(self, root, path):
+        self._path = os.path.join(root, path)
+        self.public_url = f"file://{self._path}"
+
+    def upload_from_filename(self, filename, content_type=None):
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        shutil.copyfile(filename, self._path)
+
+    def make_public(self):
+        pass
+
+
+class LocalBucket:
+    def __init__(self, root, name="local-bucket"):
+        self.name = name
+        self._root = root
+
+    def blob(self, path, chunk_size=None):
+        return LocalBlob(self._root, path)
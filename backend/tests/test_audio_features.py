@@ -0,0 +1,19 @@
+from benchmarks.audio_features import SAMPLE_RATE, make_signal
+from services.interview_service import compute_audio_features
+
+
+def test_pause_ratio_follows_silences():
+    y, true_pause_ratio = make_signal(0.5)
+    features = compute_audio_features(y, SAMPLE_RATE)
+
+    assert set(features) == {'duration', 'snr', 'volume_consistency', 'pause_ratio', 'speech_rate'}
+    assert abs(features['pause_ratio'] - true_pause_ratio) < 0.03
+    assert features['duration'] == len(y) / SAMPLE_RATE
+    assert features['snr'] > 30
+
+
+def test_speech_rate_uses_word_timings():
+    y, _ = make_signal(0.1)
+    word_timings = [{'startTime': index * 0.5, 'endTime': index * 0.5 + 0.4} for index in range(10)]
+
+    assert compute_audio_features(y, SAMPLE_RATE, word_timings)['speech_rate'] == 10 / 4.9 * 60.0
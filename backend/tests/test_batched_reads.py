@@ -0,0 +1,13 @@
+from tests.fake_firestore import FakeFirestore, make_firebase_client
+
+
+def test_get_documents_reads_in_chunks_and_skips_missing():
+    db = FakeFirestore(latency=0)
+    for index in range(25):
+        db.collection('candidates').document(f"candidate-{index}").set({'index': index})
+    ids = [f"candidate-{index}" for index in range(30)] + ["candidate-3", None, ""]
+
+    documents = make_firebase_client(db).get_documents('candidates', ids, chunk_size=10)
+
+    assert db.round_trips == 3
+    assert documents == {f"candidate-{index}": {'index': index} for index in range(25)}
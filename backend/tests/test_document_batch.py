@@ -0,0 +1,89 @@
+import json
+import threading
+from types import SimpleNamespace
+from services import document_service
+from services.document_service import DocumentService
+
+
+class FakeBlob:
+    def __init__(self, bucket, name, data):
+        self.bucket = bucket
+        self.name = name
+        self.data = data
+
+    def download_as_bytes(self):
+        return self.data
+
+    def delete(self):
+        self.bucket.blobs.pop(self.name, None)
+
+
+class FakeBucket:
+    """Just enough of a storage bucket for prefix listing, like GCS (plain string prefix match)."""
+
+    name = "test-bucket"
+
+    def __init__(self):
+        self.blobs = {}
+
+    def add(self, name, payload):
+        self.blobs[name] = FakeBlob(self, name, json.dumps(payload).encode())
+
+    def list_blobs(self, prefix):
+        return [blob for name, blob in list(self.blobs.items()) if name.startswith(prefix)]
+
+
+def entity_document(name):
+    return {"entities": [{"type": "applicant_name", "mentionText": name}]}
+
+
+def test_batch_output_is_matched_to_its_own_index_only(monkeypatch):
+    documents = [(f"gs://test-bucket/cv_{i}.pdf", "application/pdf") for i in range(11)]
+    bucket = FakeBucket()
+
+    def fake_batch_process(api_endpoint, request, timeout):
+        output_uri = request.document_output_config.gcs_output_config.gcs_uri.rstrip('/')
+        statuses = []
+        for index, (gcs_uri, _) in enumerate(documents):
+            # Document AI writes ".../<operation>/<index>" with no trailing slash
+            destination = f"{output_uri}/operation/{index}"
+            bucket.add(destination.split("gs://test-bucket/", 1)[1] + "/cv-0.json", entity_document(f"Candidate {index}"))
+            statuses.append(SimpleNamespace(input_gcs_source=gcs_uri, output_gcs_destination=destination))
+        return SimpleNamespace(individual_process_statuses=statuses)
+
+    monkeypatch.setattr(document_service.documentai_clients, "batch_process", fake_batch_process)
+
+    results = DocumentService.process_documents_batch(documents, bucket)
+
+    assert results[1] == {"applicant_name": "Candidate 1"}
+    assert results[10] == {"applicant_name": "Candidate 10"}
+    assert [result["applicant_name"] for result in results] == [f"Candidate {i}" for i in range(11)]
+    # The batch output is cleaned up once read
+    assert bucket.blobs == {}
+
+
+def test_batch_chunks_run_concurrently(monkeypatch):
+    documents = [(f"gs://test-bucket/cv_{i}.pdf", "application/pdf") for i in range(6)]
+    bucket = FakeBucket()
+    # Each of the three chunks waits for the others, so this only passes if they overlap
+    all_submitted = threading.Barrier(3, timeout=5)
+
+    def fake_batch_process(api_endpoint, request, timeout):
+        all_submitted.wait()
+        output_uri = request.document_output_config.gcs_output_config.gcs_uri.rstrip('/')
+        statuses = []
+        for index, document in enumerate(request.input_documents.gcs_documents.documents):
+            destination = f"{output_uri}/operation/{index}"
+            name = document.gcs_uri.rsplit('/', 1)[1]
+            bucket.add(destination.split("gs://test-bucket/", 1)[1] + "/cv-0.json", entity_document(name))
+            statuses.append(SimpleNamespace(input_gcs_source=document.gcs_uri, output_gcs_destination=destination))
+        return SimpleNamespace(individual_process_statuses=statuses)
+
+    monkeypatch.setattr(document_service, "DOCUMENTAI_BATCH_SIZE", 2)
+    monkeypatch.setattr(document_service, "DOCUMENTAI_BATCH_CONCURRENCY", 3)
+    monkeypatch.setattr(document_service.documentai_clients, "batch_process", fake_batch_process)
+
+    results = DocumentService.process_documents_batch(documents, bucket)
+
+    assert [result["applicant_name"] for result in results] == [f"cv_{i}.pdf" for i in range(6)]
+    assert bucket.blobs == {}
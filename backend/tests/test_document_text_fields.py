@@ -0,0 +1,74 @@
+from io import BytesIO
+import docx
+from services.document_service import DocumentService
+
+
+def test_title_heading_is_not_taken_as_the_name():
+    fields = DocumentService.text_to_fields("Curriculum Vitae\nJane Doe\njane.doe@example.com\n+60 12-345 6789")
+
+    assert fields['applicant_name'] == "Jane Doe"
+    assert fields['applicant_mail'] == "jane.doe@example.com"
+    assert fields['applicant_contactNum'] == "+60 12-345 6789"
+
+
+def test_date_ranges_on_separate_lines_are_not_a_phone_number():
+    fields = DocumentService.text_to_fields("John Smith\nExperience\n2019 - 2023\n2017 - 2018\n")
+
+    assert 'applicant_contactNum' not in fields
+
+
+def test_sections_fill_the_processor_fields():
+    text = (
+        "Jane Doe\njane.doe@example.com\n"
+        "Summary\nBackend engineer who likes data.\n"
+        "Work Experience\nEngineer, Acme (2019 - 2023)\nBuilt billing services\n"
+        "Education\nBSc Computer Science, 2019\n"
+        "Skills: Python, SQL\n"
+        "Soft Skills\nCommunication\n"
+        "Languages | English, Malay\n"
+        "Projects\nResume parser\n"
+        "Certifications\nAWS Developer\n"
+        "Awards & Achievements\nDean's list\n"
+        "Extracurricular Activities\nChess club\n"
+    )
+    fields = DocumentService.text_to_fields(text)
+
+    assert fields['applicant_name'] == "Jane Doe"
+    assert fields['bio'] == "Backend engineer who likes data."
+    assert fields['work_experience_paragraph'] == "Engineer, Acme (2019 - 2023)\nBuilt billing services"
+    assert fields['education_paragraph'] == "BSc Computer Science, 2019"
+    assert fields['technical_skills'] == "Python, SQL"
+    assert fields['soft_skills'] == "Communication"
+    assert fields['languages'] == "English, Malay"
+    assert fields['projects_paragraph'] == "Resume parser"
+    assert fields['certifications_paragraph'] == "AWS Developer"
+    assert fields['awards_paragraph'] == "Dean's list"
+    assert fields['co-curricular_activities_paragraph'] == "Chess club"
+
+
+def test_docx_tables_stay_under_their_section():
+    document = docx.Document()
+    document.add_paragraph("John Smith")
+    document.add_paragraph("Education")
+    document.add_paragraph("Diploma in IT " * 20)
+    document.add_paragraph("Skills")
+    table = document.add_table(rows=2, cols=2)
+    table.rows[0].cells[0].text, table.rows[0].cells[1].text = "Python", "5 years"
+    table.rows[1].cells[0].text, table.rows[1].cells[1].text = "Docker", "2 years"
+    document.add_paragraph("Languages: English")
+    content = BytesIO()
+    document.save(content)
+
+    fields = DocumentService.extract_text_locally(content.getvalue(), "resume.docx")
+
+    assert fields['applicant_name'] == "John Smith"
+    assert fields['technical_skills'] == "Python | 5 years\nDocker | 2 years"
+    assert fields['languages'] == "English"
+
+
+def test_local_extraction_is_on_for_docx_and_text_layer_pdfs():
+    assert DocumentService.supports_local_extraction("resume.docx")
+    assert DocumentService.supports_local_extraction("resume.PDF")
+    assert not DocumentService.supports_local_extraction("resume.doc")
+    # Unreadable or image-only PDFs still go to Document AI
+    assert DocumentService.extract_text_locally(b"%PDF-1.4", "resume.pdf") is None
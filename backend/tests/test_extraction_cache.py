@@ -0,0 +1,66 @@
+import pytest
+from services import extraction_cache as extraction_cache_module
+from services.document_service import get_processor_config
+from services.extraction_cache import ExtractionCache, EXTRACTION_CACHE_COLLECTION
+from tests.fake_firestore import FakeFirestore, make_firebase_client
+
+RESUME = b"%PDF-1.4 resume of Ada Lovelace"
+EXTRACTED = {'applicant_name': "Ada Lovelace", 'technical_skills': "Python"}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore(latency=0)
+    monkeypatch.setattr(extraction_cache_module, "firebase_client", make_firebase_client(db))
+    return db
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(extraction_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def processor_version(monkeypatch):
+    """Set DOCUMENTAI_PROCESSOR_VERSION; the config is read once per process, as after a restart."""
+    def set_version(version):
+        monkeypatch.setenv("DOCUMENTAI_PROCESSOR_VERSION", version)
+        get_processor_config.cache_clear()
+    yield set_version
+    get_processor_config.cache_clear()
+
+
+def test_same_file_is_a_hit_from_memory_and_firestore(db, clock):
+    key = ExtractionCache.make_key(RESUME, "pretrained-v1")
+    ExtractionCache().set(key, EXTRACTED)
+    cache = ExtractionCache()
+
+    assert cache.get(key, len(RESUME)) == EXTRACTED
+    assert cache.get(key, len(RESUME)) == EXTRACTED
+    assert cache.stats() == {'hits': 2, 'misses': 0, 'apiCallsSaved': 2, 'bytesSaved': 2 * len(RESUME), 'entries': 1}
+    assert db.data(EXTRACTION_CACHE_COLLECTION, key)['expiresAt'].timestamp() == 1000.0 + cache.ttl_seconds
+
+
+def test_new_processor_version_misses_the_cache(db, clock, processor_version):
+    cache = ExtractionCache()
+    processor_version("pretrained-v1")
+    cache.set(ExtractionCache.make_key(RESUME, get_processor_config()['processor_version']), EXTRACTED)
+
+    processor_version("pretrained-v2")
+    new_key = ExtractionCache.make_key(RESUME, get_processor_config()['processor_version'])
+
+    assert new_key != ExtractionCache.make_key(RESUME, "pretrained-v1")
+    assert cache.get(new_key, len(RESUME)) is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_the_ttl(db, clock):
+    cache = ExtractionCache(ttl_seconds=60)
+    key = ExtractionCache.make_key(RESUME, "pretrained-v1")
+    cache.set(key, EXTRACTED)
+
+    clock[0] += 61
+    assert cache.get(key, len(RESUME)) is None
+    assert db.data(EXTRACTION_CACHE_COLLECTION, key) is None
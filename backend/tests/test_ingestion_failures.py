@@ -0,0 +1,110 @@
+import asyncio
+from services import ingestion_service as ingestion_module
+from services.ingestion_service import IngestionService, FILE_FAILED, FILE_PROFILED, FILE_PROFILE_FAILED
+
+FILES = [(b"%PDF-1.4", f"cv_{index}.pdf", "application/pdf") for index in range(3)]
+
+
+def test_failed_batch_extraction_marks_every_file_failed(monkeypatch):
+    def failing_batch(job_id, files, on_uploaded=None):
+        on_uploaded(0)
+        raise RuntimeError("Document AI unavailable")
+
+    monkeypatch.setattr(ingestion_module, "DOCUMENTAI_BATCH_THRESHOLD", 1)
+    monkeypatch.setattr(ingestion_module.CandidateService, "create_candidates_batch", failing_batch)
+
+    async def run():
+        service = IngestionService(max_workers=2)
+        ingestion_id = service.submit("job-1", FILES)
+        await service.wait(ingestion_id)
+        await service.shutdown()
+        return service.get_status(ingestion_id)
+
+    status = asyncio.run(run())
+
+    assert status['status'] == 'failed'
+    assert status['counts'][FILE_FAILED] == len(FILES)
+    assert all(file_status['error'] == "Document AI unavailable" for file_status in status['files'])
+
+
+def test_shutdown_cancels_unfinished_batches(monkeypatch):
+    async def run():
+        service = IngestionService(max_workers=2)
+        started = asyncio.Event()
+
+        async def slow_process_file(ingestion_id, index, job_id, file, gemini_service):
+            started.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(service, "_process_file", slow_process_file)
+        ingestion_id = service.submit("job-1", FILES)
+        await started.wait()
+        await service.shutdown()
+        return service.get_status(ingestion_id)
+
+    status = asyncio.run(run())
+
+    assert status['status'] == 'cancelled'
+    assert status['counts'][FILE_FAILED] == len(FILES)
+
+
+def test_profile_failure_keeps_candidate_and_application(monkeypatch):
+    class FailingGemini:
+        async def generate_candidate_profile(self, candidate):
+            raise RuntimeError("Gemini quota exceeded")
+
+    def create_candidate(job_id, file_content, file_name, content_type, on_uploaded=None):
+        on_uploaded()
+        return {'candidateId': f"cand-{file_name}", 'extractedData': {}}
+
+    monkeypatch.setattr(ingestion_module.CandidateService, "create_candidate", create_candidate)
+    monkeypatch.setattr(ingestion_module.JobService, "add_application",
+                        lambda job_id, candidate_id: f"app-{candidate_id}")
+    monkeypatch.setattr("services.gemini_service.get_gemini_service", lambda: FailingGemini())
+
+    async def run():
+        service = IngestionService(max_workers=2)
+        ingestion_id = service.submit("job-1", FILES[:1])
+        await service.wait(ingestion_id)
+        return service, ingestion_id
+
+    service, ingestion_id = asyncio.run(run())
+    status = service.get_status(ingestion_id)
+    candidates, applications = service.get_results(ingestion_id)
+
+    assert status['status'] == 'completed'
+    assert status['progress'] == 100.0
+    assert status['counts'][FILE_PROFILE_FAILED] == 1
+    assert status['counts'][FILE_FAILED] == 0
+    file_status = status['files'][0]
+    assert file_status['state'] == FILE_PROFILE_FAILED
+    assert file_status['candidateId'] == "cand-cv_0.pdf"
+    assert file_status['applicationId'] == "app-cand-cv_0.pdf"
+    assert file_status['error'] == "Gemini quota exceeded"
+    assert len(candidates) == 1 and applications[0]['success']
+
+
+def test_cancelled_wait_leaves_ingestion_running(monkeypatch):
+    async def run():
+        service = IngestionService(max_workers=2)
+        release = asyncio.Event()
+
+        async def blocked_process_file(ingestion_id, index, job_id, file, gemini_service):
+            await release.wait()
+            service._update_file(ingestion_id, index, FILE_PROFILED)
+
+        monkeypatch.setattr(service, "_process_file", blocked_process_file)
+        ingestion_id = service.submit("job-1", FILES)
+        waiter = asyncio.ensure_future(service.wait(ingestion_id))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        release.set()
+        await service.wait(ingestion_id)
+        return service.get_status(ingestion_id)
+
+    status = asyncio.run(run())
+
+    assert status['status'] == 'completed'
+    assert status['counts'][FILE_PROFILED] == len(FILES)
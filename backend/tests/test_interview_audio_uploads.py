@@ -0,0 +1,96 @@
+import os
+import threading
+import pytest
+from services import interview_pipeline as pipeline_module
+from services.interview_pipeline import InterviewResponsePipeline
+from services.transcription_service import LocalTranscriber, SpeechTranscriber, MODE_LONG_RUNNING
+from tests.fake_storage import LocalBucket, LocalBlob
+from tests.test_wav_pcm import write_wav
+
+TRANSCRIPTION = {'transcript': "I led the project", 'word_timings': [], 'word_timing_indices': [0, 1, 2, 3]}
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = InterviewResponsePipeline(max_workers=1)
+    yield pipeline
+    pipeline.shutdown()
+
+
+@pytest.fixture
+def processed(monkeypatch, pipeline, tmp_path):
+    """Run _process on a two-second answer and return what it recorded and transcribed."""
+    calls = {}
+
+    def extract(video_path, audio_path, modified_audio_path, effect_type):
+        write_wav(audio_path, b'\x00' * 64000)
+        write_wav(modified_audio_path, b'\x00' * 64000)
+
+    def record_result(db, application_id, response_id, updates, scores, error):
+        calls['result'] = (updates, scores, error)
+
+    monkeypatch.setattr(pipeline_module, "extract_audio_with_voice_effect", extract)
+    monkeypatch.setattr(pipeline_module, "score_response", lambda **kwargs: {'total_score': 5.0})
+    monkeypatch.setattr(pipeline, "_set_stage", lambda *args, **kwargs: None)
+    monkeypatch.setattr(pipeline, "_record_result", record_result)
+
+    def run(transcribe):
+        video_path = tmp_path / "answer.webm"
+        video_path.write_bytes(b"webm")
+        bucket = LocalBucket(str(tmp_path / "bucket"))
+        monkeypatch.setattr(pipeline_module, "transcribe_audio_with_google_cloud", transcribe)
+        pipeline._process(None, bucket, "application-1", "interview-1", "Tell us about a project",
+                          "response-1", str(video_path))
+        return calls['result']
+
+    return run
+
+
+def test_short_answers_transcribe_before_the_audio_is_uploaded(monkeypatch, processed):
+    transcribed = threading.Event()
+    upload_from_filename = LocalBlob.upload_from_filename
+
+    def upload_after_transcription(blob, filename, content_type=None):
+        assert transcribed.wait(timeout=5), "transcription waited for the upload"
+        upload_from_filename(blob, filename, content_type)
+
+    def transcribe(gcs_uri, audio_path=None):
+        assert gcs_uri is None and os.path.exists(audio_path)
+        transcribed.set()
+        return dict(TRANSCRIPTION)
+
+    monkeypatch.setattr(LocalBlob, "upload_from_filename", upload_after_transcription)
+    updates, scores, error = processed(transcribe)
+
+    assert error is None
+    assert scores == {'total_score': 5.0}
+    assert updates['transcript'] == "I led the project"
+    assert updates['audioExtractUrl'].endswith("response-1_audio.wav")
+    assert updates['modifiedAudioUrl'].endswith("response-1_modified_audio.wav")
+
+
+def test_long_answers_upload_before_long_running_recognition(monkeypatch, processed, tmp_path):
+    class LongRunningTranscriber(SpeechTranscriber):
+        def choose_mode(self, duration):
+            return MODE_LONG_RUNNING
+
+    audio_copy = tmp_path / "bucket" / "interview_responses" / "application-1" / "interview-1" / "response-1_audio.wav"
+
+    def transcribe(gcs_uri, audio_path=None):
+        assert audio_copy.exists()
+        assert gcs_uri == "gs://local-bucket/interview_responses/application-1/interview-1/response-1_audio.wav"
+        return dict(TRANSCRIPTION)
+
+    monkeypatch.setattr(pipeline_module, "transcriber", LongRunningTranscriber())
+    updates, _, error = processed(transcribe)
+
+    assert error is None
+    assert updates['audioExtractUrl'] == f"file://{audio_copy}"
+
+
+def test_only_clips_too_long_to_stream_need_a_storage_copy(tmp_path):
+    path = tmp_path / "answer.wav"
+    write_wav(path, b'\x00' * 64000)
+
+    assert not SpeechTranscriber().needs_storage_copy(str(path))
+    assert not LocalTranscriber().needs_storage_copy(str(path))
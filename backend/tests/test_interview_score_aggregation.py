@@ -0,0 +1,118 @@
+import threading
+import pytest
+from firebase_admin import firestore
+from services.interview_pipeline import InterviewResponsePipeline, ordered_answers, STAGE_QUEUED, STAGE_COMPLETED
+from tests.fake_firestore import FakeFirestore, fake_transactional
+
+APPLICATION_ID = "application-1"
+SCORES = {'clarity': 1.0, 'confidence': 2.0, 'relevance': 3.0, 'engagement': 4.0, 'total_score': 10.0}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(firestore, "transactional", fake_transactional)
+    return FakeFirestore()
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = InterviewResponsePipeline(max_workers=1)
+    yield pipeline
+    pipeline.shutdown()
+
+
+def answer(pipeline, db, index, scores=SCORES):
+    response_id = f"response-{index}"
+    pipeline._record_answer(db, APPLICATION_ID, f"question-{index}", response_id, "video-url", None, STAGE_QUEUED)
+    pipeline._record_result(db, APPLICATION_ID, response_id, {'transcript': f"answer {index}"}, scores, None)
+
+
+def test_concurrent_answers_lose_no_scores(db, pipeline):
+    answers = 50
+    start = threading.Barrier(answers)
+    errors = []
+
+    def run(target, *args):
+        try:
+            start.wait()
+            target(*args)
+        except Exception as e:
+            errors.append(e)
+
+    # The interview document exists once the first answer is stored; the rest race with completion
+    answer(pipeline, db, 0)
+    threads = [threading.Thread(target=run, args=(answer, pipeline, db, index)) for index in range(1, answers)]
+    # Complete the interview while answers are still being recorded and scored
+    threads.append(threading.Thread(target=run, args=(pipeline.finalize_scores, db, APPLICATION_ID)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    data = db.data('interviewResponses', APPLICATION_ID)
+    assert data['scoreTotals'] == {
+        'count': answers, 'clarity': answers * 1.0, 'confidence': answers * 2.0,
+        'relevance': answers * 3.0, 'engagement': answers * 4.0, 'totalScore': answers * 10.0
+    }
+    assert len(data['responses']) == answers
+    assert all(answer['transcript'] for answer in data['responses'].values())
+    assert all(status['stage'] == STAGE_COMPLETED for status in data['responseStatus'].values())
+    # The averages include the answers that finished after the interview was completed
+    assert data['analysis'] == {
+        'clarity': 1.0, 'confidence': 2.0, 'relevance': 3.0, 'engagement': 4.0, 'totalScore': 10.0
+    }
+
+
+def test_answer_scored_after_completion_is_averaged_in(db, pipeline):
+    pipeline._record_answer(db, APPLICATION_ID, "question-0", "response-0", "video-url", None, STAGE_QUEUED)
+    pipeline._record_answer(db, APPLICATION_ID, "question-1", "response-1", "video-url", None, STAGE_QUEUED)
+    pipeline._record_result(db, APPLICATION_ID, "response-0", {}, SCORES, None)
+
+    assert pipeline.finalize_scores(db, APPLICATION_ID)['totalScore'] == 5.0
+
+    pipeline._record_result(db, APPLICATION_ID, "response-1", {}, {**SCORES, 'total_score': 20.0}, None)
+    assert db.data('interviewResponses', APPLICATION_ID)['analysis']['totalScore'] == 15.0
+
+
+def test_finalize_is_idempotent_and_handles_missing_documents(db, pipeline):
+    assert pipeline.finalize_scores(db, APPLICATION_ID) is None
+
+    answer(pipeline, db, 0)
+    first = pipeline.finalize_scores(db, APPLICATION_ID)
+    assert pipeline.finalize_scores(db, APPLICATION_ID) == first
+
+
+def test_recording_a_result_writes_only_that_answer(db, pipeline):
+    answer(pipeline, db, 0)
+    pipeline._record_answer(db, APPLICATION_ID, "question-1", "response-1", "video-url", None, STAGE_QUEUED)
+    transactions = []
+    transaction = db.transaction
+
+    def tracked_transaction():
+        transactions.append(transaction())
+        return transactions[-1]
+
+    db.transaction = tracked_transaction
+    pipeline._record_result(db, APPLICATION_ID, "response-1", {'transcript': "answer 1", 'wordCount': 2}, SCORES, None)
+
+    assert sorted(transactions[0].written_fields) == sorted([
+        'responses.`response-1`.transcript', 'responses.`response-1`.wordCount',
+        'scoreTotals.clarity', 'scoreTotals.confidence', 'scoreTotals.relevance',
+        'scoreTotals.engagement', 'scoreTotals.totalScore',
+        'responseStatus.`response-1`', 'updatedAt'
+    ])
+    data = db.data('interviewResponses', APPLICATION_ID)
+    assert [a['responseId'] for a in ordered_answers(data)] == ["response-0", "response-1"]
+    assert data['responses']['response-1']['videoResponseUrl'] == "video-url"
+    assert pipeline.get_status(db, APPLICATION_ID, "response-1")['transcript'] == "answer 1"
+
+
+def test_status_of_answers_stored_in_the_questions_array(db, pipeline):
+    db.collection('interviewResponses').document(APPLICATION_ID).set({
+        'applicationId': APPLICATION_ID,
+        'questions': [{'questionId': "question-0", 'responseId': "response-0", 'transcript': "legacy answer"}]
+    })
+
+    assert pipeline.get_status(db, APPLICATION_ID, "response-0")['transcript'] == "legacy answer"
+    assert pipeline.get_status(db, APPLICATION_ID, "response-1") is None
@@ -0,0 +1,28 @@
+import pytest
+from services.transcription_service import LocalTranscriber, Transcriber
+from tests.test_wav_pcm import write_wav
+
+
+def test_transcriber_is_abstract():
+    with pytest.raises(TypeError):
+        Transcriber()
+
+
+def test_local_transcriber_is_deterministic_and_batches(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"answer_{index}.wav"
+        write_wav(path, bytes([index]) * 64000)  # 2 s each
+        paths.append(str(path))
+    transcriber = LocalTranscriber()
+
+    first = transcriber.transcribe(audio_path=paths[0])
+    assert transcriber.transcribe(audio_path=paths[0]) == first
+    assert first['word_count'] == 5
+    assert [timing['index'] for timing in first['word_timings']] == list(range(5))
+    assert set(first['word_timings'][0]) == {'word', 'startTime', 'endTime', 'confidence', 'index'}
+    assert first['transcript'] == ' '.join(timing['word'] for timing in first['word_timings'])
+
+    batch = transcriber.transcribe_batch([{'audio_path': path} for path in paths])
+    assert batch[0] == first
+    assert len(batch) == 3
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import pytest
+from services.response_upload_service import ResponseUploadStore, UploadNotFound
+
+
+async def body(*pieces, pause=None):
+    for piece in pieces:
+        if pause is not None:
+            await pause.wait()
+        yield piece
+
+
+def test_completion_waits_for_chunk_and_later_chunks_are_not_found():
+    async def scenario():
+        store = ResponseUploadStore()
+        session = store.create("application-1", "interview-1", "question-1", "Question?")
+        resume = asyncio.Event()
+
+        writing = asyncio.create_task(store.append(session['uploadId'], 0, body(b"abc", b"def", pause=resume)))
+        await asyncio.sleep(0)
+        completing = asyncio.create_task(store.pop(session['uploadId']))
+        await asyncio.sleep(0)
+        # Completion must not take the session while a chunk is still being written
+        assert not completing.done()
+
+        resume.set()
+        assert await writing == 6
+        popped = await completing
+        assert popped['offset'] == 6
+
+        with pytest.raises(UploadNotFound):
+            await store.append(session['uploadId'], 6, body(b"ghi"))
+        assert await store.pop(session['uploadId']) is None
+        os.unlink(popped['path'])
+
+    asyncio.run(scenario())
+
+
+def test_append_to_unknown_upload_raises_not_found():
+    with pytest.raises(UploadNotFound):
+        asyncio.run(ResponseUploadStore().append("missing", 0, body(b"abc")))
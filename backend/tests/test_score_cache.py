@@ -0,0 +1,71 @@
+import pytest
+from services import score_cache as score_cache_module
+from services.score_cache import ScoreCache, SCORE_CACHE_COLLECTION
+from tests.fake_firestore import FakeFirestore, make_firebase_client
+
+RESUME = {'applicant_name': "Ada", 'technical_skills': "Python"}
+RESULT = {'rank_score': {'final_score': 80.0}}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore(latency=0)
+    monkeypatch.setattr(score_cache_module, "firebase_client", make_firebase_client(db))
+    return db
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(score_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def key(job_description="Backend engineer", criteria="skills"):
+    return ScoreCache.make_key(RESUME, job_description, criteria, "gemini-model", "v1")
+
+
+def test_entries_expire_after_the_ttl(db, clock):
+    cache = ScoreCache(ttl_seconds=60)
+    cache.set(key(), RESULT)
+
+    clock[0] += 59
+    assert cache.get(key()) == RESULT
+
+    clock[0] += 2
+    assert cache.get(key()) is None
+    # The expired copy is removed from Firestore too
+    assert db.data(SCORE_CACHE_COLLECTION, key()) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_least_recently_used_entry_is_evicted(db, clock):
+    cache = ScoreCache(max_entries=2)
+    keys = [key(criteria=f"criteria {index}") for index in range(3)]
+    cache.set(keys[0], RESULT)
+    cache.set(keys[1], RESULT)
+    cache.get(keys[0])
+    cache.set(keys[2], RESULT)
+
+    assert list(cache._entries) == [keys[0], keys[2]]
+    assert cache.stats()['entries'] == 2
+
+
+def test_missing_entries_are_read_from_firestore(db, clock):
+    ScoreCache().set(key(), RESULT)
+    cache = ScoreCache()
+
+    assert cache.get(key()) == RESULT
+    assert key() in cache._entries
+    # Callers get copies, so changing a result never changes the cache
+    cache.get(key())['rank_score']['final_score'] = 0.0
+    assert cache.get(key()) == RESULT
+
+
+def test_editing_the_job_description_changes_the_key(db, clock):
+    cache = ScoreCache()
+    cache.set(key("Backend engineer"), RESULT)
+
+    assert key("Backend engineer") == key("Backend engineer")
+    assert key("Senior backend engineer") != key("Backend engineer")
+    assert cache.get(key("Senior backend engineer")) is None
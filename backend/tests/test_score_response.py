@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+import pytest
+from services import interview_service
+from services.interview_service import score_response
+
+AUDIO_FEATURES = {'snr': 20.0, 'volume_consistency': 0.7, 'pause_ratio': 0.2, 'speech_rate': 150}
+
+
+@pytest.fixture
+def annotate_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(interview_service, "extract_audio_features", lambda **kwargs: dict(AUDIO_FEATURES))
+    monkeypatch.setattr(interview_service, "annotate_question", lambda question: (frozenset({"project"}), 0.0))
+
+    def embed(texts):
+        raise RuntimeError("Embedding model unavailable")
+
+    monkeypatch.setattr(interview_service.embedding_service, "embed", embed)
+    return calls
+
+
+def test_transcript_is_annotated_once(monkeypatch, annotate_calls):
+    def annotate(transcript):
+        annotate_calls.append(transcript)
+        return SimpleNamespace(sentiment=SimpleNamespace(score=0.2, magnitude=0.5), tokens=[],
+                               sentences=[], entities=[], categories=[])
+
+    monkeypatch.setattr(interview_service, "annotate_transcript", annotate)
+    scores = score_response("I led the project", question_text="Tell us about a project", audio_path="answer.wav")
+
+    assert annotate_calls == ["I led the project"]
+    assert scores['total_score'] > 0
+
+
+def test_failed_annotation_is_not_retried_by_the_analyzers(monkeypatch, annotate_calls):
+    def annotate(transcript):
+        annotate_calls.append(transcript)
+        raise RuntimeError("Natural Language API unavailable")
+
+    monkeypatch.setattr(interview_service, "annotate_transcript", annotate)
+    scores = score_response("I led the project", question_text="Tell us about a project", audio_path="answer.wav")
+
+    assert len(annotate_calls) == 1
+    # Every analyzer falls back to its defaults
+    assert scores == pytest.approx({
+        'relevance': 0.6 * 0.25 + 0.5 * 0.05,
+        'confidence': 0.6 * 0.10 + 0.6 * 0.20,
+        'clarity': 0.6 * 0.15 + 0.6 * 0.15,
+        'engagement': 0.6 * 0.10,
+        'total_score': 0.175 + 0.18 + 0.18 + 0.06
+    })
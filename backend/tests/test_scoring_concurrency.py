@@ -0,0 +1,33 @@
+import asyncio
+from services import gemini_service
+from benchmarks.scoring_concurrency import FixedLatencyModel, DisabledScoreCache, make_service, make_applicants
+
+
+class CountingModel(FixedLatencyModel):
+    def __init__(self, latency):
+        super().__init__(latency)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content_async(self, contents):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().generate_content_async(contents)
+        finally:
+            self.in_flight -= 1
+
+
+def test_rank_applicants_bounds_in_flight_calls(monkeypatch):
+    monkeypatch.setattr(gemini_service, "score_cache", DisabledScoreCache())
+    monkeypatch.setattr(gemini_service, "MAX_CONCURRENT_SCORING", 3)
+    model = CountingModel(0.01)
+    applicants = make_applicants(10)
+
+    result = asyncio.run(make_service(model).rank_applicants("skills", applicants, {'jobDescription': "Engineer"}))
+
+    assert model.calls == 10
+    assert model.peak == 3
+    # Equal scores keep the input order
+    assert [applicant['id'] for applicant in result['applicants']] == [applicant['id'] for applicant in applicants]
+    assert all(applicant['rank_score']['final_score'] == 60.0 for applicant in result['applicants'])
@@ -0,0 +1,15 @@
+from benchmarks.transcript_normalization import make_transcript, previous_post_process_transcript
+from services.interview_service import normalize_transcript
+
+
+def test_matches_previous_implementation():
+    for seed in range(20):
+        transcript = make_transcript(500, seed)
+        assert normalize_transcript(transcript)[0] == previous_post_process_transcript(transcript)
+
+
+def test_word_indices_point_at_raw_words():
+    raw = "well well i think. so  so it worked"
+    normalized, indices = normalize_transcript(raw)
+    assert normalized == "Well i think. So it worked."
+    assert [raw.split()[index] for index in indices] == ['well', 'i', 'think.', 'so', 'it', 'worked']
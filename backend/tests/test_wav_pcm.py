@@ -0,0 +1,36 @@
+import struct
+from services.transcription_service import wav_duration_seconds, read_wav_pcm
+
+
+def write_wav(path, pcm, sample_rate=16000, data_size=None):
+    """A 16-bit mono WAV with a LIST chunk before the samples, as ffmpeg writes it."""
+    fmt = struct.pack('<HHIIHH', 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    info = b'INFOISFT\x0e\x00\x00\x00Lavf60.16.100\x00'
+    chunks = (
+        b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        + b'LIST' + struct.pack('<I', len(info)) + info
+        + b'data' + struct.pack('<I', len(pcm) if data_size is None else data_size) + pcm
+    )
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', 4 + len(chunks)) + b'WAVE' + chunks)
+
+
+def test_pcm_excludes_the_header_and_duration_uses_the_data_chunk(tmp_path):
+    pcm = bytes(range(256)) * 125  # 32000 bytes = 1 s of 16 kHz 16-bit mono
+    path = tmp_path / "answer.wav"
+    write_wav(path, pcm)
+
+    assert wav_duration_seconds(str(path)) == 1.0
+    assert b''.join(read_wav_pcm(str(path))) == pcm
+    chunks = list(read_wav_pcm(str(path), 10000))
+    assert [len(chunk) for chunk in chunks] == [10000, 10000, 10000, 2000]
+    assert b''.join(chunks) == pcm
+
+
+def test_placeholder_data_size_is_clamped_to_the_file(tmp_path):
+    pcm = b'\x01\x00' * 8000
+    path = tmp_path / "streamed.wav"
+    write_wav(path, pcm, data_size=0xFFFFFFFF)
+
+    assert wav_duration_seconds(str(path)) == 0.5
+    assert b''.join(read_wav_pcm(str(path))) == pcm
@@ -398,8 +398,25 @@ const UploadMoreCVModal = ({ isOpen, onClose, jobId, jobTitle, onUploadComplete
 
     // API URL for backend
     const API_URL = "http://localhost:8000";
+    const INGESTION_POLL_INTERVAL_MS = 1500; // How often to check background CV processing
     const API_ENDPOINT = "http://localhost:8000/api/jobs/upload-more-cv"; // Ensure the correct endpoint is used
 
+    // Poll a background CV ingestion until every file has finished processing
+    const waitForIngestion = async (statusUrl, onProgress) => {
+        while (true) {
+            const statusResponse = await fetch(`${API_URL}${statusUrl}`);
+            if (!statusResponse.ok) {
+                throw new Error(`Failed to check CV processing status (${statusResponse.status})`);
+            }
+            const ingestion = await statusResponse.json();
+            onProgress(ingestion.progress || 0);
+            if (["completed", "failed", "cancelled"].includes(ingestion.status)) {
+                return ingestion;
+            }
+            await new Promise(resolve => setTimeout(resolve, INGESTION_POLL_INTERVAL_MS));
+        }
+    };
+
     // Updated function to force generate detailed profiles
     const generateAndCheckDetailedProfiles = async (candidateIds) => {
         console.log("Generating detailed profiles for candidates:", candidateIds);
@@ -477,6 +494,7 @@ const UploadMoreCVModal = ({ isOpen, onClose, jobId, jobTitle, onUploadComplete
             fileState.selectedFiles.forEach(file => {
                 formData.append("files", file);
             });
+            formData.append("background", "true");
             
             // Simulate early progress before actual upload starts
             setSubmitProgress(15);
@@ -520,6 +538,24 @@ const UploadMoreCVModal = ({ isOpen, onClose, jobId, jobTitle, onUploadComplete
             const responseData = await response.json();
             console.log("Upload more CV server response:", responseData);
             
+            // CVs are processed in the background; follow their progress until the batch finishes
+            setSubmitProgress(65);
+            const ingestion = await waitForIngestion(responseData.statusUrl, progress => {
+                setSubmitProgress(65 + progress * 0.27);
+            });
+            console.log("CV processing finished:", ingestion);
+            
+            if (ingestion.status !== "completed" || ingestion.counts.failed === ingestion.totalFiles) {
+                const fileError = ingestion.files.find(file => file.error);
+                throw new Error(`CV processing ${ingestion.status === "completed" ? "failed" : ingestion.status}${fileError ? `: ${fileError.error}` : ""}`);
+            }
+            
+            // Profiles are generated during ingestion; retry only the ones that failed
+            responseData.applicationCount = ingestion.files.filter(file => file.applicationId).length;
+            responseData.candidateIds = ingestion.files
+                .filter(file => file.state === "profile_failed")
+                .map(file => file.candidateId);
+            
             // UPDATED: Explicitly generate detailed profiles for all candidates
             if (responseData.candidateIds && responseData.candidateIds.length > 0) {
                 console.log(`Generating detailed profiles for ${responseData.candidateIds.length} newly uploaded candidates...`);
@@ -532,7 +568,7 @@ const UploadMoreCVModal = ({ isOpen, onClose, jobId, jobTitle, onUploadComplete
                     console.warn("Error during profile generation:", error);
                 }
             } else {
-                console.warn("No candidateIds received in response");
+                console.log("All detailed profiles were generated during processing");
             }
             
             setSubmitProgress(100);
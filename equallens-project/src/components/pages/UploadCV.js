@@ -571,6 +571,7 @@ const UploadCV = () => {
 
     // API URL for backend
     const API_URL = "http://localhost:8000"; // Your FastAPI URL
+    const INGESTION_POLL_INTERVAL_MS = 1500; // How often to check background CV processing
     const API_ENDPOINT = `${API_URL}/api/jobs/upload-job`; // Ensure the correct endpoint is used
     const UPLOAD_MORE_CV_ENDPOINT = `${API_URL}/api/jobs/upload-more-cv`; // Add endpoint for upload-more-cv
 
@@ -688,6 +689,22 @@ const UploadCV = () => {
         setSubmitProgress(0);
     };
 
+    // Poll a background CV ingestion until every file has finished processing
+    const waitForIngestion = async (statusUrl, onProgress) => {
+        while (true) {
+            const statusResponse = await fetch(`${API_URL}${statusUrl}`);
+            if (!statusResponse.ok) {
+                throw new Error(`Failed to check CV processing status (${statusResponse.status})`);
+            }
+            const ingestion = await statusResponse.json();
+            onProgress(ingestion.progress || 0);
+            if (["completed", "failed", "cancelled"].includes(ingestion.status)) {
+                return ingestion;
+            }
+            await new Promise(resolve => setTimeout(resolve, INGESTION_POLL_INTERVAL_MS));
+        }
+    };
+
     // Updated function to force generate detailed profiles
     const generateAndCheckDetailedProfiles = async (candidateIds) => {
         console.log("Generating detailed profiles for candidates:", candidateIds);
@@ -774,6 +791,7 @@ const UploadCV = () => {
             fileState.selectedFiles.forEach(file => {
                 formData.append("files", file);
             });
+            formData.append("background", "true");
             
             // Simulate early progress before actual upload starts
             setSubmitProgress(7);
@@ -832,6 +850,24 @@ const UploadCV = () => {
             const responseData = await response.json();
             console.log("Upload job server response:", responseData);
             
+            // CVs are processed in the background; follow their progress until the batch finishes
+            setSubmitProgress(65);
+            const ingestion = await waitForIngestion(responseData.statusUrl, progress => {
+                setSubmitProgress(65 + progress * 0.27);
+            });
+            console.log("CV processing finished:", ingestion);
+            
+            if (ingestion.status !== "completed" || ingestion.counts.failed === ingestion.totalFiles) {
+                const fileError = ingestion.files.find(file => file.error);
+                throw new Error(`CV processing ${ingestion.status === "completed" ? "failed" : ingestion.status}${fileError ? `: ${fileError.error}` : ""}`);
+            }
+            
+            // Profiles are generated during ingestion; retry only the ones that failed
+            responseData.applicationCount = ingestion.files.filter(file => file.applicationId).length;
+            responseData.candidateIds = ingestion.files
+                .filter(file => file.state === "profile_failed")
+                .map(file => file.candidateId);
+            
             // Set the final progress based on response (or 100 if not provided)
             setSubmitProgress(responseData.progress || 95);
             
@@ -847,7 +883,7 @@ const UploadCV = () => {
                     console.warn("Error during profile generation:", error);
                 }
             } else {
-                console.warn("No candidateIds received in response");
+                console.log("All detailed profiles were generated during processing");
             }
             
             setSubmitProgress(100);